@@ -1,11 +1,16 @@
 import streamlit as st
 from dotenv import load_dotenv
 
-from components import load_transcript, SUPPORTED_LANGUAGES, split_text, get_embeddings, build_vector_store, get_retriever, get_llm
-from chains import build_rag_chain, generate_summary
-from ui import inject_custom_css, render_header, render_status_badges
+# Only lightweight modules at the top: torch, faiss, LangChain and the
+# YouTube client are imported by the stage that first needs them, or by
+# the background warm-up started after the page has been drawn.
+from components import warm_up, timed, metrics_snapshot, write_prometheus, configure_metrics_logging
+from ui import inject_custom_css, render_header, render_status_badges, render_streaming_box, render_metrics_panel
+from ui import render_index_progress, render_partial_coverage_notice, render_batch_results, render_batch_progress
+from config import SUPPORTED_LANGUAGES, WARMUP_ON_START, USE_SHARED_INDEX, ANSWER_CACHE_ENABLED, SUMMARY_MODE, METRICS_DEBUG_PANEL
 
 load_dotenv()
+configure_metrics_logging()
 
 # ──────────────────────────────────────────────
 # Page Config
@@ -25,6 +30,22 @@ if "video_loaded" not in st.session_state:
     st.session_state.video_loaded = False
 if "summary" not in st.session_state:
     st.session_state.summary = None
+if "vector_store" not in st.session_state:
+    st.session_state.vector_store = None  # shared multi-video index (USE_SHARED_INDEX)
+if "index_handle" not in st.session_state:
+    st.session_state.index_handle = None  # per-video index, owned by the index manager
+if "video_id" not in st.session_state:
+    st.session_state.video_id = None
+if "video_key" not in st.session_state:
+    st.session_state.video_key = None
+if "index_job" not in st.session_state:
+    st.session_state.index_job = None
+if "failed_job" not in st.session_state:
+    st.session_state.failed_job = None  # kept for its partial store and for retrying
+if "batch_results" not in st.session_state:
+    st.session_state.batch_results = None
+if "batch_job" not in st.session_state:
+    st.session_state.batch_job = None
 
 # ──────────────────────────────────────────────
 # 1. Video ID Input + Load
@@ -47,27 +68,71 @@ with col2:
     load_btn = st.button("🔗 Load Video & Build Index", use_container_width=True)
 
 if load_btn and video_id:
+    from components import load_transcript_snippets, stream_split_snippets, get_embeddings, get_retriever, get_llm
+    from components import get_embedding_cache, get_shared_index, get_index_manager, start_index_job
+    from components import cache_key, load_cached_snippets, save_cached_snippets
+    from components import video_key as shared_video_key
+    from chains import build_rag_chain, get_answer_cache, with_answer_cache
+
     try:
-        # Stage 1a — Document Ingestion
+        video_id = video_id.strip()
+        lang_codes = SUPPORTED_LANGUAGES.get(selected_lang, ["en"])
+        key = cache_key(video_id, lang_codes)
+        video_key = shared_video_key(video_id, lang_codes[0])
+
+        # Stage 1a — Document Ingestion (disk cache first)
         with st.spinner("📥 Fetching transcript..."):
-            transcript = load_transcript(video_id.strip(), language=selected_lang)
+            snippets = load_cached_snippets(key)
+            if snippets is None:
+                snippets = load_transcript_snippets(video_id, language=selected_lang)
+                if snippets:
+                    save_cached_snippets(key, snippets)
 
-        if transcript:
+        if snippets:
+            vector_store = index_handle = index_job = None
             with st.spinner("⚙️ Building RAG index..."):
-                # Stage 1b — Text Splitting
-                chunks = split_text(transcript)
                 # Stage 1c — Embedding
                 embeddings = get_embeddings()
-                # Stage 1d — Vector Store
-                vector_store = build_vector_store(chunks, embeddings)
+                chunk_metadata = {"video_id": video_id, "language": lang_codes[0]}
+                if USE_SHARED_INDEX:
+                    # Stage 1b + 1d — add to the shared index once, then filter by video
+                    vector_store = get_shared_index(embeddings)
+                    if video_key not in vector_store:
+                        with timed("split_text"):
+                            chunks = list(stream_split_snippets(snippets, metadata=chunk_metadata))
+                        vectors = get_embedding_cache().embed_documents([c.page_content for c in chunks], embeddings)
+                        vector_store.add_video(video_id, chunks, vectors, language=lang_codes[0])
+                else:
+                    # Stage 1b + 1d — share a loaded or saved index, else split & embed in the background
+                    index_handle = get_index_manager().acquire(key, embeddings)
+                    if index_handle is None:
+                        with timed("split_text"):
+                            chunks = list(stream_split_snippets(snippets, metadata=chunk_metadata))
+                        index_job = start_index_job(key, chunks, embeddings)
                 # Retriever + LLM + Chain Assembly
-                retriever = get_retriever(vector_store)
-                llm = get_llm()
-                st.session_state.rag_chain = build_rag_chain(retriever, llm)
+                if index_job is not None:
+                    # Answers come from partial coverage until the job completes; not cached.
+                    rag_chain = build_rag_chain(index_job.as_retriever(), get_llm())
+                else:
+                    retriever = get_retriever(vector_store, video_ids=[video_key]) if USE_SHARED_INDEX else index_handle.as_retriever()
+                    rag_chain = build_rag_chain(retriever, get_llm())
+                    if ANSWER_CACHE_ENABLED:
+                        rag_chain = with_answer_cache(rag_chain, video_key, get_answer_cache(embeddings))
+                st.session_state.rag_chain = rag_chain
+                st.session_state.vector_store = vector_store
+                st.session_state.index_handle = index_handle
+                st.session_state.index_job = index_job
+                st.session_state.failed_job = None
+                st.session_state.video_id = video_id
+                st.session_state.video_key = video_key
                 st.session_state.video_loaded = True
                 st.session_state.summary = None
+                st.session_state.batch_results = None
+                st.session_state.batch_job = None
 
-            render_status_badges()
+            render_status_badges(indexing=index_job is not None)
+            if METRICS_DEBUG_PANEL:
+                render_metrics_panel(metrics_snapshot())
         else:
             st.error("❌ Could not fetch transcript. Check the video ID or ensure captions are available.")
     except RuntimeError as e:
@@ -76,23 +141,100 @@ if load_btn and video_id:
 elif load_btn and not video_id:
     st.warning("⚠️ Please enter a YouTube video ID first.")
 
+# ──────────────────────────────────────────────
+# Background Indexing — progress, then swap in the full index
+# ──────────────────────────────────────────────
+
+index_job = st.session_state.index_job
+if index_job is not None and index_job.complete:
+    from components import get_embeddings, get_index_manager, get_llm
+    from chains import build_rag_chain, get_answer_cache, with_answer_cache
+
+    index_handle = get_index_manager().put(index_job.key, index_job.vector_store, get_embeddings())
+    rag_chain = build_rag_chain(index_handle.as_retriever(), get_llm())
+    if ANSWER_CACHE_ENABLED:
+        rag_chain = with_answer_cache(rag_chain, st.session_state.video_key, get_answer_cache(get_embeddings()))
+    st.session_state.rag_chain = rag_chain
+    st.session_state.index_handle = index_handle
+    st.session_state.index_job = index_job = None
+elif index_job is not None and index_job.done:
+    # Failed: stop polling and keep answering from the partial store until a retry.
+    st.session_state.vector_store = index_job.vector_store
+    st.session_state.failed_job = index_job
+    st.session_state.index_job = index_job = None
+
+failed_job = st.session_state.failed_job
+if failed_job is not None:
+    st.error(f"❌ Indexing stopped: {failed_job.error}. Answers use the part indexed so far.")
+    if st.button("🔁 Retry indexing", use_container_width=True):
+        from components import get_embeddings, get_llm, start_index_job
+        from chains import build_rag_chain
+
+        # Chunks embedded before the failure are served by the embedding cache.
+        index_job = start_index_job(failed_job.key, failed_job.chunks, get_embeddings())
+        st.session_state.rag_chain = build_rag_chain(index_job.as_retriever(), get_llm())
+        st.session_state.vector_store = None
+        st.session_state.index_job = index_job
+        st.session_state.failed_job = failed_job = None
+
+
+def current_vector_store():
+    """The session's per-video index (reloaded if evicted), or the shared index."""
+    if st.session_state.index_handle is not None:
+        return st.session_state.index_handle.vector_store
+    return st.session_state.vector_store
+
+
+def current_video_filter() -> str:
+    """How the session's video is selected in current_vector_store()."""
+    return st.session_state.video_key if USE_SHARED_INDEX else st.session_state.video_id
+
+
+@st.fragment(run_every=1.0)
+def index_progress():
+    job = st.session_state.index_job
+    if job is None:
+        return
+    if job.done:
+        # The full run swaps in the finished index or handles the failure.
+        st.rerun()
+    render_index_progress(job.indexed, job.total, job.covered_seconds, job.total_seconds)
+
+
+if index_job is not None:
+    index_progress()
+
 # ──────────────────────────────────────────────
 # 2. Summary Section
 # ──────────────────────────────────────────────
 
 if st.session_state.video_loaded:
+    from components import get_documents, get_llm
+    from chains import stream_answer, stream_summary, stream_video_summary
+
     st.markdown('<hr class="divider">', unsafe_allow_html=True)
     st.markdown('<div class="glass-card"><h3>📝 Video Summary</h3>', unsafe_allow_html=True)
 
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        summary_btn = st.button("✨ Generate Summary", use_container_width=True)
+        # The summary needs the whole transcript indexed (and is cached as such).
+        summary_btn = st.button("✨ Generate Summary", use_container_width=True, disabled=index_job is not None or failed_job is not None)
 
     if summary_btn:
-        with st.spinner("🤖 Generating summary..."):
-            st.session_state.summary = generate_summary(st.session_state.rag_chain)
-
-    if st.session_state.summary:
+        try:
+            if SUMMARY_MODE == "map_reduce":
+                # Whole-transcript map-reduce; cached per video, model and prompt version
+                with st.spinner("🤖 Summarizing the full transcript..."):
+                    docs = get_documents(current_vector_store(), current_video_filter())
+                    tokens = stream_video_summary(docs, get_llm("background"), st.session_state.video_key)
+                    st.session_state.summary = render_streaming_box(tokens, css_class="summary-box")
+            else:
+                st.session_state.summary = render_streaming_box(
+                    stream_summary(st.session_state.rag_chain), css_class="summary-box"
+                )
+        except RuntimeError as e:
+            st.error(f"❌ {e}")
+    elif st.session_state.summary:
         st.markdown(f'<div class="summary-box">{st.session_state.summary}</div>', unsafe_allow_html=True)
 
     st.markdown('</div>', unsafe_allow_html=True)
@@ -111,10 +253,89 @@ if st.session_state.video_loaded:
         ask_btn = st.button("🚀 Get Answer", use_container_width=True)
 
     if ask_btn and question:
-        with st.spinner("🔍 Searching & generating answer..."):
-            answer = st.session_state.rag_chain.invoke(question)
-        st.markdown(f'<div class="answer-box">{answer}</div>', unsafe_allow_html=True)
+        partial_job = index_job or failed_job
+        if partial_job is not None:
+            render_partial_coverage_notice(partial_job.covered_seconds, partial_job.total_seconds)
+        try:
+            render_streaming_box(stream_answer(st.session_state.rag_chain, question), css_class="answer-box")
+        except RuntimeError as e:
+            st.error(f"❌ {e}")
     elif ask_btn and not question:
         st.warning("⚠️ Please type a question first.")
 
     st.markdown('</div>', unsafe_allow_html=True)
+
+    # ──────────────────────────────────────────
+    # 4. Batch Questions
+    # ──────────────────────────────────────────
+
+    @st.fragment(run_every=1.0)
+    def batch_progress():
+        job = st.session_state.batch_job
+        if job is None:
+            return
+        if job.done:
+            st.rerun()
+        render_batch_progress(job.answered, job.total)
+
+    batch_job = st.session_state.batch_job
+    if batch_job is not None and batch_job.done:
+        st.session_state.batch_results = batch_job.results
+        st.session_state.batch_job = None
+        if batch_job.error:
+            st.error(f"❌ Batch stopped: {batch_job.error}")
+        batch_job = None
+
+    with st.expander("📋 Batch questions", expanded=batch_job is not None):
+        batch_text = st.text_area("Questions", placeholder="One question per line", height=200, label_visibility="collapsed")
+        # Batch retrieval searches a finished index (or a failed job's partial one) in one call.
+        no_index = index_job is not None or (failed_job is not None and failed_job.vector_store is None)
+        batch_btn = st.button("🚀 Answer All", use_container_width=True, disabled=no_index or batch_job is not None)
+
+        if batch_btn:
+            from components import get_embeddings
+            from chains import start_batch_job
+
+            questions = [line.strip() for line in batch_text.splitlines() if line.strip()]
+            if not questions:
+                st.warning("⚠️ Please enter at least one question.")
+            else:
+                try:
+                    # Runs in the background: the LLM rate limit can stretch a batch over minutes.
+                    st.session_state.batch_job = batch_job = start_batch_job(
+                        questions,
+                        current_vector_store(),
+                        # Queued behind interactive Q&A, like summaries.
+                        get_llm("background"),
+                        get_embeddings(),
+                        video_ids=[current_video_filter()] if USE_SHARED_INDEX else None,
+                    )
+                    st.session_state.batch_results = None
+                except RuntimeError as e:
+                    st.error(f"❌ {e}")
+                else:
+                    # Redraw with the button disabled and the progress bar showing.
+                    st.rerun()
+
+        if batch_job is not None:
+            batch_progress()
+
+        if st.session_state.batch_results:
+            from chains import batch_to_csv, batch_to_json
+
+            render_batch_results(st.session_state.batch_results)
+            csv_col, json_col = st.columns(2)
+            with csv_col:
+                st.download_button("⬇️ CSV", batch_to_csv(st.session_state.batch_results), "answers.csv", "text/csv", use_container_width=True)
+            with json_col:
+                st.download_button("⬇️ JSON", batch_to_json(st.session_state.batch_results), "answers.json", "application/json", use_container_width=True)
+
+# ──────────────────────────────────────────────
+# Background warm-up + metrics export
+# ──────────────────────────────────────────────
+
+# Started last so heavy imports and model loading never delay first paint.
+if WARMUP_ON_START:
+    warm_up()
+
+write_prometheus()
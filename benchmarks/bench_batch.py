@@ -0,0 +1,86 @@
+"""
+Batch Q&A throughput: answer_batch() vs. one rag_chain.invoke per question.
+
+Runs offline: synthetic transcript, deterministic fake embeddings and
+FakeStreamingChatModel with Groq-like latency. With --real-embeddings the
+questions are embedded by the app's model, which shows what embedding them
+in one batched call saves over one call per question.
+
+Usage:
+    python -m benchmarks.bench_batch --questions 50 --concurrency 8 --rps 20
+    python -m benchmarks.bench_batch --questions 50 --real-embeddings
+"""
+import argparse
+import time
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from benchmarks.fakes import FakeStreamingChatModel
+from benchmarks.synthetic import synthetic_snippets
+from chains.batch import answer_batch
+from chains.rag_chain import build_rag_chain
+from components.text_splitter import stream_split_snippets
+from components.vector_store import build_vector_store_from_vectors, get_retriever
+
+_TOPICS = "model data training index vector search memory prompt token summary".split()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rps", type=float, default=20, help="LLM calls started per second")
+    parser.add_argument("--first-token-delay", type=float, default=0.3)
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    parser.add_argument("--real-embeddings", action="store_true", help="use the app's embedding model")
+    args = parser.parse_args()
+
+    if args.real_embeddings:
+        from components.embeddings import get_embeddings
+
+        embeddings = get_embeddings()
+    else:
+        embeddings = DeterministicFakeEmbedding(size=384)
+    chunks = list(stream_split_snippets(synthetic_snippets(args.minutes), metadata={"video_id": "bench"}))
+    vectors = embeddings.embed_documents([chunk.page_content for chunk in chunks])
+    vector_store = build_vector_store_from_vectors(chunks, vectors, embeddings, compression=None)
+    llm = FakeStreamingChatModel(first_token_delay=args.first_token_delay, token_delay=args.token_delay)
+    questions = [f"What is said about {_TOPICS[i % len(_TOPICS)]} (#{i})?" for i in range(args.questions)]
+
+    embeddings.embed_query(questions[0])  # warm-up
+    started = time.perf_counter()
+    for question in questions:
+        embeddings.embed_query(question)
+    per_question_s = time.perf_counter() - started
+    started = time.perf_counter()
+    embeddings.embed_documents(questions)
+    batched_s = time.perf_counter() - started
+
+    rag_chain = build_rag_chain(get_retriever(vector_store), llm)
+    started = time.perf_counter()
+    sequential = [rag_chain.invoke(question) for question in questions]
+    sequential_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = answer_batch(
+        questions, vector_store, llm, embeddings,
+        max_concurrency=args.concurrency, requests_per_second=args.rps,
+    )
+    batch_s = time.perf_counter() - started
+
+    assert [result.question for result in batch] == questions
+    assert len(sequential) == len(batch) and not any(result.error for result in batch)
+    print(f"{len(questions)} questions, {len(chunks)} chunks, concurrency {args.concurrency}, {args.rps:g} calls/s")
+    print(f"{'mode':>12} {'total s':>9} {'questions/s':>12}")
+    print(f"{'sequential':>12} {sequential_s:>9.2f} {len(questions) / sequential_s:>12.2f}")
+    print(f"{'batch':>12} {batch_s:>9.2f} {len(questions) / batch_s:>12.2f}")
+    print(f"speedup: {sequential_s / batch_s:.1f}x")
+    print(
+        f"embedding the questions: {per_question_s * 1000:.1f} ms one call each, "
+        f"{batched_s * 1000:.1f} ms in one batch ({per_question_s / max(batched_s, 1e-9):.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Character vs. token-aware chunking: truncation, embedding throughput, retrieval.
+
+Splits a synthetic English and Hindi transcript in both CHUNK_MODEs and
+reports how many chunks exceed the embedding model's max sequence length
+(the tail of those is never embedded), the mean word-pieces per chunk,
+embedding throughput and hit@k: for random phrases of the transcript,
+whether a top-k chunk contains the phrase. Needs the embedding model and
+its tokenizer (Hugging Face cache).
+
+Usage:
+    python -m benchmarks.bench_chunking --minutes 60 --languages en hi --queries 200
+"""
+import argparse
+import os
+import random
+import time
+
+# Must be set before sentence-transformers is imported.
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+
+from benchmarks.synthetic import synthetic_snippets  # noqa: E402
+from components.embeddings import get_embeddings, get_tokenizer  # noqa: E402
+from components.text_splitter import count_truncated, stream_split_snippets  # noqa: E402
+from components.vector_store import build_vector_store_from_vectors, search_many  # noqa: E402
+from config import EMBEDDING_MAX_LENGTH  # noqa: E402
+
+
+def _phrases(snippets: list, count: int, words: int, seed: int) -> list[str]:
+    """Random runs of `words` consecutive words from caption segments."""
+    rng = random.Random(seed)
+    phrases = []
+    while len(phrases) < count:
+        text = rng.choice(snippets).text.split()
+        if len(text) >= words:
+            start = rng.randrange(len(text) - words + 1)
+            phrases.append(" ".join(text[start:start + words]))
+    return phrases
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--languages", nargs="+", default=["en", "hi"], choices=["en", "hi"])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--phrase-words", type=int, default=6)
+    parser.add_argument("--k", type=int, default=4)
+    args = parser.parse_args()
+
+    embeddings = get_embeddings()
+    tokenizer = get_tokenizer()
+    embeddings.embed_documents(["warm-up"] * 8)
+
+    print(f"max sequence length {EMBEDDING_MAX_LENGTH}, {args.queries} phrases of {args.phrase_words} words, hit@{args.k}")
+    print(f"{'lang':>5} {'mode':>7} {'chunks':>7} {'truncated':>10} {'tokens':>7} {'chunks/s':>9} {'min/s':>7} {'hit@k':>7}")
+    for language in args.languages:
+        snippets = list(synthetic_snippets(args.minutes, language=language))
+        phrases = _phrases(snippets, args.queries, args.phrase_words, seed=1)
+        query_vectors = embeddings.embed_documents(phrases)
+
+        for mode in ("chars", "tokens"):
+            chunks = list(stream_split_snippets(snippets, metadata={"video_id": "bench"}, mode=mode))
+            texts = [chunk.page_content for chunk in chunks]
+            truncated = count_truncated(chunks)
+            lengths = [len(ids) for ids in tokenizer(texts, add_special_tokens=True)["input_ids"]]
+
+            started = time.perf_counter()
+            vectors = embeddings.embed_documents(texts)
+            elapsed = time.perf_counter() - started
+
+            vector_store = build_vector_store_from_vectors(chunks, vectors, embeddings, compression=None)
+            results = search_many(vector_store, query_vectors, args.k)
+            hits = sum(any(phrase in doc.page_content for doc in docs) for phrase, docs in zip(phrases, results))
+
+            print(
+                f"{language:>5} {mode:>7} {len(chunks):>7} {truncated:>10} {sum(lengths) / len(lengths):>7.0f} "
+                f"{len(chunks) / elapsed:>9.1f} {args.minutes / elapsed:>7.1f} {hits / len(phrases):>7.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Cold-start cost of the Streamlit app: package import time and time to first render.
+
+Each measurement runs in a fresh interpreter so nothing is already in
+sys.modules. "eager" imports every export of components and chains up
+front, as the packages and app.py did before they became lazy; "lazy"
+imports only what app.py imports at the top today. First render runs
+app.py once with Streamlit's AppTest (no button clicked), which is what a
+user sees before typing a video ID.
+
+Usage:
+    python -m benchmarks.bench_cold_start --runs 5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parents[1]
+
+_EAGER = """
+import components, chains
+for package in (components, chains):
+    for name in package.__all__:
+        getattr(package, name)
+"""
+
+_LAZY = """
+from components import warm_up, timed, metrics_snapshot, write_prometheus
+import chains, ui, config
+"""
+
+_RENDER = """
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file("app.py", default_timeout=120)
+app.run()
+assert not app.exception, app.exception
+"""
+
+
+def _run(body: str) -> float:
+    """Time `body` in a fresh interpreter; returns seconds."""
+    script = f"import time\nstarted = time.perf_counter()\n{body}\nprint(time.perf_counter() - started)\n"
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=_ROOT, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = {
+        "import": {"eager": _EAGER, "lazy": _LAZY},
+        "first render": {"eager": _EAGER + _RENDER, "lazy": _RENDER},
+    }
+    print(f"{'':>14} {'eager s':>9} {'lazy s':>9} {'speedup':>8}")
+    for label, bodies in cases.items():
+        eager = statistics.median(_run(bodies["eager"]) for _ in range(args.runs))
+        lazy = statistics.median(_run(bodies["lazy"]) for _ in range(args.runs))
+        print(f"{label:>14} {eager:>9.3f} {lazy:>9.3f} {eager / lazy:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
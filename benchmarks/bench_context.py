@@ -0,0 +1,91 @@
+"""
+Prompt context size and latency: plain chunk join vs. assemble_context().
+
+Indexes a synthetic transcript, retrieves the top-k chunks for a fixed
+question set and compares the context the old join produced with the
+merged, budget-packed context. Answer latency uses FakeStreamingChatModel
+with a per-prompt-token prefill delay, so smaller prompts answer sooner.
+
+Usage:
+    python -m benchmarks.bench_context --minutes 60 --k 8 --budget 1200
+    python -m benchmarks.bench_context --fake-embeddings
+"""
+import argparse
+import os
+import statistics
+import time
+
+# Must be set before sentence-transformers is imported.
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+
+from langchain_core.embeddings import DeterministicFakeEmbedding  # noqa: E402
+
+from benchmarks.fakes import FakeStreamingChatModel  # noqa: E402
+from benchmarks.synthetic import synthetic_snippets  # noqa: E402
+from chains.context import assemble_context, estimate_tokens  # noqa: E402
+from components.embeddings import get_embeddings  # noqa: E402
+from components.text_splitter import stream_split_snippets  # noqa: E402
+from components.vector_store import build_vector_store  # noqa: E402
+from prompts.templates import RAG_PROMPT  # noqa: E402
+
+_QUESTIONS = [
+    "What is the main topic of the video?",
+    "How does the model use the training data?",
+    "What example is given about vector search?",
+    "What is said about memory and the index?",
+    "How are embeddings used for retrieval?",
+    "What problem does the network solve?",
+    "Which language is the summary written in?",
+    "What result does the python function return?",
+]
+
+
+def _answer_seconds(llm, context: str, question: str) -> float:
+    started = time.perf_counter()
+    for _ in llm.stream(RAG_PROMPT.format_messages(context=context, question=question)):
+        pass
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--k", type=int, default=8, help="Chunks retrieved per question")
+    parser.add_argument("--budget", type=int, default=1200, help="Context token budget")
+    parser.add_argument("--prompt-token-delay", type=float, default=0.0004, help="Simulated prefill seconds per prompt token")
+    parser.add_argument("--fake-embeddings", action="store_true", help="Use a deterministic hash embedding")
+    args = parser.parse_args()
+
+    embeddings = DeterministicFakeEmbedding(size=384) if args.fake_embeddings else get_embeddings()
+    chunks = list(stream_split_snippets(synthetic_snippets(args.minutes), metadata={"video_id": "bench"}))
+    vector_store = build_vector_store(chunks, embeddings)
+    llm = FakeStreamingChatModel(first_token_delay=0.05, token_delay=0.0, prompt_token_delay=args.prompt_token_delay)
+
+    rows = []
+    for question in _QUESTIONS:
+        docs = vector_store.similarity_search(question, k=args.k)
+        joined = "\n\n".join(doc.page_content for doc in docs)
+
+        started = time.perf_counter()
+        packed = assemble_context(docs, args.budget)
+        assemble_ms = (time.perf_counter() - started) * 1000
+
+        rows.append((
+            estimate_tokens(joined),
+            estimate_tokens(packed),
+            assemble_ms,
+            _answer_seconds(llm, joined, question),
+            _answer_seconds(llm, packed, question),
+        ))
+
+    before, after, assemble_ms, latency_before, latency_after = (list(column) for column in zip(*rows))
+    print(f"{len(chunks)} chunks, k={args.k}, budget={args.budget} tokens, {len(rows)} questions")
+    print(f"{'':>18} {'joined':>10} {'assembled':>10}")
+    print(f"{'context tokens':>18} {statistics.mean(before):>10.0f} {statistics.mean(after):>10.0f}")
+    print(f"{'answer s (median)':>18} {statistics.median(latency_before):>10.3f} {statistics.median(latency_after):>10.3f}")
+    print(f"token reduction: {1 - sum(after) / sum(before):.1%}, assemble p50: {statistics.median(assemble_ms):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Embedding throughput and agreement: fp32 PyTorch vs int8 ONNX Runtime.
+
+Embeds the chunks of a synthetic transcript with both backends, reports
+chunks/sec per ONNX thread count, the cosine similarity between the two
+backends' vectors and how many of the fp32 top-k chunks the int8 model
+also retrieves. Exits non-zero when the minimum cosine falls below
+--min-cosine.
+
+Usage:
+    python -m benchmarks.bench_embeddings --minutes 60 --threads 1 2 4
+"""
+import argparse
+import os
+import sys
+import time
+
+# Must be set before sentence-transformers is imported.
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+
+import numpy as np  # noqa: E402
+from langchain_huggingface import HuggingFaceEmbeddings  # noqa: E402
+
+from benchmarks.synthetic import synthetic_snippets  # noqa: E402
+from components.onnx_embeddings import OnnxEmbeddings  # noqa: E402
+from components.text_splitter import stream_split_snippets  # noqa: E402
+from config import EMBEDDING_MODEL  # noqa: E402
+
+_QUESTIONS = [
+    "What is the main topic of the video?",
+    "How does the model use the training data?",
+    "What example is given about vector search?",
+    "What is said about memory and the index?",
+]
+
+
+def _embed(embeddings, texts: list[str]) -> tuple[float, np.ndarray]:
+    """Return (chunks/sec, L2-normalized vectors); a short warm-up run is excluded."""
+    embeddings.embed_documents(texts[:8])
+    started = time.perf_counter()
+    vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+    rate = len(texts) / (time.perf_counter() - started)
+    return rate, vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _top_k(embeddings, vectors: np.ndarray, k: int) -> list[set[int]]:
+    queries = np.asarray([embeddings.embed_query(q) for q in _QUESTIONS], dtype=np.float32)
+    return [set(np.argsort(-(vectors @ query))[:k]) for query in queries]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--min-cosine", type=float, default=0.98)
+    args = parser.parse_args()
+
+    texts = [doc.page_content for doc in stream_split_snippets(synthetic_snippets(args.minutes))]
+    reference = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+    fp32_rate, fp32_vectors = _embed(reference, texts)
+    fp32_top = _top_k(reference, fp32_vectors, args.k)
+
+    print(f"{len(texts)} chunks")
+    print(f"{'backend':>16} {'chunks/s':>10} {'speedup':>8} {'cos mean':>9} {'cos min':>8} {'top-k overlap':>14}")
+    print(f"{'torch fp32':>16} {fp32_rate:>10.1f} {1:>8.2f}")
+    worst = 1.0
+    for threads in args.threads:
+        candidate = OnnxEmbeddings(threads=threads)
+        rate, vectors = _embed(candidate, texts)
+        cosine = (vectors * fp32_vectors).sum(axis=1)
+        overlap = np.mean([len(a & b) / args.k for a, b in zip(fp32_top, _top_k(candidate, vectors, args.k))])
+        worst = min(worst, float(cosine.min()))
+        print(
+            f"{f'onnx int8 x{threads}':>16} {rate:>10.1f} {rate / fp32_rate:>8.2f} "
+            f"{cosine.mean():>9.4f} {cosine.min():>8.4f} {overlap:>14.0%}"
+        )
+
+    if worst < args.min_cosine:
+        print(f"FAIL: min cosine {worst:.4f} < {args.min_cosine}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Offline benchmark of every pipeline stage (Stage 1a–1d + chain).
+
+Times transcript parsing, splitting, embedding throughput, index build,
+retriever queries and end-to-end chain invocation on synthetic
+transcripts. Each length runs in a fresh process, so its peak RSS is its
+own; `stages_rss_mb` is how far the stages raised the peak above the
+loaded embedding model. Synthetic snippets are generated before timing.
+No network or GPU is used: YouTube and Groq are stubbed and the
+embedding model is loaded from the local Hugging Face cache (or replaced
+by a deterministic fake with --fake-embeddings).
+
+Usage:
+    python -m benchmarks.bench_pipeline --minutes 10 60 300 --output bench.json
+    python -m benchmarks.bench_pipeline --minutes 10 60 300 --compare bench.json --threshold 0.2
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Must be set before sentence-transformers is imported.
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+
+from langchain_core.embeddings import DeterministicFakeEmbedding  # noqa: E402
+
+from benchmarks.fakes import FakeStreamingChatModel, StubTranscriptApi  # noqa: E402
+from chains.rag_chain import build_rag_chain  # noqa: E402
+from components.document_loader import load_transcript  # noqa: E402
+from components.embedding_cache import EmbeddingCache  # noqa: E402
+from components.embeddings import get_embeddings  # noqa: E402
+from components.text_splitter import split_text, stream_split_snippets  # noqa: E402
+from components.vector_store import build_vector_store, get_retriever  # noqa: E402
+
+_QUESTIONS = [
+    "What is the main topic of the video?",
+    "How does the model use the training data?",
+    "What example is given about vector search?",
+    "What is said about memory and the index?",
+]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2 ** 20 if sys.platform == "darwin" else 2 ** 10)
+
+
+def _timed(fn, repeat: int = 1):
+    """Run fn `repeat` times; return (median seconds, last result)."""
+    times, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), result
+
+
+def run_stage_benchmarks(minutes: float, embeddings, llm, repeat: int, queries: int) -> dict:
+    """Benchmark every stage on one synthetic transcript length."""
+    # Generated up front: fixture generation is not part of any stage.
+    api = StubTranscriptApi(minutes)
+    snippets = api.fetch("bench")
+    baseline_rss = _peak_rss_mb()
+    results: dict[str, float] = {}
+
+    # Stage 1a — parsing/joining the fetched transcript
+    results["load_transcript_s"], transcript = _timed(lambda: load_transcript("bench", api=api), repeat)
+
+    # Stage 1b — splitting (string path and streaming path)
+    results["split_text_s"], chunks = _timed(lambda: split_text(transcript), repeat)
+    results["stream_split_s"], _ = _timed(lambda: list(stream_split_snippets(snippets)), repeat)
+    results["chunks"] = len(chunks)
+
+    # Stage 1c — raw embedding throughput
+    texts = [chunk.page_content for chunk in chunks]
+    seconds, _ = _timed(lambda: embeddings.embed_documents(texts))
+    results["embed_s"] = seconds
+    results["embed_chunks_per_s"] = len(texts) / seconds if seconds else 0.0
+
+    # Stage 1d — index build, cold (every chunk embedded) and warm (all cache hits)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = EmbeddingCache(cache_dir)
+        results["build_vector_store_cold_s"], vector_store = _timed(lambda: build_vector_store(chunks, embeddings, cache))
+        results["build_vector_store_warm_s"], _ = _timed(lambda: build_vector_store(chunks, embeddings, cache), repeat)
+
+    # Retriever query latency
+    retriever = get_retriever(vector_store)
+    latencies = []
+    for i in range(queries):
+        seconds, _ = _timed(lambda: retriever.invoke(_QUESTIONS[i % len(_QUESTIONS)]))
+        latencies.append(seconds)
+    latencies.sort()
+    results["retriever_p50_ms"] = latencies[len(latencies) // 2] * 1000
+    results["retriever_p95_ms"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000
+
+    # End-to-end chain with the deterministic fake LLM
+    rag_chain = build_rag_chain(retriever, llm)
+    results["chain_invoke_s"], _ = _timed(lambda: rag_chain.invoke(_QUESTIONS[0]), repeat)
+
+    results["peak_rss_mb"] = _peak_rss_mb()
+    results["stages_rss_mb"] = results["peak_rss_mb"] - baseline_rss
+    return results
+
+
+def _run_length(minutes: float, fake_embeddings: bool, repeat: int, queries: int) -> dict:
+    """Worker-process entry: load the models, then benchmark one length."""
+    embeddings = DeterministicFakeEmbedding(size=384) if fake_embeddings else get_embeddings()
+    embeddings.embed_documents(["warm-up"])
+    llm = FakeStreamingChatModel(first_token_delay=0.0, token_delay=0.0)
+    return run_stage_benchmarks(minutes, embeddings, llm, repeat, queries)
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """
+    List metrics that regressed by more than `threshold` (0.2 = 20 %).
+
+    Time and memory metrics regress when they grow; throughput metrics
+    (`*_per_s`) regress when they shrink. Counts are not compared.
+    """
+    regressions = []
+    for length, metrics in current["results"].items():
+        base = baseline.get("results", {}).get(length)
+        if base is None:
+            continue
+        for name, value in metrics.items():
+            old = base.get(name)
+            if not old or name == "chunks":
+                continue
+            change = (old - value) / old if name.endswith("_per_s") else (value - old) / old
+            if change > threshold:
+                regressions.append(f"{length} min {name}: {old:.4g} → {value:.4g} ({change:+.0%})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[10, 60, 300])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per cheap stage (median is kept)")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--fake-embeddings", action="store_true", help="Use a deterministic hash embedding")
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--compare", help="Baseline results JSON to check against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "embeddings": "fake" if args.fake_embeddings else "model",
+            "timestamp": time.time(),
+        },
+        "results": {},
+    }
+    for minutes in args.minutes:
+        # A fresh process per length: ru_maxrss never goes down within one.
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = pool.submit(_run_length, minutes, args.fake_embeddings, args.repeat, args.queries).result()
+        report["results"][f"{minutes:g}"] = results
+        print(f"── {minutes:g} min ──")
+        for name, value in results.items():
+            print(f"  {name:<28} {value:>12.4f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("embeddings") != report["meta"]["embeddings"]:
+            print("warning: baseline used a different embedding backend", file=sys.stderr)
+        regressions = compare(baseline, report, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
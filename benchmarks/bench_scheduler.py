@@ -0,0 +1,113 @@
+"""
+LLM scheduler under a provider rate limit: raw calls vs. schedule().
+
+Simulated users call FakeStreamingChatModel concurrently; the fake answers
+429 above `--limit` calls per `--window` seconds. Most users ask one of a
+few popular questions, a few request background summaries. Raw calls fail
+on 429; scheduled calls are paced, retried, and identical in-flight
+prompts share one upstream call.
+
+Usage:
+    python -m benchmarks.bench_scheduler --users 200 --limit 20 --window 1
+"""
+import argparse
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fakes import FakeStreamingChatModel
+from components.llm_scheduler import LLMScheduler, schedule
+
+
+def _prompts(users: int, popular: int, background_share: float, seed: int) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    prompts = []
+    for i in range(users):
+        if rng.random() < background_share:
+            prompts.append(("background", f"Summarize part {i} of the transcript."))
+        elif rng.random() < 0.8:
+            prompts.append(("interactive", f"Popular question #{rng.randrange(popular)}?"))
+        else:
+            prompts.append(("interactive", f"Unique question #{i}?"))
+    return prompts
+
+
+def _run(call, prompts: list[tuple[str, str]], users: int, arrival_s: float) -> tuple[dict, float]:
+    def user(i: int, priority: str, prompt: str):
+        time.sleep(i * arrival_s / len(prompts))
+        started = time.perf_counter()
+        try:
+            call(priority, prompt)
+            return priority, time.perf_counter() - started, None
+        except Exception as e:
+            return priority, time.perf_counter() - started, e
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        results = list(pool.map(lambda args: user(*args), [(i, *p) for i, p in enumerate(prompts)]))
+    total = time.perf_counter() - started
+
+    by_priority = {}
+    for priority, seconds, error in results:
+        stats = by_priority.setdefault(priority, {"ok": [], "failed": 0})
+        if error is None:
+            stats["ok"].append(seconds)
+        else:
+            stats["failed"] += 1
+    return by_priority, total
+
+
+def _report(name: str, by_priority: dict, total: float, llm: FakeStreamingChatModel) -> None:
+    for priority, stats in sorted(by_priority.items()):
+        ok = sorted(stats["ok"])
+        p50 = statistics.median(ok) if ok else 0.0
+        p95 = ok[int(0.95 * (len(ok) - 1))] if ok else 0.0
+        print(f"{name:>10} {priority:>12} {len(ok):>5} {stats['failed']:>7} {p50:>8.2f} {p95:>8.2f}")
+    print(f"{'':>10} upstream calls {llm.calls}, 429s {llm.rejected}, wall {total:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--popular", type=int, default=5, help="Distinct popular questions")
+    parser.add_argument("--background-share", type=float, default=0.1)
+    parser.add_argument("--arrival", type=float, default=2.0, help="Seconds over which users arrive")
+    parser.add_argument("--limit", type=int, default=20, help="Fake provider calls per window")
+    parser.add_argument("--window", type=float, default=1.0, help="Fake provider window in seconds")
+    parser.add_argument("--latency", type=float, default=0.3, help="Seconds per fake LLM call")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    prompts = _prompts(args.users, args.popular, args.background_share, args.seed)
+
+    def fake() -> FakeStreamingChatModel:
+        return FakeStreamingChatModel(
+            response_tokens=20, first_token_delay=args.latency, token_delay=0.0,
+            rate_limit_rpm=args.limit, rate_limit_window=args.window,
+        )
+
+    print(f"{args.users} users over {args.arrival:g}s, provider limit {args.limit} calls / {args.window:g}s")
+    print(f"{'mode':>10} {'priority':>12} {'ok':>5} {'failed':>7} {'p50 s':>8} {'p95 s':>8}")
+
+    raw = fake()
+    by_priority, total = _run(lambda priority, prompt: raw.invoke(prompt), prompts, args.users, args.arrival)
+    _report("raw", by_priority, total, raw)
+
+    upstream = fake()
+    scheduler = LLMScheduler(
+        requests_per_minute=args.limit * 60 / args.window,
+        tokens_per_minute=None,
+        max_retries=8,
+        retry_base_seconds=args.window / 4,
+        retry_max_seconds=args.window * 2,
+        burst_seconds=args.window,
+    )
+    llm = schedule(upstream, scheduler=scheduler)
+    by_priority, total = _run(lambda priority, prompt: llm.with_priority(priority).invoke(prompt), prompts, args.users, args.arrival)
+    _report("scheduled", by_priority, total, upstream)
+    print(f"scheduler: {scheduler.stats()}")
+
+
+if __name__ == "__main__":
+    main()
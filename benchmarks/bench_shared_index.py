@@ -0,0 +1,60 @@
+"""
+Query latency of the shared multi-video index vs. per-video flat indexes.
+
+Uses random vectors, so no embedding model is needed.
+
+Usage:
+    python -m benchmarks.bench_shared_index --videos 10 100 1000 --chunks 60
+"""
+import argparse
+import time
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+
+from components.shared_index import SharedVideoIndex
+
+_DIM = 384  # all-MiniLM-L6-v2
+
+
+def _latency_ms(fn, queries: np.ndarray) -> float:
+    started = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return (time.perf_counter() - started) / len(queries) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--videos", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--chunks", type=int, default=60, help="Chunks per video (~1 h of speech)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    queries = rng.standard_normal((args.queries, _DIM)).astype(np.float32)
+
+    print(f"{'videos':>7} {'chunks':>8} {'index':>5} {'flat/video ms':>14} {'shared/video ms':>16} {'shared/all ms':>14}")
+    for n_videos in args.videos:
+        shared = SharedVideoIndex(_DIM)
+        per_video = {}
+        for v in range(n_videos):
+            vectors = rng.standard_normal((args.chunks, _DIM)).astype(np.float32)
+            docs = [Document(page_content=f"video {v} chunk {c}") for c in range(args.chunks)]
+            shared.add_video(f"v{v}", docs, vectors)
+            flat = faiss.IndexFlatL2(_DIM)
+            flat.add(vectors)
+            per_video[f"v{v}"] = flat
+
+        target = f"v{n_videos // 2}"
+        flat_ms = _latency_ms(lambda q: per_video[target].search(q.reshape(1, -1), args.k), queries)
+        one_ms = _latency_ms(lambda q: shared.search(q, args.k, [target]), queries)
+        all_ms = _latency_ms(lambda q: shared.search(q, args.k), queries)
+        kind = "ivf" if shared.is_ivf else "flat"
+        print(f"{n_videos:>7} {len(shared):>8} {kind:>5} {flat_ms:>14.3f} {one_ms:>16.3f} {all_ms:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare the string-based and streaming transcript splitters.
+
+Reports time and peak traced memory of both paths, and checks that they
+produce the same chunks (text and start_index); exits non-zero if not.
+
+Usage:
+    python -m benchmarks.bench_splitter --minutes 60 180 300
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+
+from benchmarks.synthetic import synthetic_snippets
+from components.text_splitter import split_text, stream_split_snippets
+
+
+def _measure(fn) -> tuple[float, int, list]:
+    """Run fn and return (seconds, peak traced bytes, (text, start_index) per chunk)."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    chunks = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, chunks
+
+
+def _current_path(minutes: float) -> list[tuple[str, int]]:
+    # Mirrors load_transcript() + split_text(): join, then re-scan the string.
+    snippets = list(synthetic_snippets(minutes))
+    transcript = " ".join(snippet.text for snippet in snippets)
+    return [(doc.page_content, doc.metadata["start_index"]) for doc in split_text(transcript)]
+
+
+def _streaming_path(minutes: float) -> list[tuple[str, int]]:
+    # Chunks are consumed as they are produced, as an index builder would.
+    return [(doc.page_content, doc.metadata["start_index"]) for doc in stream_split_snippets(synthetic_snippets(minutes))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[60, 180, 300])
+    args = parser.parse_args()
+
+    print(f"{'minutes':>8} {'path':>10} {'chunks':>7} {'max_len':>8} {'mean_len':>9} {'seconds':>8} {'peak_MiB':>9} {'same':>5}")
+    different = []
+    for minutes in args.minutes:
+        reference = None
+        for name, path in (("current", _current_path), ("streaming", _streaming_path)):
+            elapsed, peak, chunks = _measure(lambda: path(minutes))
+            reference = chunks if reference is None else reference
+            same = chunks == reference
+            if not same:
+                different.append(minutes)
+            lengths = [len(text) for text, _ in chunks]
+            print(
+                f"{minutes:>8.0f} {name:>10} {len(lengths):>7} {max(lengths):>8} "
+                f"{sum(lengths) / len(lengths):>9.1f} {elapsed:>8.3f} {peak / 2**20:>9.2f} {'yes' if same else 'NO':>5}"
+            )
+    if different:
+        print(f"streaming chunks differ from split_text() at {different} minutes", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
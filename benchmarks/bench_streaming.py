@@ -0,0 +1,54 @@
+"""
+Time-to-first-token vs. total latency of the RAG chain, blocking vs. streaming.
+
+Runs offline against FakeStreamingChatModel.
+
+Usage:
+    python -m benchmarks.bench_streaming --runs 5 --first-token-delay 0.3 --token-delay 0.02
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.fakes import FakeStreamingChatModel, fake_retriever
+from chains.rag_chain import build_rag_chain, stream_answer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--first-token-delay", type=float, default=0.3)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    args = parser.parse_args()
+
+    llm = FakeStreamingChatModel(
+        response_tokens=args.tokens,
+        first_token_delay=args.first_token_delay,
+        token_delay=args.token_delay,
+    )
+    rag_chain = build_rag_chain(fake_retriever(), llm)
+
+    blocking, ttft, streamed = [], [], []
+    for i in range(args.runs):
+        question = f"What is point {i} of the video?"
+
+        started = time.perf_counter()
+        rag_chain.invoke(question)
+        blocking.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        first = None
+        for _ in stream_answer(rag_chain, question):
+            if first is None:
+                first = time.perf_counter() - started
+        streamed.append(time.perf_counter() - started)
+        ttft.append(first)
+
+    print(f"{'mode':>10} {'first output s':>15} {'total s':>9}")
+    print(f"{'invoke':>10} {statistics.median(blocking):>15.3f} {statistics.median(blocking):>9.3f}")
+    print(f"{'stream':>10} {statistics.median(ttft):>15.3f} {statistics.median(streamed):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
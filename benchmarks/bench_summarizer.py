@@ -0,0 +1,43 @@
+"""
+Wall-clock time of the map step: concurrent vs. sequential LLM calls.
+
+Runs offline on a synthetic transcript with FakeStreamingChatModel.
+
+Usage:
+    python -m benchmarks.bench_summarizer --minutes 180 --concurrency 1 4 8
+"""
+import argparse
+import time
+
+from benchmarks.fakes import FakeStreamingChatModel
+from benchmarks.synthetic import synthetic_snippets
+from chains.summarizer import build_windows, map_summaries
+from components.text_splitter import stream_split_snippets
+from config import SUMMARY_WINDOW_TOKENS
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=180)
+    parser.add_argument("--window-tokens", type=int, default=SUMMARY_WINDOW_TOKENS)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--call-latency", type=float, default=1.0, help="Seconds per fake LLM call")
+    args = parser.parse_args()
+
+    docs = list(stream_split_snippets(synthetic_snippets(args.minutes)))
+    windows = build_windows(docs, args.window_tokens)
+    llm = FakeStreamingChatModel(response_tokens=150, first_token_delay=args.call_latency, token_delay=0.0)
+    print(f"{len(docs)} chunks → {len(windows)} map windows")
+
+    baseline = None
+    print(f"{'concurrency':>12} {'seconds':>8} {'speedup':>8}")
+    for concurrency in args.concurrency:
+        started = time.perf_counter()
+        map_summaries(llm, windows, concurrency)
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        print(f"{concurrency:>12} {elapsed:>8.2f} {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
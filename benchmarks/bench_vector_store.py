@@ -0,0 +1,103 @@
+"""
+Memory per 1k chunks and recall: float32 FAISS vs. compressed stores.
+
+Builds the current flat float32 store (FAISS.from_embeddings with an
+in-memory docstore) and each CompactFAISS variant over the same synthetic
+chunks, then reports resident bytes per 1k chunks (vector codes + Python
+heap for the docstore and ID map), on-disk size, recall@k against exact
+search and query latency. Mapped loads are timed from a saved copy.
+
+Usage:
+    python -m benchmarks.bench_vector_store --minutes 600 --compression fp16 int8 pq
+    python -m benchmarks.bench_vector_store --fake-embeddings
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Must be set before sentence-transformers is imported.
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+
+import numpy as np  # noqa: E402
+from langchain_core.embeddings import DeterministicFakeEmbedding  # noqa: E402
+
+from benchmarks.synthetic import synthetic_snippets  # noqa: E402
+from components.embeddings import get_embeddings  # noqa: E402
+from components.text_splitter import stream_split_snippets  # noqa: E402
+from components.vector_store import CompactFAISS, build_vector_store_from_vectors  # noqa: E402
+
+_QUESTIONS = [
+    "What is the main topic of the video?",
+    "How does the model use the training data?",
+    "What example is given about vector search?",
+    "What is said about memory and the index?",
+    "How are embeddings used for retrieval?",
+    "What problem does the network solve?",
+]
+
+
+def _build(documents, vectors, embeddings, compression):
+    """Return (store, Python heap bytes held by it)."""
+    tracemalloc.start()
+    store = build_vector_store_from_vectors(documents, vectors, embeddings, compression=compression)
+    heap, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return store, heap
+
+
+def _codes_bytes(store) -> int:
+    index = store.index
+    return index.ntotal * (index.sa_code_size() if hasattr(index, "sa_code_size") else index.d * 4)
+
+
+def _top_k(store, queries: np.ndarray, k: int) -> tuple[list[set[str]], float]:
+    started = time.perf_counter()
+    _, rows = store.index.search(queries, k)
+    seconds = (time.perf_counter() - started) / len(queries)
+    return [{store.index_to_docstore_id[i] for i in row if i != -1} for row in rows], seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=600)
+    parser.add_argument("--compression", nargs="+", default=["fp16", "int8", "pq"])
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--fake-embeddings", action="store_true", help="Use a deterministic hash embedding")
+    args = parser.parse_args()
+
+    embeddings = DeterministicFakeEmbedding(size=384) if args.fake_embeddings else get_embeddings()
+    documents = list(stream_split_snippets(synthetic_snippets(args.minutes), metadata={"video_id": "bench"}))
+    vectors = np.asarray(embeddings.embed_documents([doc.page_content for doc in documents]), dtype=np.float32)
+    queries = np.asarray(embeddings.embed_documents(_QUESTIONS), dtype=np.float32)
+    per_1k = 1000 / len(documents)
+
+    baseline, _ = _build(documents, vectors, embeddings, None)
+    exact, _ = _top_k(baseline, queries, args.k)
+
+    print(f"{len(documents)} chunks, recall@{args.k} vs exact float32 search")
+    print(f"{'store':>10} {'KiB/1k resident':>16} {'KiB/1k disk':>12} {'recall':>7} {'query ms':>9} {'mmap load ms':>13}")
+    for compression in [None, *args.compression]:
+        store, heap = _build(documents, vectors, embeddings, compression)
+        found, query_s = _top_k(store, queries, args.k)
+        recall = np.mean([len(a & b) / len(a) for a, b in zip(exact, found)])
+        with tempfile.TemporaryDirectory() as folder:
+            store.save_local(folder)
+            disk = sum(f.stat().st_size for f in Path(folder).iterdir())
+            load_ms = float("nan")
+            if compression:
+                started = time.perf_counter()
+                CompactFAISS.load_local(folder, embeddings)
+                load_ms = (time.perf_counter() - started) * 1000
+        resident = (heap + _codes_bytes(store)) * per_1k / 1024
+        print(
+            f"{compression or 'float32':>10} {resident:>16.1f} {disk * per_1k / 1024:>12.1f} "
+            f"{recall:>7.1%} {query_s * 1000:>9.3f} {load_ms:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
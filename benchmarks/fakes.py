@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+import threading
+import time
+import zlib
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Iterator
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.documents import Document
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import PrivateAttr
+
+from benchmarks.synthetic import synthetic_snippets
+
+# ──────────────────────────────────────────────
+# Offline Stand-ins for YouTube, Groq and the Retriever
+# ──────────────────────────────────────────────
+
+_WORDS = "the video explains how the model uses context from the transcript to answer".split()
+
+
+class FakeRateLimitError(Exception):
+    """Groq-style 429, carrying a Retry-After header like groq.RateLimitError."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limit reached, retry after {retry_after:.2f}s")
+        self.response = SimpleNamespace(status_code=429, headers={"retry-after": f"{retry_after:.3f}"})
+
+
+class FakeStreamingChatModel(BaseChatModel):
+    """
+    Deterministic chat model with Groq-like latency, for tests and benchmarks.
+
+    The reply depends only on the prompt text, so repeated runs are
+    comparable. Streaming waits `first_token_delay` (plus
+    `prompt_token_delay` per prompt token, for prefill) before the first
+    token and `token_delay` between tokens. With `rate_limit_rpm` set, calls
+    beyond that many per `rate_limit_window` seconds raise FakeRateLimitError;
+    `calls` counts the calls that got through.
+    """
+
+    response_tokens: int = 60
+    first_token_delay: float = 0.2
+    token_delay: float = 0.01
+    prompt_token_delay: float = 0.0
+    rate_limit_rpm: int = 0
+    rate_limit_window: float = 60.0
+
+    _started: deque = PrivateAttr(default_factory=deque)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _calls: int = PrivateAttr(default=0)
+    _rejected: int = PrivateAttr(default=0)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-streaming"
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    @property
+    def rejected(self) -> int:
+        return self._rejected
+
+    def _admit(self) -> None:
+        # Sliding-window limiter, like the provider's.
+        with self._lock:
+            now = time.monotonic()
+            while self._started and now - self._started[0] >= self.rate_limit_window:
+                self._started.popleft()
+            if self.rate_limit_rpm and len(self._started) >= self.rate_limit_rpm:
+                self._rejected += 1
+                raise FakeRateLimitError(self.rate_limit_window - (now - self._started[0]))
+            self._started.append(now)
+            self._calls += 1
+
+    def _prefill(self, messages: list[BaseMessage]) -> float:
+        prompt_chars = sum(len(str(message.content)) for message in messages)
+        return self.first_token_delay + self.prompt_token_delay * (prompt_chars // 4)
+
+    def _tokens(self, messages: list[BaseMessage]) -> list[str]:
+        prompt = "".join(str(message.content) for message in messages)
+        seed = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16)
+        words = [_WORDS[(seed >> i) % len(_WORDS)] for i in range(self.response_tokens)]
+        return [word if i == 0 else f" {word}" for i, word in enumerate(words)]
+
+    def _generate(self, messages: list[BaseMessage], stop: list[str] | None = None, run_manager: CallbackManagerForLLMRun | None = None, **kwargs: Any) -> ChatResult:
+        self._admit()
+        tokens = self._tokens(messages)
+        time.sleep(self._prefill(messages) + self.token_delay * (len(tokens) - 1))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(tokens)))])
+
+    async def _agenerate(self, messages: list[BaseMessage], stop: list[str] | None = None, run_manager: AsyncCallbackManagerForLLMRun | None = None, **kwargs: Any) -> ChatResult:
+        self._admit()
+        tokens = self._tokens(messages)
+        await asyncio.sleep(self._prefill(messages) + self.token_delay * (len(tokens) - 1))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(tokens)))])
+
+    def _stream(self, messages: list[BaseMessage], stop: list[str] | None = None, run_manager: CallbackManagerForLLMRun | None = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        self._admit()
+        prefill = self._prefill(messages)
+        for i, token in enumerate(self._tokens(messages)):
+            time.sleep(prefill if i == 0 else self.token_delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            yield chunk
+
+    async def _astream(self, messages: list[BaseMessage], stop: list[str] | None = None, run_manager: AsyncCallbackManagerForLLMRun | None = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        self._admit()
+        prefill = self._prefill(messages)
+        for i, token in enumerate(self._tokens(messages)):
+            await asyncio.sleep(prefill if i == 0 else self.token_delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            yield chunk
+
+
+def fake_retriever(chunks: int = 4, chunk_chars: int = 1000) -> RunnableLambda:
+    """Retriever stand-in returning fixed chunks, usable in build_rag_chain()."""
+    docs = [Document(page_content=("transcript text " * chunk_chars)[:chunk_chars]) for _ in range(chunks)]
+    return RunnableLambda(lambda question: docs)
+
+
+class StubTranscriptApi:
+    """
+    YouTubeTranscriptApi stand-in serving synthetic transcripts.
+
+    Pass as `api=` to load_transcript()/load_transcript_snippets(). Each
+    video ID maps to a fixed transcript of `minutes` length, generated on
+    its first fetch and served from memory afterwards.
+    """
+
+    def __init__(self, minutes: float = 60):
+        self.minutes = minutes
+        self._transcripts: dict[str, list] = {}
+
+    def fetch(self, video_id: str, languages=("en",)):
+        if video_id not in self._transcripts:
+            seed = zlib.crc32(video_id.encode("utf-8"))
+            self._transcripts[video_id] = list(synthetic_snippets(self.minutes, seed=seed))
+        return self._transcripts[video_id]
@@ -0,0 +1,76 @@
+"""
+Load-test the HTTP service: p50/p95 latency and requests/sec.
+
+Start the server first (e.g. with the stub LLM), then run:
+    python server.py --fake-llm --port 8000
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --video-id LPZh9BOjkQs \\
+        --requests 200 --concurrency 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+_QUESTIONS = [
+    "What is this video about?",
+    "What are the main takeaways?",
+    "Which examples are discussed?",
+    "What does the speaker conclude?",
+]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def _run(args) -> None:
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        response = await client.post("/videos", json={"video_id": args.video_id})
+        response.raise_for_status()
+        print(f"ingested {args.video_id}: {response.json()['chunks']} chunks")
+
+        latencies: list[float] = []
+        errors = 0
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def one(i: int) -> None:
+            nonlocal errors
+            question = f"{_QUESTIONS[i % len(_QUESTIONS)]} (#{i})" if args.unique else _QUESTIONS[i % len(_QUESTIONS)]
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    r = await client.post(f"/videos/{args.video_id}/ask", json={"question": question})
+                    r.raise_for_status()
+                    latencies.append(time.perf_counter() - started)
+                except httpx.HTTPError:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+    if not latencies:
+        print(f"all {errors} requests failed")
+        return
+    print(f"requests={args.requests} concurrency={args.concurrency} errors={errors}")
+    print(f"p50={_percentile(latencies, 50) * 1000:.0f}ms p95={_percentile(latencies, 95) * 1000:.0f}ms "
+          f"mean={statistics.mean(latencies) * 1000:.0f}ms")
+    print(f"throughput={len(latencies) / elapsed:.1f} req/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--video-id", required=True)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--unique", action="store_true", help="Make every question unique (bypass the answer cache)")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import random
+from typing import Iterator
+
+from components.document_loader import TranscriptSnippet
+
+# ──────────────────────────────────────────────
+# Synthetic Transcripts for Offline Benchmarks
+# ──────────────────────────────────────────────
+
+_VOCABULARY = (
+    "the a and of to in is that it for on with as this we you are be at or "
+    "model data video learning network python training layer function value "
+    "question answer example result problem system memory index vector search "
+    "transcript chunk embedding retrieval prompt context token language summary"
+).split()
+
+# Hindi captions: Devanagari splits into many more word-pieces per character.
+_HINDI_VOCABULARY = (
+    "यह और का के की में है कि हम आप मॉडल डेटा वीडियो सीखना नेटवर्क प्रशिक्षण "
+    "परत फ़ंक्शन मान प्रश्न उत्तर उदाहरण परिणाम समस्या प्रणाली स्मृति खोज "
+    "प्रतिलेख संदर्भ भाषा सारांश जानकारी समझना"
+).split()
+
+_VOCABULARIES = {"en": _VOCABULARY, "hi": _HINDI_VOCABULARY}
+
+# Auto-generated captions average roughly 2.5 words/second in ~4 s segments.
+_WORDS_PER_SECOND = 2.5
+_SEGMENT_SECONDS = 4.0
+
+
+def synthetic_snippets(minutes: float, seed: int = 0, language: str = "en") -> Iterator[TranscriptSnippet]:
+    """
+    Yield caption segments for a transcript of the given length.
+
+    Args:
+        minutes: Video length in minutes.
+        seed: Seed so two runs produce the same transcript.
+        language: "en" or "hi" vocabulary.
+
+    Yields:
+        TranscriptSnippet objects with realistic timing.
+    """
+    rng = random.Random(seed)
+    vocabulary = _VOCABULARIES[language]
+    words_per_segment = int(_WORDS_PER_SECOND * _SEGMENT_SECONDS)
+    start = 0.0
+    while start < minutes * 60:
+        text = " ".join(rng.choice(vocabulary) for _ in range(words_per_segment))
+        yield TranscriptSnippet(text, start, _SEGMENT_SECONDS)
+        start += _SEGMENT_SECONDS
@@ -1,3 +1,43 @@
-from chains.rag_chain import build_rag_chain, generate_summary
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ["build_rag_chain", "generate_summary"]
+# Imported on first attribute access (PEP 562); see components/__init__.py.
+_EXPORTS = {
+    "build_rag_chain": "chains.rag_chain",
+    "generate_summary": "chains.rag_chain",
+    "stream_answer": "chains.rag_chain",
+    "stream_summary": "chains.rag_chain",
+    "stream_video_summary": "chains.summarizer",
+    "summarize_video": "chains.summarizer",
+    "BatchAnswer": "chains.batch",
+    "BatchJob": "chains.batch",
+    "answer_batch": "chains.batch",
+    "batch_to_csv": "chains.batch",
+    "batch_to_json": "chains.batch",
+    "start_batch_job": "chains.batch",
+    "AnswerCache": "chains.answer_cache",
+    "get_answer_cache": "chains.answer_cache",
+    "with_answer_cache": "chains.answer_cache",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from chains.rag_chain import build_rag_chain, generate_summary, stream_answer, stream_summary
+    from chains.summarizer import stream_video_summary, summarize_video
+    from chains.batch import BatchAnswer, BatchJob, answer_batch, batch_to_csv, batch_to_json, start_batch_job
+    from chains.answer_cache import AnswerCache, get_answer_cache, with_answer_cache
@@ -0,0 +1,230 @@
+import asyncio
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from dataclasses import dataclass
+
+import numpy as np
+from langchain_core.runnables import Runnable, RunnableGenerator, RunnableLambda
+
+from components.metrics import register_collector
+from components.registry import get_or_create
+from config import (
+    ANSWER_CACHE_MAX_BYTES,
+    ANSWER_CACHE_MAX_ENTRIES,
+    ANSWER_CACHE_SIMILARITY,
+    ANSWER_CACHE_TTL_SECONDS,
+    LLM_MODEL,
+)
+from prompts.templates import PROMPT_VERSION
+
+# ──────────────────────────────────────────────
+# Answer Cache — exact + semantic tiers
+# ──────────────────────────────────────────────
+
+# Rough per-entry bookkeeping cost on top of the strings and vector.
+_ENTRY_OVERHEAD_BYTES = 256
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return re.sub(r"[\s?!.]+$", "", " ".join(question.lower().split()))
+
+
+@dataclass
+class _Entry:
+    answer: str
+    created: float
+    vector: np.ndarray | None
+    size: int
+
+
+class AnswerCache:
+    """
+    LRU/TTL cache of final answers, scoped per video, prompt and model.
+
+    Exact tier: keyed by (video_id, normalized question, prompt version, model).
+    Semantic tier: on an exact miss, reuses the answer of the most similar
+    cached question for the same video if the cosine similarity of their
+    embeddings reaches `similarity`.
+
+    Args:
+        embeddings: Model used to embed questions (None disables the semantic tier).
+        max_entries: Max cached answers.
+        max_bytes: Approximate memory cap for all entries.
+        ttl_seconds: Age after which an entry is no longer served.
+        similarity: Cosine threshold for semantic hits.
+    """
+
+    def __init__(
+        self,
+        embeddings=None,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+        max_bytes: int = ANSWER_CACHE_MAX_BYTES,
+        ttl_seconds: float = ANSWER_CACHE_TTL_SECONDS,
+        similarity: float = ANSWER_CACHE_SIMILARITY,
+    ):
+        self.embeddings = embeddings
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.similarity = similarity
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._groups: dict[tuple, set[tuple]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _group(key: tuple) -> tuple:
+        video_id, _, prompt_version, model = key
+        return video_id, prompt_version, model
+
+    def _embed(self, question: str) -> np.ndarray | None:
+        if self.embeddings is None:
+            return None
+        vector = np.asarray(self.embeddings.embed_query(question), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def _drop(self, key: tuple) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        group = self._groups.get(self._group(key))
+        if group is not None:
+            group.discard(key)
+            if not group:
+                del self._groups[self._group(key)]
+
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        return now - entry.created > self.ttl_seconds
+
+    def get(self, video_id: str, question: str, model: str = LLM_MODEL, prompt_version: str = PROMPT_VERSION) -> tuple[str | None, np.ndarray | None]:
+        """
+        Look a question up in both tiers.
+
+        Returns:
+            (answer or None, question vector). Pass the vector back to put()
+            so a miss does not embed the question twice.
+        """
+        key = (video_id, normalize_question(question), prompt_version, model)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry, now):
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return entry.answer, entry.vector
+            if entry is not None:
+                self._drop(key)
+
+        vector = self._embed(question)
+        with self._lock:
+            if vector is not None:
+                candidates = [
+                    k for k in self._groups.get(self._group(key), ())
+                    if not self._expired(self._entries[k], now) and self._entries[k].vector is not None
+                ]
+                if candidates:
+                    matrix = np.stack([self._entries[k].vector for k in candidates])
+                    scores = matrix @ vector
+                    best = int(np.argmax(scores))
+                    if scores[best] >= self.similarity:
+                        self._entries.move_to_end(candidates[best])
+                        self.semantic_hits += 1
+                        return self._entries[candidates[best]].answer, vector
+            self.misses += 1
+        return None, vector
+
+    def put(self, video_id: str, question: str, answer: str, vector: np.ndarray | None = None, model: str = LLM_MODEL, prompt_version: str = PROMPT_VERSION) -> None:
+        """Store an answer, evicting least-recently-used entries over the caps."""
+        key = (video_id, normalize_question(question), prompt_version, model)
+        size = len(answer.encode("utf-8")) + len(key[1].encode("utf-8")) + _ENTRY_OVERHEAD_BYTES
+        if vector is not None:
+            size += vector.nbytes
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(answer, time.time(), vector, size)
+            self._groups.setdefault(self._group(key), set()).add(key)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self.exact_hits + self.semantic_hits + self.misses
+            return {
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+def get_answer_cache(embeddings=None) -> AnswerCache:
+    """Return the process-wide answer cache, shared by all sessions."""
+    def create() -> AnswerCache:
+        cache = AnswerCache(embeddings)
+        register_collector("answer_cache", cache.stats)
+        return cache
+
+    return get_or_create(
+        "answer_cache",
+        (ANSWER_CACHE_MAX_ENTRIES, ANSWER_CACHE_MAX_BYTES, ANSWER_CACHE_TTL_SECONDS, ANSWER_CACHE_SIMILARITY),
+        create,
+    )
+
+
+def with_answer_cache(rag_chain: Runnable, video_id: str, cache: AnswerCache, model: str = LLM_MODEL, executor: Executor | None = None) -> Runnable:
+    """
+    Wrap a RAG chain so repeated or near-identical questions skip retrieval and the LLM.
+
+    Args:
+        rag_chain: Chain from build_rag_chain().
+        video_id: Video the chain answers about (cache scope).
+        cache: AnswerCache to read and fill.
+        model: LLM model name (cache scope).
+        executor: Thread pool running the lookup (which embeds the question)
+            on the async path (default: the event loop's default executor).
+
+    Returns:
+        A Runnable with the same question → answer interface. A miss streams
+        straight from the chain and is cached once the stream completes.
+    """
+    def on_miss(question: str, vector: np.ndarray | None) -> Runnable:
+        def store(chunks):
+            parts = []
+            for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+            cache.put(video_id, question, "".join(parts), vector, model)
+
+        async def astore(chunks):
+            parts = []
+            async for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+            cache.put(video_id, question, "".join(parts), vector, model)
+
+        # Returning a Runnable makes RunnableLambda invoke/stream it in turn.
+        return rag_chain | RunnableGenerator(store, astore)
+
+    def answer(question: str):
+        cached, vector = cache.get(video_id, question, model)
+        return cached if cached is not None else on_miss(question, vector)
+
+    async def aanswer(question: str):
+        cached, vector = await asyncio.get_running_loop().run_in_executor(executor, cache.get, video_id, question, model)
+        return cached if cached is not None else on_miss(question, vector)
+
+    return RunnableLambda(answer, afunc=aanswer)
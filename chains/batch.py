@@ -0,0 +1,192 @@
+import csv
+import io
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable
+
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from langchain_core.runnables import RunnableLambda
+
+from chains.callbacks import MetricsCallbackHandler
+from chains.context import assemble_context
+from components.llm_scheduler import ScheduledChatModel
+from components.metrics import record_stage
+from components.vector_store import search_many
+from config import BATCH_MAX_CONCURRENCY, BATCH_REQUESTS_PER_SECOND, RETRIEVER_K
+from prompts.templates import RAG_PROMPT
+
+# ──────────────────────────────────────────────
+# Batch Q&A — one index search, concurrent LLM calls, in the background
+# ──────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchAnswer:
+    """Answer to one question of a batch, with the transcript spans it used."""
+
+    question: str
+    answer: str = ""
+    sources: list[tuple[float, float]] = field(default_factory=list)
+    error: str | None = None
+
+
+def answer_batch(
+    questions: list[str],
+    vector_store,
+    llm,
+    embeddings,
+    video_ids: list[str] | None = None,
+    k: int = RETRIEVER_K,
+    max_concurrency: int = BATCH_MAX_CONCURRENCY,
+    requests_per_second: float = BATCH_REQUESTS_PER_SECOND,
+    on_answer: Callable[[int], None] | None = None,
+) -> list[BatchAnswer]:
+    """
+    Answer many questions about a video.
+
+    Questions are embedded in one model call and searched in one FAISS call; the
+    LLM calls then run concurrently, started no faster than
+    `requests_per_second`. A ScheduledChatModel is already paced (and
+    retried) by its LLMScheduler, so no second limit is applied to it. A
+    failed question gets its error recorded and does not stop the batch.
+
+    Args:
+        questions: Questions, in the order results should come back.
+        vector_store: Per-video FAISS store or the shared index.
+        llm: LangChain chat model.
+        embeddings: Model used to embed the questions.
+        video_ids: Restrict retrieval to these videos (shared index only).
+        k: Chunks retrieved per question.
+        max_concurrency: Max LLM calls in flight.
+        requests_per_second: Max LLM calls started per second (unscheduled
+            models only).
+        on_answer: Called with the number of answered questions after each answer.
+
+    Returns:
+        One BatchAnswer per question, in input order.
+    """
+    if not questions:
+        return []
+    started = time.perf_counter()
+    # One batched model call. all-MiniLM has no query instruction, so these
+    # are the same vectors embed_query() returns for each question.
+    vectors = embeddings.embed_documents(questions)
+    retrieved = search_many(vector_store, vectors, k, video_ids)
+    record_stage("batch_retrieval", time.perf_counter() - started, questions=len(questions))
+
+    chain = RAG_PROMPT | llm | StrOutputParser()
+    if not isinstance(llm, ScheduledChatModel):
+        limiter = InMemoryRateLimiter(
+            requests_per_second=requests_per_second,
+            check_every_n_seconds=min(0.1, 1 / requests_per_second),
+            max_bucket_size=max(1, max_concurrency),
+        )
+
+        def throttle(prompt):
+            limiter.acquire(blocking=True)
+            return prompt
+
+        chain = RAG_PROMPT | RunnableLambda(throttle) | llm | StrOutputParser()
+
+    answers: list = [None] * len(questions)
+    for count, (i, answer) in enumerate(chain.batch_as_completed(
+        [
+            {"context": assemble_context(docs), "question": question}
+            for question, docs in zip(questions, retrieved)
+        ],
+        config={"max_concurrency": max_concurrency, "callbacks": [MetricsCallbackHandler()]},
+        return_exceptions=True,
+    ), start=1):
+        answers[i] = answer
+        if on_answer:
+            on_answer(count)
+    record_stage("batch_total", time.perf_counter() - started, questions=len(questions))
+
+    results = []
+    for question, docs, answer in zip(questions, retrieved, answers):
+        sources = [(doc.metadata["start"], doc.metadata["end"]) for doc in docs if "start" in doc.metadata]
+        if isinstance(answer, Exception):
+            results.append(BatchAnswer(question, sources=sources, error=str(answer)))
+        else:
+            results.append(BatchAnswer(question, answer, sources))
+    return results
+
+
+class BatchJob:
+    """
+    Runs answer_batch() in a background thread, so a session is not blocked
+    while a long batch waits on the LLM rate limit.
+
+    Args:
+        questions: Questions, in the order results should come back.
+        vector_store: Per-video FAISS store or the shared index.
+        llm: LangChain chat model.
+        embeddings: Model used to embed the questions.
+        video_ids: Restrict retrieval to these videos (shared index only).
+    """
+
+    def __init__(self, questions: list[str], vector_store, llm, embeddings, video_ids: list[str] | None = None):
+        self.questions = questions
+        self.answered = 0
+        self.results: list[BatchAnswer] | None = None
+        self.error: str | None = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(vector_store, llm, embeddings, video_ids), name="batch", daemon=True
+        )
+
+    @property
+    def total(self) -> int:
+        return len(self.questions)
+
+    @property
+    def done(self) -> bool:
+        """True once the batch has finished, successfully or not."""
+        return self._done.is_set()
+
+    def start(self) -> "BatchJob":
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the batch finishes; returns False on timeout."""
+        return self._done.wait(timeout)
+
+    def _run(self, vector_store, llm, embeddings, video_ids) -> None:
+        try:
+            self.results = answer_batch(
+                self.questions, vector_store, llm, embeddings, video_ids,
+                on_answer=lambda answered: setattr(self, "answered", answered),
+            )
+        except Exception as e:
+            logger.exception("batch of %d questions failed", self.total)
+            self.error = str(e)
+        finally:
+            self._done.set()
+
+
+def start_batch_job(questions: list[str], vector_store, llm, embeddings, video_ids: list[str] | None = None) -> BatchJob:
+    """Start answering a batch in the background; see BatchJob."""
+    return BatchJob(questions, vector_store, llm, embeddings, video_ids).start()
+
+
+def batch_to_json(results: list[BatchAnswer]) -> str:
+    """Serialize batch results as a JSON array."""
+    return json.dumps([asdict(result) for result in results], ensure_ascii=False, indent=2)
+
+
+def batch_to_csv(results: list[BatchAnswer]) -> str:
+    """Serialize batch results as CSV (sources as "start-end" seconds, ";"-separated)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["question", "answer", "sources", "error"])
+    for result in results:
+        sources = "; ".join(f"{start:.0f}-{end:.0f}" for start, end in result.sources)
+        writer.writerow([result.question, result.answer, sources, result.error or ""])
+    return buffer.getvalue()
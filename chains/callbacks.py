@@ -0,0 +1,111 @@
+import threading
+import time
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from components.metrics import increment, log_event, record_stage
+
+# ──────────────────────────────────────────────
+# LangChain Callback → Pipeline Metrics
+# ──────────────────────────────────────────────
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Times retrieval, prompt assembly, the LLM call and the whole chain.
+
+    Attached in build_rag_chain(); also counts prompt/completion tokens
+    reported by the provider and records LLM time-to-first-token.
+    """
+
+    def __init__(self):
+        self._starts: dict[UUID, tuple[str, float]] = {}
+        self._first_token: set[UUID] = set()
+        self._open_chains: set[UUID] = set()
+        self._lock = threading.Lock()
+
+    def _start(self, run_id: UUID, stage: str) -> None:
+        with self._lock:
+            self._starts[run_id] = (stage, time.perf_counter())
+
+    def _end(self, run_id: UUID, **fields) -> None:
+        with self._lock:
+            started = self._starts.pop(run_id, None)
+            self._first_token.discard(run_id)
+        if started is not None:
+            stage, t0 = started
+            record_stage(stage, time.perf_counter() - t0, **fields)
+
+    def on_chain_start(self, serialized: dict[str, Any], inputs: Any, *, run_id: UUID, parent_run_id: UUID | None = None, **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name", "")
+        with self._lock:
+            # The outermost run this handler sees is the RAG chain itself,
+            # even when it is nested in a wrapper (e.g. the answer cache).
+            is_root = parent_run_id is None or parent_run_id not in self._open_chains
+            self._open_chains.add(run_id)
+        if is_root:
+            self._start(run_id, "chain")
+        elif "Prompt" in name:
+            self._start(run_id, "prompt")
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._open_chains.discard(run_id)
+        self._end(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._open_chains.discard(run_id)
+        self._end(run_id, error=type(error).__name__)
+        increment("rag_errors_total", labels={"kind": type(error).__name__}, description="Errors raised inside the RAG chain")
+
+    def on_retriever_start(self, serialized: dict[str, Any], query: str, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id, "retrieval")
+
+    def on_retriever_end(self, documents, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, documents=len(documents))
+
+    def on_retriever_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=type(error).__name__)
+
+    def on_chat_model_start(self, serialized: dict[str, Any], messages, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id, "llm")
+
+    def on_llm_start(self, serialized: dict[str, Any], prompts: list[str], *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id, "llm")
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            if run_id in self._first_token or run_id not in self._starts:
+                return
+            self._first_token.add(run_id)
+            t0 = self._starts[run_id][1]
+        record_stage("llm_first_token", time.perf_counter() - t0)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        prompt_tokens, completion_tokens = _token_usage(response)
+        if prompt_tokens:
+            increment("rag_prompt_tokens_total", prompt_tokens, description="Prompt tokens sent to the LLM")
+        if completion_tokens:
+            increment("rag_completion_tokens_total", completion_tokens, description="Completion tokens returned by the LLM")
+        self._end(run_id, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=type(error).__name__)
+        log_event("llm_error", error=str(error))
+
+
+def _token_usage(response: LLMResult) -> tuple[int, int]:
+    """Extract (prompt, completion) token counts from an LLM result, if reported."""
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    if usage:
+        return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if metadata:
+                return metadata.get("input_tokens", 0), metadata.get("output_tokens", 0)
+    return 0, 0
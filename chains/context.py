@@ -0,0 +1,114 @@
+from langchain_core.documents import Document
+
+from config import CONTEXT_MAX_TOKENS
+
+# ──────────────────────────────────────────────
+# Context Assembly — merge overlaps, pack to a token budget
+# ──────────────────────────────────────────────
+
+# Groq does not expose its tokenizer; ~4 characters per token is close
+# enough for budgeting English and romanized Hindi.
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count used for budgeting prompts."""
+    return len(text) // _CHARS_PER_TOKEN + 1
+
+
+def _source(doc: Document) -> tuple:
+    # One transcript per video and language: offsets of two languages never line up.
+    return doc.metadata.get("video_id"), doc.metadata.get("language")
+
+
+class _Span:
+    """Contiguous stretch of one transcript, built from one or more chunks."""
+
+    def __init__(self, doc: Document, rank: int):
+        self.source = _source(doc)
+        self.start = doc.metadata["start_index"]
+        self.end = self.start + len(doc.page_content)
+        self.text = doc.page_content
+        self.rank = rank
+
+    def absorb(self, doc: Document, rank: int) -> bool:
+        """Extend this span with a chunk that overlaps or touches it."""
+        start = doc.metadata["start_index"]
+        if _source(doc) != self.source or start > self.end + 1:
+            return False
+        end = start + len(doc.page_content)
+        if end > self.end:
+            if start > self.end:
+                # Touching chunks: the splitter dropped one separator between them.
+                self.text += " " + doc.page_content
+            else:
+                self.text += doc.page_content[self.end - start:]
+            self.end = end
+        self.rank = min(self.rank, rank)
+        return True
+
+
+def merge_spans(documents: list[Document]) -> list[str]:
+    """
+    Merge overlapping or adjacent chunks into contiguous transcript spans.
+
+    Chunks need the "start_index" offsets set by the splitters; chunks
+    without offsets are kept as separate spans (exact duplicates dropped).
+
+    Args:
+        documents: Chunks in any order.
+
+    Returns:
+        Span texts in transcript order.
+    """
+    return [text for text, _ in _spans(documents)]
+
+
+def _spans(documents: list[Document]) -> list[tuple[str, int]]:
+    """Return (text, best retrieval rank) per span, in transcript order."""
+    positioned, loose, seen = [], [], set()
+    for rank, doc in enumerate(documents):
+        if doc.page_content in seen:
+            continue
+        seen.add(doc.page_content)
+        if doc.metadata.get("start_index") is None:
+            loose.append((doc.page_content, rank))
+        else:
+            positioned.append((rank, doc))
+
+    positioned.sort(key=lambda item: (tuple(map(str, _source(item[1]))), item[1].metadata["start_index"]))
+    spans: list[_Span] = []
+    for rank, doc in positioned:
+        if not spans or not spans[-1].absorb(doc, rank):
+            spans.append(_Span(doc, rank))
+    return [(span.text, span.rank) for span in spans] + loose
+
+
+def assemble_context(documents: list[Document], max_tokens: int = CONTEXT_MAX_TOKENS) -> str:
+    """
+    Build the prompt context from retrieved chunks.
+
+    Overlapping and adjacent chunks are merged back into contiguous spans
+    and duplicates dropped. Spans are then admitted in order of their best
+    retrieval rank until `max_tokens` is reached and emitted in transcript
+    order. The first span is truncated if it alone exceeds the budget.
+
+    Args:
+        documents: Retrieved chunks, most relevant first.
+        max_tokens: Token budget for the whole context.
+
+    Returns:
+        Context string with spans separated by blank lines.
+    """
+    spans = _spans(documents)
+    chosen, used = set(), 0
+    for index in sorted(range(len(spans)), key=lambda i: spans[i][1]):
+        tokens = estimate_tokens(spans[index][0])
+        if used + tokens <= max_tokens:
+            chosen.add(index)
+            used += tokens
+        elif not chosen:
+            spans[index] = (spans[index][0][:max_tokens * _CHARS_PER_TOKEN], spans[index][1])
+            chosen.add(index)
+            break
+    return "\n\n".join(text for i, (text, _) in enumerate(spans) if i in chosen)
@@ -1,15 +1,23 @@
+import logging
+import time
+from typing import Iterator
+
 from langchain_core.runnables import RunnableParallel, RunnablePassthrough, RunnableLambda
 from langchain_core.output_parsers import StrOutputParser
 
+from chains.callbacks import MetricsCallbackHandler
+from chains.context import assemble_context
 from prompts.templates import RAG_PROMPT, SUMMARY_PROMPT
 
+logger = logging.getLogger(__name__)
+
 # ──────────────────────────────────────────────
 # LCEL RAG Chain Assembly
 # ──────────────────────────────────────────────
 
 def _format_docs(retrieved_docs) -> str:
-    """Join retrieved Document objects into a single context string."""
-    return "\n\n".join(doc.page_content for doc in retrieved_docs)
+    """Merge overlapping chunks and pack them into the context token budget."""
+    return assemble_context(retrieved_docs)
 
 
 def build_rag_chain(retriever, llm):
@@ -23,7 +31,8 @@ def build_rag_chain(retriever, llm):
         llm: LangChain LLM instance (e.g. ChatGroq).
 
     Returns:
-        An LCEL Runnable chain.
+        An LCEL Runnable chain. Supports .stream() for token-by-token output.
+        Stage latencies and token counts are recorded by MetricsCallbackHandler.
     """
     parallel_chain = RunnableParallel({
         "context": retriever | RunnableLambda(_format_docs),
@@ -31,9 +40,37 @@ def build_rag_chain(retriever, llm):
     })
 
     rag_chain = parallel_chain | RAG_PROMPT | llm | StrOutputParser()
-    return rag_chain
+    return rag_chain.with_config(callbacks=[MetricsCallbackHandler()])
 
 
 def generate_summary(rag_chain) -> str:
     """Generate a comprehensive summary of the video via the RAG chain."""
     return rag_chain.invoke(SUMMARY_PROMPT)
+
+
+def stream_answer(rag_chain, question: str) -> Iterator[str]:
+    """
+    Stream the answer to a question token by token.
+
+    Logs time-to-first-token and total latency once the stream ends.
+
+    Args:
+        rag_chain: Chain from build_rag_chain().
+        question: The user's question.
+
+    Yields:
+        Text fragments as the LLM produces them.
+    """
+    started = time.perf_counter()
+    first_token = None
+    for token in rag_chain.stream(question):
+        if first_token is None:
+            first_token = time.perf_counter() - started
+        yield token
+    total = time.perf_counter() - started
+    logger.info("rag stream: ttft=%.3fs total=%.3fs", first_token if first_token is not None else total, total)
+
+
+def stream_summary(rag_chain) -> Iterator[str]:
+    """Stream a comprehensive summary of the video via the RAG chain."""
+    return stream_answer(rag_chain, SUMMARY_PROMPT)
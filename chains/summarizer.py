@@ -0,0 +1,183 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator
+
+from langchain_core.documents import Document
+from langchain_core.output_parsers import StrOutputParser
+
+from chains.context import estimate_tokens, merge_spans
+from config import (
+    LLM_MODEL,
+    SUMMARY_CACHE_DIR,
+    SUMMARY_MAX_CONCURRENCY,
+    SUMMARY_MEMORY_CACHE_ENTRIES,
+    SUMMARY_WINDOW_TOKENS,
+)
+from prompts.templates import MAP_SUMMARY_PROMPT, PROMPT_VERSION, REDUCE_SUMMARY_PROMPT, VIDEO_SUMMARY_PROMPT
+
+logger = logging.getLogger(__name__)
+
+# ──────────────────────────────────────────────
+# Map-Reduce Whole-video Summarization
+# ──────────────────────────────────────────────
+
+# Upper bound on map rounds, in case summaries fail to shrink.
+_MAX_MAP_ROUNDS = 4
+
+# Most recently used summaries; the rest are read back from disk.
+_memory_cache: OrderedDict[str, str] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def build_windows(documents: list[Document], max_tokens: int = SUMMARY_WINDOW_TOKENS) -> list[str]:
+    """
+    Group consecutive chunks into overlap-free windows that fit a token budget.
+
+    Chunks of a window are merged with merge_spans(), the same rule used
+    for the Q&A context.
+
+    Args:
+        documents: Chunks in transcript order.
+        max_tokens: Token budget per window.
+
+    Returns:
+        List of window texts, in order.
+    """
+    windows, current, current_tokens = [], [], 0
+    for doc in documents:
+        tokens = estimate_tokens(doc.page_content)
+        if current and current_tokens + tokens > max_tokens:
+            windows.append(" ".join(merge_spans(current)))
+            current, current_tokens = [], 0
+        current.append(doc)
+        current_tokens += tokens
+    if current:
+        windows.append(" ".join(merge_spans(current)))
+    return windows
+
+
+def _group_texts(texts: list[str], max_tokens: int) -> list[str]:
+    groups, current, current_tokens = [], [], 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if current and current_tokens + tokens > max_tokens:
+            groups.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        groups.append("\n\n".join(current))
+    return groups
+
+
+def map_summaries(llm, texts: list[str], max_concurrency: int) -> list[str]:
+    """Summarize each text; calls run concurrently, results keep input order."""
+    map_chain = MAP_SUMMARY_PROMPT | llm | StrOutputParser()
+    return map_chain.batch(
+        [{"text": text} for text in texts],
+        config={"max_concurrency": max_concurrency},
+    )
+
+
+def summary_cache_key(video_key: str, model: str = LLM_MODEL) -> str:
+    """Cache key of a video summary: (video, model, prompt version)."""
+    payload = f"{video_key}\0{model}\0{PROMPT_VERSION}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _remember(key: str, summary: str) -> None:
+    # Caller holds _cache_lock.
+    _memory_cache[key] = summary
+    _memory_cache.move_to_end(key)
+    while len(_memory_cache) > SUMMARY_MEMORY_CACHE_ENTRIES:
+        _memory_cache.popitem(last=False)
+
+
+def _load_cached(key: str) -> str | None:
+    with _cache_lock:
+        if key in _memory_cache:
+            _memory_cache.move_to_end(key)
+            return _memory_cache[key]
+    path = Path(SUMMARY_CACHE_DIR) / f"{key}.txt"
+    try:
+        summary = path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    with _cache_lock:
+        _remember(key, summary)
+    return summary
+
+
+def _store_cached(key: str, summary: str) -> None:
+    with _cache_lock:
+        _remember(key, summary)
+    path = Path(SUMMARY_CACHE_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    tmp = path / f"{key}.txt.tmp"
+    tmp.write_text(summary, encoding="utf-8")
+    tmp.replace(path / f"{key}.txt")
+
+
+def stream_video_summary(
+    documents: list[Document],
+    llm,
+    video_key: str,
+    model: str = LLM_MODEL,
+    max_tokens: int = SUMMARY_WINDOW_TOKENS,
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+) -> Iterator[str]:
+    """
+    Summarize a whole video with map-reduce and stream the final step.
+
+    Chunks are grouped into windows that fit `max_tokens`; each window is
+    summarized concurrently (map), and the partial summaries are combined
+    (reduce) — recursively if they do not fit one window. A transcript that
+    fits one window is summarized in a single call. The result is cached
+    per (video, model, prompt version) in memory and on disk.
+
+    Args:
+        documents: All chunks of the video, in transcript order.
+        llm: LangChain chat model.
+        video_key: Identifies the video (and transcript language).
+        model: LLM model name (cache scope).
+        max_tokens: Token budget per window.
+        max_concurrency: Max map calls in flight.
+
+    Yields:
+        Text fragments of the final summary.
+    """
+    key = summary_cache_key(video_key, model)
+    cached = _load_cached(key)
+    if cached is not None:
+        yield cached
+        return
+
+    started = time.perf_counter()
+    texts = build_windows(documents, max_tokens)
+    window_count = len(texts)
+    mapped = False
+    for _ in range(_MAX_MAP_ROUNDS):
+        if sum(estimate_tokens(t) for t in texts) <= max_tokens:
+            break
+        texts = _group_texts(map_summaries(llm, texts, max_concurrency), max_tokens)
+        mapped = True
+    logger.info("summary map: %d windows in %.2fs", window_count, time.perf_counter() - started)
+
+    # Reduce partial summaries, or summarize a short transcript directly.
+    prompt = REDUCE_SUMMARY_PROMPT if mapped else VIDEO_SUMMARY_PROMPT
+    reduce_chain = prompt | llm | StrOutputParser()
+    parts = []
+    for token in reduce_chain.stream({"text": "\n\n".join(texts)}):
+        parts.append(token)
+        yield token
+    logger.info("summary total: %.2fs", time.perf_counter() - started)
+    _store_cached(key, "".join(parts))
+
+
+def summarize_video(documents: list[Document], llm, video_key: str, **kwargs) -> str:
+    """Blocking variant of stream_video_summary(); returns the full summary."""
+    return "".join(stream_video_summary(documents, llm, video_key, **kwargs))
@@ -1,16 +1,93 @@
-from components.document_loader import load_transcript, SUPPORTED_LANGUAGES
-from components.text_splitter import split_text
-from components.embeddings import get_embeddings
-from components.vector_store import build_vector_store, get_retriever
-from components.llm import get_llm
-
-__all__ = [
-    "load_transcript",
-    "SUPPORTED_LANGUAGES",
-    "split_text",
-    "get_embeddings",
-    "build_vector_store",
-    "get_retriever",
-    "get_llm",
-]
+import importlib
+from typing import TYPE_CHECKING
 
+# Submodules pull in torch, faiss, LangChain and the YouTube client, so
+# they are imported on first attribute access (PEP 562), not with the package.
+_EXPORTS = {
+    "load_transcript": "components.document_loader",
+    "load_transcript_snippets": "components.document_loader",
+    "TranscriptSnippet": "components.document_loader",
+    "SUPPORTED_LANGUAGES": "config",
+    "split_text": "components.text_splitter",
+    "stream_split_snippets": "components.text_splitter",
+    "count_truncated": "components.text_splitter",
+    "get_embeddings": "components.embeddings",
+    "get_tokenizer": "components.embeddings",
+    "OnnxEmbeddings": "components.onnx_embeddings",
+    "EmbeddingCache": "components.embedding_cache",
+    "get_embedding_cache": "components.embedding_cache",
+    "SharedVideoIndex": "components.shared_index",
+    "get_shared_index": "components.shared_index",
+    "video_key": "components.shared_index",
+    "CompactFAISS": "components.vector_store",
+    "build_vector_store": "components.vector_store",
+    "build_vector_store_from_vectors": "components.vector_store",
+    "get_documents": "components.vector_store",
+    "get_retriever": "components.vector_store",
+    "search_many": "components.vector_store",
+    "IndexJob": "components.index_job",
+    "start_index_job": "components.index_job",
+    "IndexHandle": "components.index_manager",
+    "IndexManager": "components.index_manager",
+    "get_index_manager": "components.index_manager",
+    "get_llm": "components.llm",
+    "LLMScheduler": "components.llm_scheduler",
+    "ScheduledChatModel": "components.llm_scheduler",
+    "get_llm_scheduler": "components.llm_scheduler",
+    "schedule": "components.llm_scheduler",
+    "load_video_index": "components.pipeline",
+    "registry_stats": "components.registry",
+    "warm_up": "components.registry",
+    "timed": "components.metrics",
+    "metrics_snapshot": "components.metrics",
+    "render_prometheus": "components.metrics",
+    "write_prometheus": "components.metrics",
+    "configure_metrics_logging": "components.metrics",
+    "cache_key": "components.cache",
+    "load_cached_snippets": "components.cache",
+    "save_cached_snippets": "components.cache",
+    "load_cached_vector_store": "components.cache",
+    "has_cached_vector_store": "components.cache",
+    "save_cached_vector_store": "components.cache",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from components.document_loader import load_transcript, load_transcript_snippets, TranscriptSnippet
+    from components.text_splitter import split_text, stream_split_snippets, count_truncated
+    from components.embeddings import get_embeddings, get_tokenizer
+    from components.onnx_embeddings import OnnxEmbeddings
+    from components.embedding_cache import EmbeddingCache, get_embedding_cache
+    from components.shared_index import SharedVideoIndex, get_shared_index, video_key
+    from components.vector_store import CompactFAISS, build_vector_store, build_vector_store_from_vectors, get_documents, get_retriever, search_many
+    from components.index_job import IndexJob, start_index_job
+    from components.index_manager import IndexHandle, IndexManager, get_index_manager
+    from components.llm import get_llm
+    from components.llm_scheduler import LLMScheduler, ScheduledChatModel, get_llm_scheduler, schedule
+    from components.pipeline import load_video_index
+    from components.registry import registry_stats, warm_up
+    from components.metrics import timed, metrics_snapshot, render_prometheus, write_prometheus, configure_metrics_logging
+    from components.cache import (
+        cache_key,
+        load_cached_snippets,
+        save_cached_snippets,
+        load_cached_vector_store,
+        has_cached_vector_store,
+        save_cached_vector_store,
+    )
+    from config import SUPPORTED_LANGUAGES
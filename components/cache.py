@@ -0,0 +1,280 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from langchain_community.vectorstores import FAISS
+
+from components.document_loader import TranscriptSnippet
+from components.metrics import increment
+from components.vector_store import CompactFAISS
+from config import (
+    CACHE_DIR,
+    CACHE_MAX_BYTES,
+    CHUNK_MODE,
+    CHUNK_SIZE,
+    CHUNK_OVERLAP,
+    CHUNK_TOKENS,
+    CHUNK_TOKEN_OVERLAP,
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL,
+    VECTOR_STORE_COMPRESSION,
+)
+
+# ──────────────────────────────────────────────
+# Persistent Cache — Transcripts & FAISS Indexes
+# ──────────────────────────────────────────────
+
+# Bump when the on-disk layout changes so old entries are invalidated.
+CACHE_VERSION = 3
+
+_TRANSCRIPT_FILE = "transcript.jsonl"
+_INDEX_DIR = "faiss"
+_META_FILE = "meta.json"
+
+_lock = threading.Lock()
+
+# Running size of each cache root, measured once by prune_cache() and then
+# updated per save, so a save only measures the entry it wrote.
+_totals: dict[str, int] = {}
+
+
+def pipeline_config() -> dict:
+    """Config values that change the contents of a cached index."""
+    config = {
+        "version": CACHE_VERSION,
+        "chunk_size": CHUNK_SIZE,
+        "chunk_overlap": CHUNK_OVERLAP,
+        "embedding_model": EMBEDDING_MODEL,
+        "embedding_backend": EMBEDDING_BACKEND,
+        "compression": VECTOR_STORE_COMPRESSION,
+    }
+    # Only token mode adds keys, so existing character-mode entries stay valid.
+    if CHUNK_MODE == "tokens":
+        config.update(chunk_mode=CHUNK_MODE, chunk_size=CHUNK_TOKENS, chunk_overlap=CHUNK_TOKEN_OVERLAP)
+    return config
+
+
+def cache_key(video_id: str, lang_codes: list[str]) -> str:
+    """
+    Build the content address of a cache entry.
+
+    Args:
+        video_id: The YouTube video ID.
+        lang_codes: Ordered transcript language codes (e.g. ["en", "hi"]).
+
+    Returns:
+        Hex digest identifying (video, languages, pipeline config).
+    """
+    payload = json.dumps(
+        {"video_id": video_id, "lang_codes": list(lang_codes), **pipeline_config()},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _entry_dir(key: str, root: str) -> Path:
+    return Path(root) / key
+
+
+def _read_meta(entry: Path) -> dict | None:
+    try:
+        return json.loads((entry / _META_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(entry: Path, meta: dict) -> None:
+    tmp = entry / f"{_META_FILE}.tmp"
+    tmp.write_text(json.dumps(meta), encoding="utf-8")
+    os.replace(tmp, entry / _META_FILE)
+
+
+def _touch(entry: Path) -> None:
+    """Record an access so size-based eviction is least-recently-used."""
+    with _lock:
+        meta = _read_meta(entry)
+        if meta is not None:
+            meta["last_access"] = time.time()
+            _write_meta(entry, meta)
+
+
+def _ensure_entry(key: str, root: str) -> Path:
+    entry = _entry_dir(key, root)
+    entry.mkdir(parents=True, exist_ok=True)
+    if _read_meta(entry) is None:
+        _write_meta(entry, {"config": pipeline_config(), "last_access": time.time()})
+    return entry
+
+
+def _is_fresh(entry: Path) -> bool:
+    meta = _read_meta(entry)
+    return meta is not None and meta.get("config") == pipeline_config()
+
+
+def _read_snippets(path: Path) -> Iterator[TranscriptSnippet]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            text, start, duration = json.loads(line)
+            yield TranscriptSnippet(text, start, duration)
+
+
+def load_cached_snippets(key: str, root: str = CACHE_DIR) -> list[TranscriptSnippet] | None:
+    """
+    Return the cached transcript snippets for a key, or None on a miss.
+
+    A list, not a lazy reader, so callers can test a cached empty
+    transcript with `if snippets:` like a fresh fetch.
+    """
+    entry = _entry_dir(key, root)
+    path = entry / _TRANSCRIPT_FILE
+    if not _is_fresh(entry) or not path.is_file():
+        return None
+    _touch(entry)
+    return list(_read_snippets(path))
+
+
+def save_cached_snippets(key: str, snippets: Iterable, root: str = CACHE_DIR) -> None:
+    """
+    Persist raw transcript snippets (text, start, duration) under the given key.
+    """
+    with _lock:
+        entry = _ensure_entry(key, root)
+        tmp = entry / f"{_TRANSCRIPT_FILE}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for snippet in snippets:
+                f.write(json.dumps([snippet.text, snippet.start, snippet.duration], ensure_ascii=False))
+                f.write("\n")
+        os.replace(tmp, entry / _TRANSCRIPT_FILE)
+        _saved(entry, root, key)
+
+
+def load_cached_vector_store(key: str, embeddings, root: str = CACHE_DIR) -> FAISS | None:
+    """
+    Load a previously saved FAISS index and docstore.
+
+    Compressed stores (VECTOR_STORE_COMPRESSION) are memory-mapped, so
+    processes loading the same video share its pages.
+
+    Args:
+        key: Cache key from cache_key().
+        embeddings: The embedding model used to embed future queries.
+        root: Cache root directory.
+
+    Returns:
+        FAISS vector store, or None on a miss.
+    """
+    entry = _entry_dir(key, root)
+    index_dir = entry / _INDEX_DIR
+    vector_store = None
+    if _is_fresh(entry) and index_dir.is_dir():
+        try:
+            # The docstore pickle is written by this module only.
+            store_cls = CompactFAISS if VECTOR_STORE_COMPRESSION else FAISS
+            vector_store = store_cls.load_local(
+                str(index_dir), embeddings, allow_dangerous_deserialization=True
+            )
+        except Exception:
+            vector_store = None
+    result = "miss" if vector_store is None else "hit"
+    increment("rag_index_cache_lookups_total", labels={"result": result}, description="On-disk index cache lookups")
+    if vector_store is not None:
+        _touch(entry)
+    return vector_store
+
+
+def has_cached_vector_store(key: str, root: str = CACHE_DIR) -> bool:
+    """Return True if a fresh saved index exists for the key (without loading it)."""
+    entry = _entry_dir(key, root)
+    return _is_fresh(entry) and (entry / _INDEX_DIR).is_dir()
+
+
+def save_cached_vector_store(key: str, vector_store: FAISS, root: str = CACHE_DIR) -> None:
+    """
+    Persist a FAISS index and docstore under the given key.
+
+    The index is written to a temporary directory and swapped into place,
+    so a concurrent reader never sees a half-written index.
+    """
+    with _lock:
+        entry = _ensure_entry(key, root)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f"{_INDEX_DIR}-", dir=entry))
+        try:
+            vector_store.save_local(str(tmp_dir))
+            target = entry / _INDEX_DIR
+            if target.exists():
+                shutil.rmtree(target)
+            os.replace(tmp_dir, target)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        _saved(entry, root, key)
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def _entry_size(entry: Path, meta: dict) -> int:
+    """Size recorded in the entry's meta, measured (and recorded) if missing."""
+    size = meta.get("bytes")
+    if size is None:
+        size = meta["bytes"] = _dir_size(entry)
+        _write_meta(entry, meta)
+    return size
+
+
+def _saved(entry: Path, root: str, key: str) -> None:
+    """Record a written entry's size; prune only once the cap is crossed. Caller holds _lock."""
+    meta = _read_meta(entry) or {}
+    old = meta.get("bytes", 0)
+    meta["bytes"] = _dir_size(entry)
+    _write_meta(entry, meta)
+    if root in _totals:
+        _totals[root] += meta["bytes"] - old
+    if root not in _totals or _totals[root] > CACHE_MAX_BYTES:
+        prune_cache(root, CACHE_MAX_BYTES, keep=key)
+
+
+def prune_cache(root: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES, keep: str | None = None) -> None:
+    """
+    Drop stale entries and evict least-recently-used ones over the size cap.
+
+    An entry is stale when the config it was built with no longer matches
+    config.py (chunking or embedding model changed). Saves call this on
+    the first write of a process and whenever the running size total
+    exceeds the cap; entry sizes come from their meta files, so only
+    entries without a recorded size are walked.
+
+    Args:
+        root: Cache root directory.
+        max_bytes: Total size budget for all entries.
+        keep: Key that must not be evicted (the entry just written).
+    """
+    root_path = Path(root)
+    if not root_path.is_dir():
+        return
+
+    entries = []
+    for entry in root_path.iterdir():
+        if not entry.is_dir():
+            continue
+        meta = _read_meta(entry)
+        if meta is None or meta.get("config") != pipeline_config():
+            shutil.rmtree(entry, ignore_errors=True)
+            continue
+        entries.append((meta.get("last_access", 0.0), entry, _entry_size(entry, meta)))
+
+    total = sum(size for _, _, size in entries)
+    for _, entry, size in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        if entry.name == keep:
+            continue
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+    _totals[root] = total
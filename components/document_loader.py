@@ -1,23 +1,31 @@
+from typing import Iterable, NamedTuple
+
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled
 
+from components.metrics import timed_stage
+from config import SUPPORTED_LANGUAGES
+
 # ──────────────────────────────────────────────
 # Stage 1a — Document Ingestion
 # ──────────────────────────────────────────────
 
-# Supported language codes and display labels
-SUPPORTED_LANGUAGES = {
-    "English (Auto-generated)": ["en", "hi"],
-    "Hindi (Auto-generated)": ["hi", "en"],
-}
+class TranscriptSnippet(NamedTuple):
+    """One caption segment: text plus its start time and duration (seconds)."""
+    text: str
+    start: float
+    duration: float
 
 
-def load_transcript(video_id: str, language: str = "English") -> str | None:
+@timed_stage("load_transcript")
+def load_transcript(video_id: str, language: str = "English", api=None) -> str | None:
     """
     Fetch the transcript of a YouTube video in the selected language.
 
     Args:
         video_id: The YouTube video ID (not the full URL).
         language: Display label from SUPPORTED_LANGUAGES (default: "English").
+        api: Object with a YouTubeTranscriptApi-compatible fetch() (default: a new
+            YouTubeTranscriptApi); lets benchmarks run without network.
 
     Returns:
         Plain text transcript string, or None if unavailable.
@@ -28,7 +36,7 @@ def load_transcript(video_id: str, language: str = "English") -> str | None:
     lang_codes = SUPPORTED_LANGUAGES.get(language, ["en"])
 
     try:
-        api = YouTubeTranscriptApi()
+        api = api or YouTubeTranscriptApi()
         fetched = api.fetch(video_id, languages=lang_codes)
         transcript = " ".join(snippet.text for snippet in fetched)
         return transcript
@@ -36,3 +44,34 @@ def load_transcript(video_id: str, language: str = "English") -> str | None:
         return None
     except Exception as e:
         raise RuntimeError(f"Failed to fetch transcript: {e}") from e
+
+
+@timed_stage("load_transcript")
+def load_transcript_snippets(video_id: str, language: str = "English", api=None) -> Iterable[TranscriptSnippet] | None:
+    """
+    Fetch the transcript of a YouTube video as timed caption segments.
+
+    Unlike load_transcript(), the segments are not joined into one string,
+    so callers can stream them through stream_split_snippets().
+
+    Args:
+        video_id: The YouTube video ID (not the full URL).
+        language: Display label from SUPPORTED_LANGUAGES (default: "English").
+        api: Object with a YouTubeTranscriptApi-compatible fetch() (default: a new
+            YouTubeTranscriptApi); lets benchmarks run without network.
+
+    Returns:
+        Iterable of snippets with .text, .start and .duration, or None if unavailable.
+
+    Raises:
+        RuntimeError: If an unexpected error occurs during fetching.
+    """
+    lang_codes = SUPPORTED_LANGUAGES.get(language, ["en"])
+
+    try:
+        api = api or YouTubeTranscriptApi()
+        return api.fetch(video_id, languages=lang_codes)
+    except TranscriptsDisabled:
+        return None
+    except Exception as e:
+        raise RuntimeError(f"Failed to fetch transcript: {e}") from e
@@ -0,0 +1,175 @@
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+
+from components.metrics import register_collector
+from components.registry import get_or_create
+from config import EMBEDDING_BATCH_SIZE, EMBEDDING_CACHE_DIR, EMBEDDING_CACHE_DTYPE
+
+# ──────────────────────────────────────────────
+# Stage 1c — Chunk-level Embedding Cache
+# ──────────────────────────────────────────────
+
+# SQLite maps hash(model, text) → row in a flat array file; one array file
+# per (dtype, dimension) so different models can share the same store.
+
+_SQLITE_MAX_VARS = 500
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys (NFC, collapsed whitespace)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def embedding_model_name(embeddings) -> str:
+    """Best-effort identifier of an embeddings object, used in cache keys."""
+    return getattr(embeddings, "model_name", None) or type(embeddings).__name__
+
+
+class EmbeddingCache:
+    """
+    Persistent store of chunk embeddings keyed by (model, normalized text).
+
+    Args:
+        root: Directory holding the SQLite index and vector array files.
+        dtype: "float32" or "float16" storage precision.
+    """
+
+    def __init__(self, root: str = EMBEDDING_CACHE_DIR, dtype: str = EMBEDDING_CACHE_DTYPE):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.dtype = np.dtype(dtype)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.root / "index.sqlite3"), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS vectors ("
+            " key TEXT PRIMARY KEY, file TEXT NOT NULL, dim INTEGER NOT NULL, row INTEGER NOT NULL)"
+        )
+
+    @staticmethod
+    def key(model_name: str, text: str) -> str:
+        """Hash of the model name and normalized chunk text."""
+        payload = f"{model_name}\0{normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _file_name(self, dim: int) -> str:
+        return f"vectors-{self.dtype.name}-{dim}.bin"
+
+    @staticmethod
+    def _file_dtype(file: str) -> np.dtype:
+        # Rows are read with the dtype their file was written in, so entries
+        # stored before EMBEDDING_CACHE_DTYPE changed stay readable.
+        return np.dtype(file.split("-")[1])
+
+    def _lookup(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Read cached vectors for the given keys (missing keys are omitted)."""
+        locations: dict[str, list[tuple[str, int]]] = {}
+        dims: dict[str, int] = {}
+        with self._lock:
+            for i in range(0, len(keys), _SQLITE_MAX_VARS):
+                batch = keys[i:i + _SQLITE_MAX_VARS]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, file, dim, row FROM vectors WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, file, dim, row in rows:
+                    locations.setdefault(file, []).append((key, row))
+                    dims[file] = dim
+
+        found = {}
+        for file, entries in locations.items():
+            array = np.memmap(self.root / file, dtype=self._file_dtype(file), mode="r").reshape(-1, dims[file])
+            rows = np.fromiter((row for _, row in entries), dtype=np.int64)
+            vectors = np.asarray(array[rows], dtype=np.float32)
+            for (key, _), vector in zip(entries, vectors):
+                found[key] = vector
+        return found
+
+    def _store(self, keys: list[str], vectors: np.ndarray) -> None:
+        """Append new vectors to the array file and index them in SQLite."""
+        dim = vectors.shape[1]
+        file = self._file_name(dim)
+        data = vectors.astype(self.dtype, copy=False)
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so row allocation is
+            # serialized across processes sharing the cache directory.
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                (next_row,) = self._conn.execute(
+                    "SELECT COALESCE(MAX(row) + 1, 0) FROM vectors WHERE file = ?", (file,)
+                ).fetchone()
+                path = self.root / file
+                path.touch(exist_ok=True)
+                with open(path, "r+b") as f:
+                    f.seek(next_row * dim * self.dtype.itemsize)
+                    f.write(data.tobytes())
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO vectors (key, file, dim, row) VALUES (?, ?, ?, ?)",
+                    [(key, file, dim, next_row + i) for i, key in enumerate(keys)],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def embed_documents(self, texts: list[str], embeddings, batch_size: int = EMBEDDING_BATCH_SIZE) -> np.ndarray:
+        """
+        Embed texts, computing only the ones not already cached.
+
+        Args:
+            texts: Chunk texts to embed.
+            embeddings: LangChain embeddings used for cache misses.
+            batch_size: Number of missing texts sent per embed_documents() call.
+
+        Returns:
+            float32 array of shape (len(texts), dim), in input order.
+        """
+        model_name = embedding_model_name(embeddings)
+        keys = [self.key(model_name, text) for text in texts]
+        found = self._lookup(list(dict.fromkeys(keys)))
+
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        miss_keys = list(missing)
+        for i in range(0, len(miss_keys), batch_size):
+            batch_keys = miss_keys[i:i + batch_size]
+            vectors = np.asarray(
+                embeddings.embed_documents([missing[k] for k in batch_keys]), dtype=np.float32
+            )
+            self._store(batch_keys, vectors)
+            found.update(zip(batch_keys, vectors))
+
+        with self._lock:
+            self.misses += len(miss_keys)
+            self.hits += len(texts) - len(miss_keys)
+
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss counts since this cache was opened."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Return the process-wide embedding cache."""
+    def create() -> EmbeddingCache:
+        cache = EmbeddingCache()
+        register_collector("embedding_cache", cache.stats)
+        return cache
+
+    return get_or_create("embedding_cache", (EMBEDDING_CACHE_DIR, EMBEDDING_CACHE_DTYPE), create)
@@ -1,16 +1,51 @@
+from langchain_core.embeddings import Embeddings
 from langchain_huggingface import HuggingFaceEmbeddings
 
-from config import EMBEDDING_MODEL
+from components.registry import get_or_create
+from config import EMBEDDING_BACKEND, EMBEDDING_MODEL, EMBEDDING_ONNX_THREADS
 
 # ──────────────────────────────────────────────
 # Stage 1c — Embedding Model Factory
 # ──────────────────────────────────────────────
 
-def get_embeddings() -> HuggingFaceEmbeddings:
+def _create_embeddings() -> Embeddings:
+    if EMBEDDING_BACKEND == "onnx_int8":
+        from components.onnx_embeddings import OnnxEmbeddings
+        return OnnxEmbeddings(EMBEDDING_MODEL)
+    if EMBEDDING_BACKEND != "torch":
+        raise RuntimeError(f"Unknown EMBEDDING_BACKEND: {EMBEDDING_BACKEND!r}")
+    return HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+
+
+def get_embeddings() -> Embeddings:
     """
-    Create and return the embedding model.
+    Return the shared embedding model.
 
-    Uses sentence-transformers locally (free, no API key needed).
+    Uses sentence-transformers locally (free, no API key needed), or an
+    int8-quantized ONNX export of the same model when EMBEDDING_BACKEND is
+    "onnx_int8". The model is loaded once per process and reused across
+    sessions; hits and misses are counted in registry_stats().
     Swap this function to change the embedding provider.
     """
-    return HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+    return get_or_create(
+        "embeddings",
+        (EMBEDDING_MODEL, EMBEDDING_BACKEND, EMBEDDING_ONNX_THREADS),
+        _create_embeddings,
+    )
+
+
+def get_tokenizer():
+    """
+    Return the embedding model's fast (Rust) tokenizer, shared like the model.
+
+    Loads only the tokenizer files, not the weights; used to measure chunk
+    length in word-pieces (CHUNK_MODE = "tokens").
+    """
+    def create():
+        from transformers import AutoTokenizer
+
+        # Bare sentence-transformers names resolve as HuggingFaceEmbeddings does.
+        model_id = EMBEDDING_MODEL if "/" in EMBEDDING_MODEL else f"sentence-transformers/{EMBEDDING_MODEL}"
+        return AutoTokenizer.from_pretrained(model_id, use_fast=True)
+
+    return get_or_create("tokenizer", EMBEDDING_MODEL, create)
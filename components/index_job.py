@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from typing import Any
+
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from components.cache import save_cached_vector_store
+from components.embedding_cache import get_embedding_cache
+from components.metrics import COUNT_BUCKETS, observe, record_stage, register_collector
+from components.vector_store import build_vector_store_from_vectors
+from config import INDEX_JOB_BATCH_SIZE, RETRIEVER_K, VECTOR_STORE_COMPRESSION
+
+# ──────────────────────────────────────────────
+# Stage 1c + 1d — Background, Progressive Index Building
+# ──────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+_jobs: dict[str, "IndexJob"] = {}
+_jobs_lock = threading.Lock()
+
+
+class IndexJob:
+    """
+    Embeds a video's chunks in a background thread, growing a FAISS store batch by batch.
+
+    Chunks are indexed in transcript order, so while the job runs the store
+    covers the first `covered_seconds` of the video and can already be
+    searched. When every batch is in, the store is saved to the disk cache
+    (rebuilt as a CompactFAISS store first if VECTOR_STORE_COMPRESSION is set).
+
+    Args:
+        key: Disk cache key of the video (see cache_key()).
+        chunks: All chunks of the video, in transcript order.
+        embeddings: The embedding model instance.
+        batch_size: Chunks embedded and added per step.
+    """
+
+    def __init__(self, key: str, chunks: list[Document], embeddings, batch_size: int = INDEX_JOB_BATCH_SIZE):
+        self.key = key
+        self.chunks = chunks
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+        self.indexed = 0
+        self.error: str | None = None
+        self.vector_store: FAISS | None = None
+        self._done = threading.Event()
+        # FAISS indexes are not safe to search while another thread adds to them.
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"index-{key[:8]}", daemon=True)
+
+    @property
+    def total(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def done(self) -> bool:
+        """True once the job has finished, successfully or not."""
+        return self._done.is_set()
+
+    @property
+    def complete(self) -> bool:
+        """True once every chunk is indexed."""
+        return self.done and self.error is None
+
+    @property
+    def covered_seconds(self) -> float:
+        """Video time covered by the chunks indexed so far."""
+        return self.chunks[self.indexed - 1].metadata.get("end", 0.0) if self.indexed else 0.0
+
+    @property
+    def total_seconds(self) -> float:
+        return self.chunks[-1].metadata.get("end", 0.0) if self.chunks else 0.0
+
+    def start(self) -> "IndexJob":
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the job finishes; returns False on timeout."""
+        return self._done.wait(timeout)
+
+    def _run(self) -> None:
+        started = time.perf_counter()
+        cache = get_embedding_cache()
+        vectors = []
+        try:
+            for i in range(0, self.total, self.batch_size):
+                batch = self.chunks[i:i + self.batch_size]
+                batch_vectors = cache.embed_documents([doc.page_content for doc in batch], self.embeddings)
+                vectors.append(batch_vectors)
+                with self._lock:
+                    if self.vector_store is None:
+                        self.vector_store = build_vector_store_from_vectors(batch, batch_vectors, self.embeddings, compression=None)
+                    else:
+                        self.vector_store.add_embeddings(
+                            [(doc.page_content, list(vector)) for doc, vector in zip(batch, batch_vectors)],
+                            metadatas=[doc.metadata for doc in batch],
+                        )
+                    self.indexed += len(batch)
+
+            if self.vector_store is not None:
+                if VECTOR_STORE_COMPRESSION:
+                    compact = build_vector_store_from_vectors(self.chunks, np.concatenate(vectors), self.embeddings)
+                    with self._lock:
+                        self.vector_store = compact
+                save_cached_vector_store(self.key, self.vector_store)
+            observe("rag_chunks_per_video", self.total, buckets=COUNT_BUCKETS, description="Chunks indexed per video")
+            record_stage("build_vector_store", time.perf_counter() - started, chunks=self.total, background=True)
+        except Exception as e:
+            logger.exception("index job %s failed", self.key)
+            self.error = str(e)
+        finally:
+            self._done.set()
+            with _jobs_lock:
+                if _jobs.get(self.key) is self:
+                    del _jobs[self.key]
+
+    def search(self, query: str, k: int = RETRIEVER_K) -> list[Document]:
+        """Similarity search over the chunks indexed so far."""
+        vector = self.embeddings.embed_query(query)
+        with self._lock:
+            if self.vector_store is None:
+                return []
+            return self.vector_store.similarity_search_by_vector(vector, k=k)
+
+    def as_retriever(self, k: int = RETRIEVER_K) -> "IndexJobRetriever":
+        return IndexJobRetriever(job=self, k=k)
+
+
+class IndexJobRetriever(BaseRetriever):
+    """LangChain retriever over whatever an IndexJob has indexed so far."""
+
+    job: Any
+    k: int = RETRIEVER_K
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> list[Document]:
+        return self.job.search(query, self.k)
+
+
+def start_index_job(key: str, chunks: list[Document], embeddings) -> IndexJob:
+    """
+    Start indexing a video in the background, or join the job already running for it.
+
+    Jobs are shared process-wide, so two sessions loading the same video
+    embed it once. A finished job is dropped from the table; later loads
+    find its index in the disk cache.
+
+    Args:
+        key: Disk cache key of the video.
+        chunks: All chunks of the video, in transcript order.
+        embeddings: The embedding model instance.
+
+    Returns:
+        The running IndexJob.
+    """
+    with _jobs_lock:
+        job = _jobs.get(key)
+        if job is None:
+            job = _jobs[key] = IndexJob(key, chunks, embeddings)
+            job.start()
+        return job
+
+
+def _stats() -> dict[str, int]:
+    with _jobs_lock:
+        return {"running": len(_jobs)}
+
+
+register_collector("index_jobs", _stats)
@@ -0,0 +1,232 @@
+import threading
+import time
+import weakref
+from typing import Any
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from components.cache import load_cached_vector_store
+from components.metrics import register_collector
+from components.registry import get_or_create
+from components.vector_store import PackedDocstore
+from config import INDEX_MANAGER_MAX_BYTES, RETRIEVER_K, RETRIEVER_SEARCH_TYPE
+
+# ──────────────────────────────────────────────
+# Shared Per-video Indexes — refcounted handles, LRU eviction
+# ──────────────────────────────────────────────
+
+# Rough cost of one in-memory Document (object, metadata dict, docstore ID) beyond its text.
+_DOCUMENT_OVERHEAD_BYTES = 600
+
+
+def estimate_index_bytes(vector_store: FAISS) -> int:
+    """Approximate resident size of a FAISS store: vector codes plus docstore."""
+    index = vector_store.index
+    code_size = index.sa_code_size() if hasattr(index, "sa_code_size") else index.d * 4
+    docstore = vector_store.docstore
+    if isinstance(docstore, PackedDocstore):
+        docs = len(docstore.data) + docstore.offsets.nbytes
+    else:
+        docs = sum(
+            len(docstore.search(doc_id).page_content.encode("utf-8")) + _DOCUMENT_OVERHEAD_BYTES
+            for doc_id in vector_store.index_to_docstore_id.values()
+        )
+    return index.ntotal * code_size + docs
+
+
+class _Entry:
+    def __init__(self, key: str, embeddings):
+        self.key = key
+        self.embeddings = embeddings
+        self.vector_store: FAISS | None = None
+        self.bytes = 0
+        self.refs = 0
+        self.last_used = 0.0
+        self.lock = threading.Lock()
+
+
+class IndexHandle:
+    """
+    A session's reference to a shared, read-only per-video index.
+
+    Resolve `vector_store` on every use instead of keeping the store: the
+    manager may unload the index to stay under its memory cap, and the next
+    use reloads it from the disk cache. The reference is released by
+    release() or when the handle is garbage-collected (e.g. with an ended
+    session).
+    """
+
+    def __init__(self, manager: "IndexManager", key: str):
+        self.key = key
+        self._manager = manager
+        self._release = weakref.finalize(self, manager._release, key)
+
+    @property
+    def vector_store(self) -> FAISS:
+        """The index, reloaded from the disk cache if it was evicted."""
+        return self._manager._get(self.key)
+
+    def release(self) -> None:
+        """Drop this reference (idempotent)."""
+        self._release()
+
+    def as_retriever(self, k: int = RETRIEVER_K) -> "IndexHandleRetriever":
+        return IndexHandleRetriever(handle=self, k=k)
+
+
+class IndexHandleRetriever(BaseRetriever):
+    """LangChain retriever over an IndexHandle; never pins the index in memory."""
+
+    handle: Any
+    k: int = RETRIEVER_K
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> list[Document]:
+        return self.handle.vector_store.search(query, RETRIEVER_SEARCH_TYPE, k=self.k)
+
+
+class IndexManager:
+    """
+    Process-wide owner of per-video FAISS indexes, shared by all sessions.
+
+    Indexes are keyed by their disk cache key (video, languages, pipeline
+    config). When the estimated size of loaded indexes exceeds `max_bytes`,
+    the least recently used ones are unloaded, referenced or not; the next
+    use of a handle, or a later acquire(), reloads them from the disk cache.
+
+    Args:
+        max_bytes: Memory ceiling for loaded indexes.
+    """
+
+    def __init__(self, max_bytes: int = INDEX_MANAGER_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def acquire(self, key: str, embeddings) -> IndexHandle | None:
+        """
+        Return a handle to the index for `key`, loading it from disk if needed.
+
+        Returns:
+            IndexHandle, or None if the index is neither loaded nor cached
+            on disk (build it, then register it with put()).
+        """
+        with self._lock:
+            entry = self._entries.setdefault(key, _Entry(key, embeddings))
+            entry.refs += 1
+        try:
+            vector_store = self._load(entry)
+        except BaseException:
+            with self._lock:
+                self._unref(entry)
+            raise
+        if vector_store is None:
+            with self._lock:
+                self._unref(entry)
+            return None
+        return IndexHandle(self, key)
+
+    def put(self, key: str, vector_store: FAISS, embeddings) -> IndexHandle:
+        """
+        Register a freshly built index (already saved to the disk cache) and return a handle.
+
+        If another session registered the same key first, its index is kept.
+        """
+        with self._lock:
+            entry = self._entries.setdefault(key, _Entry(key, embeddings))
+            entry.refs += 1
+            try:
+                if entry.vector_store is None:
+                    entry.bytes = estimate_index_bytes(vector_store)
+                    entry.vector_store = vector_store
+                entry.last_used = time.monotonic()
+                self._evict(keep=key)
+            except BaseException:
+                self._unref(entry)
+                raise
+        return IndexHandle(self, key)
+
+    def _load(self, entry: _Entry) -> FAISS | None:
+        with self._lock:
+            entry.last_used = time.monotonic()
+            if entry.vector_store is not None:
+                self.hits += 1
+                return entry.vector_store
+        with entry.lock:
+            if entry.vector_store is None:
+                vector_store = load_cached_vector_store(entry.key, entry.embeddings)
+                if vector_store is None:
+                    return None
+                with self._lock:
+                    self.misses += 1
+                    entry.vector_store = vector_store
+                    entry.bytes = estimate_index_bytes(vector_store)
+                    self._evict(keep=entry.key)
+            return entry.vector_store
+
+    def _get(self, key: str) -> FAISS:
+        with self._lock:
+            entry = self._entries.get(key)
+        # An evicted index is reloaded; a released handle finds no entry.
+        vector_store = self._load(entry) if entry is not None else None
+        if vector_store is None:
+            raise RuntimeError("The index of this video is no longer cached. Please load the video again.")
+        return vector_store
+
+    def _evict(self, keep: str | None = None) -> None:
+        # Caller holds self._lock.
+        loaded = [e for e in self._entries.values() if e.vector_store is not None]
+        total = sum(e.bytes for e in loaded)
+        for entry in sorted(loaded, key=lambda e: e.last_used):
+            if total <= self.max_bytes:
+                break
+            if entry.key == keep:
+                continue
+            # Searches already running keep their own reference to the store.
+            entry.vector_store = None
+            total -= entry.bytes
+            self.evictions += 1
+            if entry.refs == 0:
+                del self._entries[entry.key]
+
+    def _unref(self, entry: _Entry) -> None:
+        # Caller holds self._lock.
+        entry.refs -= 1
+        if entry.refs == 0 and entry.vector_store is None:
+            self._entries.pop(entry.key, None)
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._unref(entry)
+
+    def stats(self) -> dict:
+        """Memory use, references and hit/miss/eviction counters."""
+        with self._lock:
+            loaded = [e for e in self._entries.values() if e.vector_store is not None]
+            return {
+                "indexes": len(self._entries),
+                "loaded": len(loaded),
+                "bytes": sum(e.bytes for e in loaded),
+                "max_bytes": self.max_bytes,
+                "references": sum(e.refs for e in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def get_index_manager() -> IndexManager:
+    """Return the process-wide index manager, shared by all sessions."""
+    def create() -> IndexManager:
+        manager = IndexManager()
+        register_collector("index_manager", manager.stats)
+        return manager
+
+    return get_or_create("index_manager", INDEX_MANAGER_MAX_BYTES, create)
@@ -1,19 +1,38 @@
+from langchain_core.language_models import BaseChatModel
 from langchain_groq import ChatGroq
 
-from config import LLM_MODEL, LLM_TEMPERATURE
+from components.llm_scheduler import schedule
+from components.registry import get_or_create
+from config import LLM_MODEL, LLM_SCHEDULER_ENABLED, LLM_TEMPERATURE
 
 # ──────────────────────────────────────────────
 # LLM Factory
 # ──────────────────────────────────────────────
 
-def get_llm() -> ChatGroq:
+def get_llm(priority: str = "interactive") -> BaseChatModel:
     """
-    Create and return the LLM instance.
+    Return the shared LLM client.
 
     Uses Groq for ultra-fast inference.
+    The client is built once per process and reused across sessions;
+    hits and misses are counted in registry_stats().
+    With LLM_SCHEDULER_ENABLED, calls go through the process-wide
+    LLMScheduler, which owns rate limiting and retries.
     Swap this function to change the LLM provider.
+
+    Args:
+        priority: "interactive" for Q&A, "background" for summaries and
+            batch questions.
     """
-    return ChatGroq(
-        model=LLM_MODEL,
-        temperature=LLM_TEMPERATURE,
+    client = get_or_create(
+        "llm",
+        (LLM_MODEL, LLM_TEMPERATURE, LLM_SCHEDULER_ENABLED),
+        lambda: ChatGroq(
+            model=LLM_MODEL,
+            temperature=LLM_TEMPERATURE,
+            # The scheduler retries 429s, 5xx, connection errors and timeouts,
+            # with backoff shared across callers.
+            max_retries=0 if LLM_SCHEDULER_ENABLED else 2,
+        ),
     )
+    return schedule(client, priority) if LLM_SCHEDULER_ENABLED else client
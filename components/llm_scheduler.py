@@ -0,0 +1,550 @@
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Iterator
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+from components.metrics import observe, register_collector
+from components.registry import get_or_create
+from config import (
+    LLM_COMPLETION_TOKENS,
+    LLM_MAX_RETRIES,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_RETRY_BASE_SECONDS,
+    LLM_RETRY_MAX_SECONDS,
+    LLM_TOKENS_PER_MINUTE,
+)
+
+# ──────────────────────────────────────────────
+# Stage 4 — LLM Scheduling: rate limits, priorities, retries, coalescing
+# ──────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+# Lower value goes first; background requests wait while interactive ones queue.
+PRIORITIES = {"interactive": 0, "background": 1}
+
+# Async waiters not at the head of the queue re-check this often.
+_ASYNC_POLL_SECONDS = 0.02
+
+# Connection failures and timeouts carry no status code: groq/openai-style
+# SDK errors and the httpx errors beneath them, matched by class name.
+_CONNECTION_ERRORS = {"APIConnectionError", "APITimeoutError", "TransportError"}
+
+
+class _TokenBucket:
+    """Refills `per_minute` units per minute, holding at most `burst_seconds` worth."""
+
+    def __init__(self, per_minute: float | None, burst_seconds: float):
+        self.rate = (per_minute or 0.0) / 60
+        self.capacity = self.rate * burst_seconds
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` units are available (0 = now)."""
+        if not self.rate:
+            return 0.0
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        # A request larger than the bucket waits for a full bucket, not forever.
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        if self.rate:
+            self.level -= min(amount, self.capacity)
+
+
+class _Flight:
+    """
+    One upstream call shared by every caller that sent the same prompt.
+
+    The leader publishes results (a ChatResult, or stream chunks as they
+    arrive); followers in any thread or event loop replay them. Results are
+    copied on publish and again on replay, so no caller sees changes made
+    to another caller's objects (LangChain sets message ids in place).
+    """
+
+    def __init__(self):
+        self.items: list = []
+        self.finished = False
+        self.error: Exception | None = None
+        self._cond = threading.Condition()
+        self._events: list[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+
+    def publish(self, item) -> None:
+        item = item.model_copy(deep=True)
+        with self._cond:
+            self.items.append(item)
+            self._cond.notify_all()
+        self._wake()
+
+    def finish(self, error: Exception | None = None) -> None:
+        with self._cond:
+            self.finished = True
+            self.error = error
+            self._cond.notify_all()
+        self._wake()
+
+    def _wake(self) -> None:
+        for loop, event in list(self._events):
+            loop.call_soon_threadsafe(event.set)
+
+    def follow(self) -> Iterator:
+        i = 0
+        while True:
+            with self._cond:
+                while i >= len(self.items) and not self.finished:
+                    self._cond.wait()
+                items = self.items[i:]
+                finished, error = self.finished, self.error
+            i += len(items)
+            for item in items:
+                yield item.model_copy(deep=True)
+            if finished and i >= len(self.items):
+                if error is not None:
+                    raise error
+                return
+
+    async def afollow(self) -> AsyncIterator:
+        event = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), event)
+        self._events.append(waiter)
+        i = 0
+        try:
+            while True:
+                # Clear before reading, so a publish after the read still wakes us.
+                event.clear()
+                with self._cond:
+                    items = self.items[i:]
+                    finished, error = self.finished, self.error
+                i += len(items)
+                for item in items:
+                    yield item.model_copy(deep=True)
+                if finished and not items:
+                    if error is not None:
+                        raise error
+                    return
+                if not items:
+                    await event.wait()
+        finally:
+            self._events.remove(waiter)
+
+
+def _status_code(error: Exception) -> int | None:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(error: Exception) -> float | None:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """True for a provider 429 (Groq raises groq.RateLimitError)."""
+    return _status_code(error) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def is_connection_error(error: Exception) -> bool:
+    """True for a failed connection or a timeout (groq.APIConnectionError, APITimeoutError)."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return any(cls.__name__ in _CONNECTION_ERRORS for cls in type(error).__mro__)
+
+
+class LLMScheduler:
+    """
+    Process-wide gate in front of the LLM provider.
+
+    Requests wait in one priority queue (interactive before background,
+    then first come first served) until both the requests-per-minute and
+    tokens-per-minute buckets can pay for them. A 429 pauses the whole
+    queue for the provider's Retry-After (or a backoff delay), so other
+    callers stop hitting the limit too. Identical in-flight prompts are
+    coalesced into one upstream call by ScheduledChatModel via join().
+
+    Args:
+        requests_per_minute: Request budget (None = unlimited).
+        tokens_per_minute: Prompt + completion token budget (None = unlimited).
+        max_retries: Retries per request after a 429, 5xx, connection
+            error or timeout.
+        retry_base_seconds: First backoff ceiling, doubled per retry.
+        retry_max_seconds: Largest backoff ceiling.
+        burst_seconds: Budget a full bucket holds; the provider's window
+            (one minute for Groq) allows bursts of that length.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float | None = LLM_TOKENS_PER_MINUTE,
+        max_retries: int = LLM_MAX_RETRIES,
+        retry_base_seconds: float = LLM_RETRY_BASE_SECONDS,
+        retry_max_seconds: float = LLM_RETRY_MAX_SECONDS,
+        burst_seconds: float = 60.0,
+    ):
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._requests = _TokenBucket(requests_per_minute, burst_seconds)
+        self._tokens = _TokenBucket(tokens_per_minute, burst_seconds)
+        self._queue: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+        self._flights: dict[str, _Flight] = {}
+        self.admitted = 0
+        self.rate_limited = 0
+        self.retries = 0
+        self.coalesced = 0
+
+    # ── Admission ─────────────────────────────
+
+    def _ticket(self, priority: str, ticket: tuple[int, int] | None) -> tuple[int, int]:
+        # A retry re-queues its original ticket, ahead of requests that arrived later.
+        ticket = ticket or (PRIORITIES[priority], next(self._seq))
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+        return ticket
+
+    def _try_admit(self, ticket: tuple[int, int], tokens: int) -> float | None:
+        # Caller holds self._cond. Returns 0 when admitted, else seconds to
+        # wait, or None to wait for the queue head to move.
+        if self._queue[0] != ticket:
+            return None
+        now = time.monotonic()
+        wait = max(
+            self._paused_until - now,
+            self._requests.wait_time(1, now),
+            self._tokens.wait_time(tokens, now),
+        )
+        if wait > 0:
+            return wait
+        self._requests.take(1)
+        self._tokens.take(tokens)
+        heapq.heappop(self._queue)
+        self.admitted += 1
+        self._cond.notify_all()
+        return 0
+
+    def _abandon(self, ticket: tuple[int, int]) -> None:
+        with self._cond:
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+
+    def acquire(self, tokens: int, priority: str = "interactive", ticket: tuple[int, int] | None = None) -> tuple[int, int]:
+        """
+        Block until a request of about `tokens` tokens may be sent.
+
+        Returns:
+            The request's queue ticket. Pass it back when retrying the
+            request, so the retry keeps its place in the queue.
+        """
+        started = time.perf_counter()
+        ticket = self._ticket(priority, ticket)
+        try:
+            with self._cond:
+                while (wait := self._try_admit(ticket, tokens)) != 0:
+                    self._cond.wait(wait)
+        finally:
+            # No-op once admitted; otherwise don't block the requests behind it.
+            self._abandon(ticket)
+        observe("rag_llm_queue_seconds", time.perf_counter() - started, labels={"priority": priority}, description="Time LLM requests waited for rate-limit budget")
+        return ticket
+
+    async def aacquire(self, tokens: int, priority: str = "interactive", ticket: tuple[int, int] | None = None) -> tuple[int, int]:
+        """Async acquire(); waits without blocking the event loop."""
+        started = time.perf_counter()
+        ticket = self._ticket(priority, ticket)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_admit(ticket, tokens)
+                if wait == 0:
+                    break
+                await asyncio.sleep(min(wait, _ASYNC_POLL_SECONDS) if wait else _ASYNC_POLL_SECONDS)
+        finally:
+            self._abandon(ticket)
+        observe("rag_llm_queue_seconds", time.perf_counter() - started, labels={"priority": priority}, description="Time LLM requests waited for rate-limit budget")
+        return ticket
+
+    # ── Retries ───────────────────────────────
+
+    def retry_delay(self, error: Exception, attempt: int) -> float | None:
+        """
+        Seconds to wait before retrying after `error`, or None to give up.
+
+        429s, 5xx responses, connection errors and timeouts are retried.
+        Backoff uses full jitter: uniform(0, min(max, base * 2**attempt)).
+        A 429 also pauses the queue, at least for the provider's Retry-After.
+        """
+        status = _status_code(error)
+        rate_limited = is_rate_limited(error)
+        retryable = rate_limited or (status is not None and status >= 500) or is_connection_error(error)
+        if not retryable or attempt >= self.max_retries:
+            return None
+        delay = random.uniform(0, min(self.retry_max_seconds, self.retry_base_seconds * 2 ** attempt))
+        with self._cond:
+            self.retries += 1
+            if rate_limited:
+                self.rate_limited += 1
+                delay = max(delay, _retry_after(error) or 0.0)
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                self._cond.notify_all()
+        logger.warning("LLM request failed (%s), retry %d in %.2fs", status or type(error).__name__, attempt + 1, delay)
+        return delay
+
+    # ── Single-flight ─────────────────────────
+
+    def join(self, key: str) -> tuple[_Flight, bool]:
+        """Return the in-flight call for `key` and whether the caller leads it."""
+        with self._cond:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            return flight, True
+
+    def leave(self, key: str, flight: _Flight) -> None:
+        """Drop a finished flight; later identical prompts make a new call."""
+        with self._cond:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def stats(self) -> dict:
+        """Queue depth, in-flight calls and admission/retry/coalescing counters."""
+        with self._cond:
+            return {
+                "queued": len(self._queue),
+                "in_flight": len(self._flights),
+                "admitted": self.admitted,
+                "rate_limited": self.rate_limited,
+                "retries": self.retries,
+                "coalesced": self.coalesced,
+            }
+
+
+class ScheduledChatModel(BaseChatModel):
+    """
+    Chat model wrapper that sends every call through an LLMScheduler.
+
+    Drop-in for the wrapped model in any chain. Calls with the same
+    messages, stop words and parameters that overlap in time share one
+    upstream call; streaming followers replay the leader's chunks. A
+    stream is only retried if it failed before its first chunk.
+    """
+
+    llm: BaseChatModel
+    scheduler: Any
+    priority: str = "interactive"
+    completion_tokens: int = LLM_COMPLETION_TOKENS
+
+    @property
+    def _llm_type(self) -> str:
+        return f"scheduled-{self.llm._llm_type}"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"llm": self.llm._identifying_params, "priority": self.priority}
+
+    def with_priority(self, priority: str) -> "ScheduledChatModel":
+        """The same model and scheduler, queued at another priority."""
+        return self.model_copy(update={"priority": priority})
+
+    def _budget(self, messages: list[BaseMessage]) -> int:
+        # ~4 characters per token, plus the completion the provider reserves.
+        return sum(len(str(message.content)) for message in messages) // 4 + self.completion_tokens
+
+    def _flight_key(self, mode: str, messages: list[BaseMessage], stop: list[str] | None, kwargs: dict) -> str:
+        payload = json.dumps(
+            [mode, self.llm._identifying_params, [[m.type, m.content] for m in messages], stop, kwargs],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # ── Sync ──────────────────────────────────
+
+    def _generate(self, messages: list[BaseMessage], stop: list[str] | None = None, run_manager: CallbackManagerForLLMRun | None = None, **kwargs: Any) -> ChatResult:
+        key = self._flight_key("generate", messages, stop, kwargs)
+        flight, leader = self.scheduler.join(key)
+        if not leader:
+            results = flight.follow()
+            try:
+                return next(results)
+            finally:
+                results.close()
+        ticket = None
+        try:
+            for attempt in itertools.count():
+                ticket = self.scheduler.acquire(self._budget(messages), self.priority, ticket)
+                try:
+                    result = self.llm._generate(messages, stop=stop, **kwargs)
+                    break
+                except Exception as e:
+                    delay = self.scheduler.retry_delay(e, attempt)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+            flight.publish(result)
+            flight.finish()
+            return result
+        except Exception as e:
+            flight.finish(e)
+            raise
+        finally:
+            self.scheduler.leave(key, flight)
+
+    def _stream(self, messages: list[BaseMessage], stop: list[str] | None = None, run_manager: CallbackManagerForLLMRun | None = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        key = self._flight_key("stream", messages, stop, kwargs)
+        flight, leader = self.scheduler.join(key)
+        chunks = self._lead_stream(key, flight, messages, stop, kwargs) if leader else flight.follow()
+        # BaseChatModel.stream() fires on_llm_new_token for every chunk yielded here.
+        yield from chunks
+
+    def _lead_stream(self, key: str, flight: _Flight, messages, stop, kwargs) -> Iterator[ChatGenerationChunk]:
+        ticket = None
+        try:
+            for attempt in itertools.count():
+                ticket = self.scheduler.acquire(self._budget(messages), self.priority, ticket)
+                started = False
+                try:
+                    for chunk in self.llm._stream(messages, stop=stop, **kwargs):
+                        started = True
+                        flight.publish(chunk)
+                        yield chunk
+                    break
+                except Exception as e:
+                    delay = None if started else self.scheduler.retry_delay(e, attempt)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+            flight.finish()
+        except Exception as e:
+            flight.finish(e)
+            raise
+        except GeneratorExit:
+            # The leader's consumer stopped early; followers must not wait forever.
+            flight.finish(RuntimeError("The shared LLM stream was closed before it finished."))
+            raise
+        finally:
+            self.scheduler.leave(key, flight)
+
+    # ── Async ─────────────────────────────────
+
+    async def _agenerate(self, messages: list[BaseMessage], stop: list[str] | None = None, run_manager: AsyncCallbackManagerForLLMRun | None = None, **kwargs: Any) -> ChatResult:
+        key = self._flight_key("generate", messages, stop, kwargs)
+        flight, leader = self.scheduler.join(key)
+        if not leader:
+            results = flight.afollow()
+            try:
+                return await anext(results)
+            finally:
+                await results.aclose()
+        ticket = None
+        try:
+            for attempt in itertools.count():
+                ticket = await self.scheduler.aacquire(self._budget(messages), self.priority, ticket)
+                try:
+                    result = await self.llm._agenerate(messages, stop=stop, **kwargs)
+                    break
+                except Exception as e:
+                    delay = self.scheduler.retry_delay(e, attempt)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+            flight.publish(result)
+            flight.finish()
+            return result
+        except BaseException as e:
+            flight.finish(e if isinstance(e, Exception) else RuntimeError("The shared LLM call was cancelled."))
+            raise
+        finally:
+            self.scheduler.leave(key, flight)
+
+    async def _astream(self, messages: list[BaseMessage], stop: list[str] | None = None, run_manager: AsyncCallbackManagerForLLMRun | None = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        key = self._flight_key("stream", messages, stop, kwargs)
+        flight, leader = self.scheduler.join(key)
+        chunks = self._alead_stream(key, flight, messages, stop, kwargs) if leader else flight.afollow()
+        # BaseChatModel.astream() fires on_llm_new_token for every chunk yielded here.
+        async for chunk in chunks:
+            yield chunk
+
+    async def _alead_stream(self, key: str, flight: _Flight, messages, stop, kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        ticket = None
+        try:
+            for attempt in itertools.count():
+                ticket = await self.scheduler.aacquire(self._budget(messages), self.priority, ticket)
+                started = False
+                try:
+                    async for chunk in self.llm._astream(messages, stop=stop, **kwargs):
+                        started = True
+                        flight.publish(chunk)
+                        yield chunk
+                    break
+                except Exception as e:
+                    delay = None if started else self.scheduler.retry_delay(e, attempt)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+            flight.finish()
+        except Exception as e:
+            flight.finish(e)
+            raise
+        except BaseException:
+            # Cancelled, or the consumer stopped early; release the followers.
+            flight.finish(RuntimeError("The shared LLM stream was closed before it finished."))
+            raise
+        finally:
+            self.scheduler.leave(key, flight)
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Return the process-wide scheduler, shared by every LLM call."""
+    def create() -> LLMScheduler:
+        scheduler = LLMScheduler()
+        register_collector("llm_scheduler", scheduler.stats)
+        return scheduler
+
+    return get_or_create(
+        "llm_scheduler",
+        (LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE, LLM_MAX_RETRIES),
+        create,
+    )
+
+
+def schedule(llm: BaseChatModel, priority: str = "interactive", scheduler: LLMScheduler | None = None) -> ScheduledChatModel:
+    """
+    Route a chat model through the scheduler.
+
+    Args:
+        llm: Chat model making the upstream calls.
+        priority: "interactive" (Q&A) or "background" (summaries, batches).
+        scheduler: Scheduler to use (default: the process-wide one).
+
+    Returns:
+        ScheduledChatModel wrapping `llm`.
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority {priority!r}; expected one of {sorted(PRIORITIES)}")
+    return ScheduledChatModel(llm=llm, scheduler=scheduler or get_llm_scheduler(), priority=priority)
@@ -0,0 +1,222 @@
+import functools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+from config import METRICS_FILE, METRICS_JSON_LOGS
+
+# ──────────────────────────────────────────────
+# Pipeline Metrics — histograms, counters, export
+# ──────────────────────────────────────────────
+
+logger = logging.getLogger("rag.metrics")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+COUNT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Recent observations kept per series for percentiles in the debug panel.
+_RECENT = 1000
+
+_lock = threading.Lock()
+_histograms: dict[tuple, "_Histogram"] = {}
+_counters: dict[tuple, float] = {}
+_collectors: dict[str, Callable[[], dict[str, float]]] = {}
+_help: dict[str, tuple[str, str]] = {}
+
+
+class _Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.recent: deque[float] = deque(maxlen=_RECENT)
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+        self.recent.append(value)
+
+
+def _series(name: str, labels: dict | None) -> tuple:
+    return (name, tuple(sorted((labels or {}).items())))
+
+
+def observe(name: str, value: float, labels: dict | None = None, buckets: tuple = LATENCY_BUCKETS, description: str = "") -> None:
+    """Record one observation in a histogram."""
+    with _lock:
+        _help.setdefault(name, ("histogram", description))
+        histogram = _histograms.get(_series(name, labels))
+        if histogram is None:
+            histogram = _histograms[_series(name, labels)] = _Histogram(buckets)
+        histogram.observe(value)
+
+
+def increment(name: str, value: float = 1, labels: dict | None = None, description: str = "") -> None:
+    """Add to a counter."""
+    with _lock:
+        _help.setdefault(name, ("counter", description))
+        key = _series(name, labels)
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def configure_metrics_logging() -> None:
+    """
+    Print the "rag.metrics" JSON lines on stderr, once per process.
+
+    Called by the entry points (app.py, server.py). Library code only logs
+    to the logger; other embedders attach their own handler, or none.
+    """
+    if METRICS_JSON_LOGS and not logger.handlers:
+        # Bare JSON lines, independent of the root logger's level and format.
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def log_event(event: str, **fields) -> None:
+    """Emit one structured JSON log line (when METRICS_JSON_LOGS is on)."""
+    if METRICS_JSON_LOGS:
+        logger.info(json.dumps({"event": event, "ts": time.time(), **fields}, default=str))
+
+
+def record_stage(stage: str, seconds: float, **fields) -> None:
+    """Record the latency of one pipeline stage."""
+    observe("rag_stage_seconds", seconds, {"stage": stage}, description="Latency of each RAG pipeline stage")
+    log_event("stage", stage=stage, seconds=round(seconds, 6), **fields)
+
+
+@contextmanager
+def timed(stage: str, **fields):
+    """Context manager timing a block as a pipeline stage."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started, **fields)
+
+
+def timed_stage(stage: str):
+    """Decorator timing every call of a function as a pipeline stage."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def register_collector(name: str, collect: Callable[[], dict[str, float]]) -> None:
+    """
+    Register a callable sampled at export time (e.g. cache hit/miss counts).
+
+    `collect` returns {"metric_suffix": value}; values are exported as
+    gauges named rag_<name>_<metric_suffix>.
+    """
+    with _lock:
+        _collectors[name] = collect
+
+
+def _collect() -> dict[str, float]:
+    with _lock:
+        collectors = dict(_collectors)
+    values = {}
+    for name, collect in collectors.items():
+        try:
+            for suffix, value in collect().items():
+                values[f"rag_{name}_{suffix}"] = float(value)
+        except Exception:
+            logger.exception("metrics collector %s failed", name)
+    return values
+
+
+def _format_labels(labels: tuple, extra: tuple = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+def render_prometheus() -> str:
+    """Render all metrics in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        histograms = sorted(_histograms.items())
+        counters = sorted(_counters.items())
+        help_text = dict(_help)
+
+    seen = set()
+    for (name, labels), histogram in histograms:
+        if name not in seen:
+            seen.add(name)
+            lines.append(f"# HELP {name} {help_text[name][1]}")
+            lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels(labels, (('le', bound),))} {cumulative}")
+        lines.append(f"{name}_bucket{_format_labels(labels, (('le', '+Inf'),))} {histogram.count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+    for (name, labels), value in counters:
+        if name not in seen:
+            seen.add(name)
+            lines.append(f"# HELP {name} {help_text[name][1]}")
+            lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    for name, value in sorted(_collect().items()):
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str | None = METRICS_FILE) -> None:
+    """Write the Prometheus text file (e.g. for node_exporter's textfile collector)."""
+    if not path:
+        return
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(target.suffix + ".tmp")
+    tmp.write_text(render_prometheus(), encoding="utf-8")
+    tmp.replace(target)
+
+
+def metrics_snapshot() -> dict:
+    """
+    Summaries for the debug panel.
+
+    Returns:
+        {"stages": {series: {"count", "p50", "p95", "mean"}},
+         "counters": {series: value}, "gauges": {name: value}}
+    """
+    with _lock:
+        stages = {}
+        for (name, labels), histogram in _histograms.items():
+            recent = sorted(histogram.recent)
+            if not recent:
+                continue
+            label = name + _format_labels(labels)
+            stages[label] = {
+                "count": histogram.count,
+                "p50": recent[len(recent) // 2],
+                "p95": recent[min(len(recent) - 1, int(len(recent) * 0.95))],
+                "mean": histogram.sum / histogram.count,
+            }
+        counters = {name + _format_labels(labels): value for (name, labels), value in _counters.items()}
+    return {"stages": stages, "counters": counters, "gauges": _collect()}
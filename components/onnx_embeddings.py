@@ -0,0 +1,132 @@
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from config import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_MAX_LENGTH,
+    EMBEDDING_MODEL,
+    EMBEDDING_ONNX_DIR,
+    EMBEDDING_ONNX_THREADS,
+)
+
+# ──────────────────────────────────────────────
+# Stage 1c — Quantized ONNX Embedding Backend (CPU)
+# ──────────────────────────────────────────────
+
+_FP32_FILE = "model.onnx"
+_INT8_FILE = "model_int8.onnx"
+
+
+def export_int8_model(model_name: str = EMBEDDING_MODEL, root: str = EMBEDDING_ONNX_DIR) -> Path:
+    """
+    Export a sentence-transformers model to ONNX and quantize it to int8.
+
+    The export runs once; later calls return the existing directory.
+    Weights are quantized with onnxruntime's dynamic (per-row) int8
+    quantization, activations stay fp32.
+
+    Args:
+        model_name: Hugging Face model ID (the "sentence-transformers/"
+            prefix is added for bare names, as HuggingFaceEmbeddings does).
+        root: Directory under which exported models are kept.
+
+    Returns:
+        Directory holding model_int8.onnx and the tokenizer files.
+    """
+    model_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+    target = Path(root) / model_id.replace("/", "__")
+    if (target / _INT8_FILE).exists():
+        return target
+
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+    except ImportError as e:
+        raise RuntimeError(
+            "The onnx_int8 embedding backend needs: pip install optimum[onnxruntime]"
+        ) from e
+
+    target.mkdir(parents=True, exist_ok=True)
+    ORTModelForFeatureExtraction.from_pretrained(model_id, export=True).save_pretrained(target)
+    AutoTokenizer.from_pretrained(model_id).save_pretrained(target)
+    tmp = target / f"{_INT8_FILE}.tmp"
+    quantize_dynamic(target / _FP32_FILE, tmp, weight_type=QuantType.QInt8)
+    tmp.replace(target / _INT8_FILE)
+    return target
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    int8 ONNX Runtime drop-in for HuggingFaceEmbeddings.
+
+    Produces the same mean-pooled, L2-normalized sentence vectors as the
+    sentence-transformers pipeline of all-MiniLM-L6-v2. Texts are sorted by
+    length before batching so each batch pads only to its own longest text.
+
+    Args:
+        model_name: Hugging Face model ID to export (see export_int8_model()).
+        threads: ONNX Runtime intra-op threads.
+        batch_size: Texts per inference call.
+        max_length: Token limit per text; longer texts are truncated,
+            as sentence-transformers does at the model's max_seq_length.
+    """
+
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL,
+        threads: int = EMBEDDING_ONNX_THREADS,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_length: int = EMBEDDING_MAX_LENGTH,
+    ):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_dir = export_int8_model(model_name)
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_dir / _INT8_FILE), options, providers=["CPUExecutionProvider"]
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir, use_fast=True)
+        self.input_names = {node.name for node in self.session.get_inputs()}
+        # Distinct from the fp32 model so cached vectors are never mixed.
+        self.model_name = f"{model_name}:onnx-int8"
+        self.batch_size = batch_size
+        self.max_length = max_length
+
+    def _embed_batch(self, texts: list[str]) -> np.ndarray:
+        encoded = self.tokenizer(
+            texts,
+            padding="longest",
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="np",
+        )
+        inputs = {name: value.astype(np.int64) for name, value in encoded.items() if name in self.input_names}
+        hidden = self.session.run(None, inputs)[0]
+        mask = encoded["attention_mask"][..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts in length-bucketed batches; output keeps input order."""
+        if not texts:
+            return []
+        order = np.argsort([len(text) for text in texts], kind="stable")
+        batches = [
+            self._embed_batch([texts[j] for j in order[i:i + self.batch_size]])
+            for i in range(0, len(order), self.batch_size)
+        ]
+        stacked = np.concatenate(batches)
+        vectors = np.empty_like(stacked)
+        vectors[order] = stacked
+        return vectors.tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        """Embed one query."""
+        return self._embed_batch([text])[0].tolist()
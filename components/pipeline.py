@@ -0,0 +1,62 @@
+from typing import Callable, Iterable
+
+from langchain_community.vectorstores import FAISS
+
+from components.cache import (
+    cache_key,
+    load_cached_snippets,
+    load_cached_vector_store,
+    save_cached_snippets,
+    save_cached_vector_store,
+)
+from components.document_loader import SUPPORTED_LANGUAGES, load_transcript_snippets
+from components.text_splitter import stream_split_snippets
+from components.vector_store import build_vector_store
+
+# ──────────────────────────────────────────────
+# Stages 1a–1d in one call (cache-aware)
+# ──────────────────────────────────────────────
+
+def load_video_index(
+    video_id: str,
+    language: str,
+    embeddings,
+    fetcher: Callable[[str, str], Iterable | None] = load_transcript_snippets,
+) -> FAISS | None:
+    """
+    Return the FAISS index of a video, from the disk cache or built fresh.
+
+    Args:
+        video_id: The YouTube video ID.
+        language: Display label from SUPPORTED_LANGUAGES.
+        embeddings: The embedding model instance.
+        fetcher: Callable (video_id, language) → snippets or None.
+
+    Returns:
+        FAISS vector store, or None if the video has no transcript.
+
+    Raises:
+        RuntimeError: If fetching the transcript fails unexpectedly.
+    """
+    lang_codes = SUPPORTED_LANGUAGES.get(language, ["en"])
+    key = cache_key(video_id, lang_codes)
+
+    vector_store = load_cached_vector_store(key, embeddings)
+    if vector_store is not None:
+        return vector_store
+
+    snippets = load_cached_snippets(key)
+    if snippets is None:
+        snippets = fetcher(video_id, language)
+        if not snippets:
+            return None
+        snippets = list(snippets)
+        save_cached_snippets(key, snippets)
+    if not snippets:
+        return None
+
+    metadata = {"video_id": video_id, "language": lang_codes[0]}
+    chunks = list(stream_split_snippets(snippets, metadata=metadata))
+    vector_store = build_vector_store(chunks, embeddings)
+    save_cached_vector_store(key, vector_store)
+    return vector_store
@@ -0,0 +1,135 @@
+import importlib
+import logging
+import threading
+from typing import Any, Callable, Hashable
+
+from components.metrics import register_collector
+
+# ──────────────────────────────────────────────
+# Process-wide Model & Client Registry
+# ──────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+_instances: dict[Hashable, Any] = {}
+_key_locks: dict[Hashable, threading.Lock] = {}
+_stats: dict[str, dict[str, int]] = {}
+_lock = threading.Lock()
+
+
+def get_or_create(name: str, key: Hashable, factory: Callable[[], Any]) -> Any:
+    """
+    Return the shared instance for (name, key), building it on first use.
+
+    Construction runs under a per-key lock, so concurrent sessions asking
+    for the same model wait for one build instead of loading it twice.
+
+    Args:
+        name: Registry slot, e.g. "embeddings" or "llm". Used for stats.
+        key: Everything the instance depends on (model name, settings...).
+        factory: Zero-argument callable that builds the instance.
+
+    Returns:
+        The shared instance.
+    """
+    full_key = (name, key)
+    with _lock:
+        stats = _stats.setdefault(name, {"hits": 0, "misses": 0})
+        if full_key in _instances:
+            stats["hits"] += 1
+            logger.debug("registry hit: %s %r", name, key)
+            return _instances[full_key]
+        key_lock = _key_locks.setdefault(full_key, threading.Lock())
+
+    with key_lock:
+        with _lock:
+            if full_key in _instances:
+                stats["hits"] += 1
+                logger.debug("registry hit: %s %r", name, key)
+                return _instances[full_key]
+        instance = factory()
+        with _lock:
+            _instances[full_key] = instance
+            stats["misses"] += 1
+        logger.info("registry miss: built %s %r", name, key)
+        return instance
+
+
+def registry_stats() -> dict[str, dict[str, int]]:
+    """Return a snapshot of hit/miss counts per registry slot."""
+    with _lock:
+        return {name: dict(counts) for name, counts in _stats.items()}
+
+
+def _collect_registry() -> dict[str, int]:
+    return {
+        f"{name}_{kind}": count
+        for name, counts in registry_stats().items()
+        for kind, count in counts.items()
+    }
+
+
+register_collector("registry", _collect_registry)
+
+
+def clear_registry() -> None:
+    """Drop all shared instances and counters (tests / config reloads)."""
+    with _lock:
+        _instances.clear()
+        _key_locks.clear()
+        _stats.clear()
+
+
+# ──────────────────────────────────────────────
+# Background Warm-up
+# ──────────────────────────────────────────────
+
+_warmup_thread: threading.Thread | None = None
+
+# Modules the load flow needs; imported ahead of the first click.
+_WARM_UP_MODULES = (
+    "components.document_loader",
+    "components.text_splitter",
+    "components.cache",
+    "components.vector_store",
+    "components.index_job",
+    "components.index_manager",
+    "components.llm_scheduler",
+    "chains.rag_chain",
+    "chains.summarizer",
+    "chains.answer_cache",
+)
+
+
+def _warm_up() -> None:
+    try:
+        for module in _WARM_UP_MODULES:
+            importlib.import_module(module)
+        # Imported here to avoid a cycle: the factories import this module.
+        from components.embeddings import get_embeddings, get_tokenizer
+        from components.llm import get_llm
+        from config import CHUNK_MODE
+
+        # A dummy encode pays for weight loading and first-call allocations.
+        get_embeddings().embed_query("warm-up")
+        if CHUNK_MODE == "tokens":
+            get_tokenizer()
+        get_llm()
+    except Exception:
+        logger.exception("model warm-up failed")
+
+
+def warm_up() -> threading.Thread:
+    """
+    Import the pipeline modules and build the shared embedding model and
+    LLM client in a background thread.
+
+    Safe to call on every Streamlit rerun: only the first call in a process
+    starts a thread, later calls return the same one.
+    """
+    global _warmup_thread
+    with _lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=_warm_up, name="model-warm-up", daemon=True)
+            _warmup_thread.start()
+        return _warmup_thread
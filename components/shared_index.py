@@ -0,0 +1,291 @@
+import hashlib
+import json
+import pickle
+import threading
+from pathlib import Path
+from typing import Any
+
+import faiss
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from components.registry import get_or_create
+from config import (
+    RETRIEVER_K,
+    SHARED_INDEX_DIR,
+    SHARED_INDEX_NLIST,
+    SHARED_INDEX_NPROBE,
+)
+
+# ──────────────────────────────────────────────
+# Stage 1d — Shared Multi-video Vector Index
+# ──────────────────────────────────────────────
+
+# Chunk IDs are (video number << _CHUNK_BITS) | chunk number, so every
+# video owns a contiguous ID range that search and removal can select.
+_CHUNK_BITS = 20
+
+# FAISS recommends ~39 training points per IVF list.
+_TRAIN_POINTS_PER_LIST = 39
+
+_CONFIG_FILE = "config.json"
+_VIDEOS_DIR = "videos"
+
+
+def video_key(video_id: str, language: str | None = None) -> str:
+    """Key of one video transcript in the shared index, e.g. "LPZh9BOjkQs:en"."""
+    return video_id if language is None else f"{video_id}:{language}"
+
+
+class SharedVideoIndex:
+    """
+    One FAISS index holding the chunks of every ingested video.
+
+    Starts as an exact flat index and switches to IVF once the corpus is
+    large enough to train SHARED_INDEX_NLIST lists. Searches can be limited
+    to one video, a set of videos or the whole corpus; with IVF the filter
+    is applied while scanning the probed lists, so vectors of other videos
+    are never scored. Videos are keyed by video_key(video_id, language), so
+    each transcript language is indexed separately.
+
+    With a `directory`, every added video is written there as its own
+    segment file, so an ingest costs O(video), not O(index); load() rebuilds
+    the index from the segments.
+
+    Args:
+        dim: Embedding dimension.
+        nlist: IVF list count once trained.
+        nprobe: IVF lists scanned per query.
+        embeddings: Model used by as_retriever() to embed queries.
+        directory: Where segments are persisted (None = memory only).
+        config: Pipeline config the vectors were built with; load() refuses
+            a directory saved with another one.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        nlist: int = SHARED_INDEX_NLIST,
+        nprobe: int = SHARED_INDEX_NPROBE,
+        embeddings=None,
+        directory: str | Path | None = None,
+        config: dict | None = None,
+    ):
+        self.dim = dim
+        self.embeddings = embeddings
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.directory = Path(directory) if directory is not None else None
+        self.config = config
+        self.index = faiss.IndexIDMap2(faiss.IndexFlatL2(dim))
+        self.docstore: dict[int, Document] = {}
+        self.videos: dict[str, list[int]] = {}
+        self._video_numbers: dict[str, int] = {}
+        self._next_video_number = 0
+        self._lock = threading.RLock()
+
+    @property
+    def is_ivf(self) -> bool:
+        return isinstance(self.index, faiss.IndexIVF)
+
+    def __len__(self) -> int:
+        return self.index.ntotal
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.videos
+
+    def _video_number(self, key: str) -> int:
+        if key not in self._video_numbers:
+            self._video_numbers[key] = self._next_video_number
+            self._next_video_number += 1
+        return self._video_numbers[key]
+
+    def add_video(self, video_id: str, documents: list[Document], vectors, language: str | None = None) -> None:
+        """
+        Add (or replace) all chunks of one video transcript.
+
+        Args:
+            video_id: The YouTube video ID.
+            documents: The video's chunks, in order.
+            vectors: Array-like of shape (len(documents), dim).
+            language: Transcript language code; part of the video's key and
+                stored in chunk metadata.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if len(documents) >= 1 << _CHUNK_BITS:
+            raise ValueError(f"Too many chunks for one video: {len(documents)}")
+        key = video_key(video_id, language)
+        metadata = {"video_id": video_id} if language is None else {"video_id": video_id, "language": language}
+        documents = [Document(page_content=doc.page_content, metadata={**doc.metadata, **metadata}) for doc in documents]
+        with self._lock:
+            self._add(key, documents, vectors)
+            self._maybe_train()
+            if self.directory is not None:
+                self._write_segment(key, documents, vectors)
+
+    def _add(self, key: str, documents: list[Document], vectors: np.ndarray) -> None:
+        self._remove(key)
+        base = self._video_number(key) << _CHUNK_BITS
+        ids = np.arange(base, base + len(documents), dtype=np.int64)
+        self.docstore.update(zip(ids.tolist(), documents))
+        self.index.add_with_ids(vectors, ids)
+        self.videos[key] = ids.tolist()
+
+    def remove_video(self, key: str) -> bool:
+        """Remove every chunk of a video (by video_key()). Returns False if it was not indexed."""
+        with self._lock:
+            removed = self._remove(key)
+            if removed and self.directory is not None:
+                self._segment_path(key).unlink(missing_ok=True)
+            return removed
+
+    def _remove(self, key: str) -> bool:
+        ids = self.videos.pop(key, None)
+        if ids is None:
+            return False
+        base = self._video_numbers[key] << _CHUNK_BITS
+        self.index.remove_ids(faiss.IDSelectorRange(base, base + (1 << _CHUNK_BITS)))
+        for chunk_id in ids:
+            self.docstore.pop(chunk_id, None)
+        return True
+
+    def _maybe_train(self) -> None:
+        """Move from the flat index to IVF once there is enough data to train."""
+        if self.is_ivf or self.index.ntotal < self.nlist * _TRAIN_POINTS_PER_LIST:
+            return
+        ids = faiss.vector_to_array(self.index.id_map).astype(np.int64)
+        vectors = self.index.index.reconstruct_n(0, self.index.ntotal)
+        quantizer = faiss.IndexFlatL2(self.dim)
+        ivf = faiss.IndexIVFFlat(quantizer, self.dim, self.nlist, faiss.METRIC_L2)
+        ivf.train(vectors)
+        ivf.add_with_ids(vectors, ids)
+        ivf.nprobe = self.nprobe
+        self.index = ivf
+        self._quantizer = quantizer  # keep the Python wrapper alive
+
+    def _selector(self, keys: list[str] | None):
+        if keys is None:
+            return None
+        ranges = [self._video_numbers[key] << _CHUNK_BITS for key in keys if key in self.videos]
+        if len(ranges) == 1:
+            return faiss.IDSelectorRange(ranges[0], ranges[0] + (1 << _CHUNK_BITS))
+        ids = np.array([i for key in keys if key in self.videos for i in self.videos[key]], dtype=np.int64)
+        return faiss.IDSelectorBatch(len(ids), faiss.swig_ptr(ids))
+
+    def search(self, query_vector, k: int = RETRIEVER_K, video_ids: list[str] | None = None) -> list[tuple[Document, float]]:
+        """
+        Return the k nearest chunks with their L2 distances.
+
+        Args:
+            query_vector: Embedded query, shape (dim,).
+            k: Number of results.
+            video_ids: Restrict to these videos, as video_key()s (None = whole corpus).
+        """
+        query = np.ascontiguousarray(query_vector, dtype=np.float32).reshape(1, -1)
+        with self._lock:
+            if video_ids is not None and not any(key in self.videos for key in video_ids):
+                return []
+            selector = self._selector(video_ids)
+            if self.is_ivf:
+                params = faiss.SearchParametersIVF(sel=selector, nprobe=self.nprobe) if selector is not None else None
+            else:
+                params = faiss.SearchParameters(sel=selector) if selector is not None else None
+            distances, ids = self.index.search(query, k, params=params)
+            return [
+                (self.docstore[chunk_id], float(distance))
+                for chunk_id, distance in zip(ids[0].tolist(), distances[0].tolist())
+                if chunk_id != -1
+            ]
+
+    def as_retriever(self, video_ids: list[str] | None = None, k: int = RETRIEVER_K) -> "SharedIndexRetriever":
+        """Return a LangChain retriever over this index, optionally limited to some video_key()s."""
+        return SharedIndexRetriever(index=self, embeddings=self.embeddings, video_ids=video_ids, k=k)
+
+    def _segment_path(self, key: str) -> Path:
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        return self.directory / _VIDEOS_DIR / f"{name}.pkl"
+
+    def _write_segment(self, key: str, documents: list[Document], vectors: np.ndarray) -> None:
+        (self.directory / _VIDEOS_DIR).mkdir(parents=True, exist_ok=True)
+        config_path = self.directory / _CONFIG_FILE
+        if not config_path.is_file():
+            config_path.write_text(json.dumps({"config": self.config, "dim": self.dim}), encoding="utf-8")
+        path = self._segment_path(key)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump({"key": key, "documents": documents, "vectors": vectors}, f)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, directory: str | Path, embeddings=None, config: dict | None = None) -> "SharedVideoIndex | None":
+        """
+        Rebuild an index from the segments in a directory, or return None if there are none.
+
+        Raises:
+            RuntimeError: The directory was built with another pipeline config
+                (embedding model, backend or chunking) or dimension.
+        """
+        path = Path(directory)
+        if not (path / _CONFIG_FILE).is_file():
+            return None
+        saved = json.loads((path / _CONFIG_FILE).read_text(encoding="utf-8"))
+        dim = len(embeddings.embed_query("dimension probe")) if embeddings is not None else saved["dim"]
+        if saved["config"] != config or saved["dim"] != dim:
+            raise RuntimeError(
+                f"The shared index in {path} was built with another embedding or chunking config; "
+                "delete it or restore the config."
+            )
+        shared = cls(dim, embeddings=embeddings, directory=path, config=config)
+        # Segment pickles are written by _write_segment() only.
+        for segment in sorted((path / _VIDEOS_DIR).glob("*.pkl")):
+            with open(segment, "rb") as f:
+                state = pickle.load(f)
+            shared._add(state["key"], state["documents"], state["vectors"])
+        shared._maybe_train()
+        return shared
+
+
+class SharedIndexRetriever(BaseRetriever):
+    """LangChain retriever over a SharedVideoIndex, optionally limited to some videos."""
+
+    index: Any
+    embeddings: Any
+    video_ids: list[str] | None = None
+    k: int = RETRIEVER_K
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> list[Document]:
+        vector = self.embeddings.embed_query(query)
+        return [doc for doc, _ in self.index.search(vector, self.k, self.video_ids)]
+
+
+def _index_config() -> dict:
+    # Imported here: components.cache imports this module through vector_store.
+    from components.cache import pipeline_config
+
+    # The shared index always stores float32 vectors.
+    return {key: value for key, value in pipeline_config().items() if key != "compression"}
+
+
+def get_shared_index(embeddings) -> SharedVideoIndex:
+    """
+    Return the process-wide shared index, loading it from SHARED_INDEX_DIR.
+
+    Each pipeline config (embedding model, backend, chunking) gets its own
+    subdirectory, so changing the config starts a new index instead of
+    mixing vectors from two models or chunkings in one.
+
+    Args:
+        embeddings: The embedding model; queries are embedded with it and its
+            dimension sizes a new index when none has been saved yet.
+    """
+    config = _index_config()
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    directory = Path(SHARED_INDEX_DIR) / digest
+    return get_or_create(
+        "shared_index",
+        str(directory),
+        lambda: SharedVideoIndex.load(directory, embeddings, config)
+        or SharedVideoIndex(len(embeddings.embed_query("dimension probe")), embeddings=embeddings, directory=directory, config=config),
+    )
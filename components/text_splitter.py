@@ -1,24 +1,221 @@
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator
+
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
-from config import CHUNK_SIZE, CHUNK_OVERLAP
+from components.metrics import timed_stage
+from config import CHUNK_MODE, CHUNK_SIZE, CHUNK_OVERLAP, CHUNK_TOKENS, CHUNK_TOKEN_OVERLAP, EMBEDDING_MAX_LENGTH
 
 # ──────────────────────────────────────────────
 # Stage 1b — Text Splitting
 # ──────────────────────────────────────────────
 
-def split_text(text: str) -> list[Document]:
+def _tokenizer():
+    # Imported here: the tokenizer pulls in transformers, needed only in token mode.
+    from components.embeddings import get_tokenizer
+    return get_tokenizer()
+
+
+@timed_stage("split_text")
+def split_text(text: str, mode: str = CHUNK_MODE) -> list[Document]:
     """
     Split raw transcript text into LangChain Document chunks.
 
     Args:
         text: The full transcript as a single string.
+        mode: "chars" (CHUNK_SIZE characters) or "tokens" (CHUNK_TOKENS
+            word-pieces of the embedding model's tokenizer).
 
     Returns:
-        List of Document objects, each containing a chunk of text.
+        List of Document objects, each containing a chunk of text and its
+        character offset in metadata["start_index"].
     """
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=CHUNK_SIZE,
-        chunk_overlap=CHUNK_OVERLAP,
-    )
+    if mode == "tokens":
+        splitter = RecursiveCharacterTextSplitter.from_huggingface_tokenizer(
+            _tokenizer(),
+            chunk_size=CHUNK_TOKENS,
+            chunk_overlap=CHUNK_TOKEN_OVERLAP,
+            add_start_index=True,
+        )
+    else:
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=CHUNK_SIZE,
+            chunk_overlap=CHUNK_OVERLAP,
+            add_start_index=True,
+        )
     return splitter.create_documents([text])
+
+
+def _iter_pieces(snippets: Iterable) -> Iterator[tuple[str, float, float]]:
+    """
+    Yield (piece, segment start, segment end) for the whitespace-normalized
+    transcript: each word with its leading space (none on the first word),
+    the pieces RecursiveCharacterTextSplitter splits on " " with
+    keep_separator.
+    """
+    first = True
+    for snippet in snippets:
+        end = snippet.start + snippet.duration
+        for word in snippet.text.split():
+            yield (word if first else " " + word), snippet.start, end
+            first = False
+
+
+def _token_length() -> Callable[[str], int]:
+    """
+    Return a cached word-piece counter for single words.
+
+    BERT-style tokenizers split on whitespace before WordPiece, so a
+    chunk's token count is the sum over its words.
+    """
+    tokenizer = _tokenizer()
+
+    @lru_cache(maxsize=65536)
+    def length(word: str) -> int:
+        return len(tokenizer.tokenize(word))
+
+    return length
+
+
+class _Window:
+    """
+    The merge step of RecursiveCharacterTextSplitter over a stream of pieces.
+
+    Pieces keep their separators, so they are joined with "" and counted
+    without a separator length; chunks are stripped, as the splitter does.
+    """
+
+    def __init__(self, chunk_size: int, chunk_overlap: int, measure: Callable[[str], int], metadata: dict | None):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.measure = measure
+        self.metadata = metadata or {}
+        # (piece, start, end, character offset, measured length)
+        self.items: deque[tuple[str, float, float, int, int]] = deque()
+        self.total = 0
+
+    def add(self, piece: str, start: float, end: float, offset: int, length: int) -> Document | None:
+        """Append a piece; returns the chunk it closed, if any."""
+        chunk = None
+        if self.items and self.total + length > self.chunk_size:
+            chunk = self._emit()
+            while self.total > self.chunk_overlap or (self.total + length > self.chunk_size and self.total > 0):
+                self.total -= self.items.popleft()[4]
+        self.items.append((piece, start, end, offset, length))
+        self.total += length
+        return chunk
+
+    def flush(self) -> Document | None:
+        """Close the last chunk and start over empty."""
+        chunk = self._emit() if self.items else None
+        self.items.clear()
+        self.total = 0
+        return chunk
+
+    def _emit(self) -> Document | None:
+        text = "".join(item[0] for item in self.items)
+        stripped = text.strip()
+        if not stripped:
+            return None
+        return Document(
+            page_content=stripped,
+            metadata={
+                **self.metadata,
+                "start": self.items[0][1],
+                "end": self.items[-1][2],
+                "start_index": self.items[0][3] + len(text) - len(text.lstrip()),
+            },
+        )
+
+
+def stream_split_snippets(
+    snippets: Iterable,
+    chunk_size: int | None = None,
+    chunk_overlap: int | None = None,
+    metadata: dict | None = None,
+    mode: str = CHUNK_MODE,
+) -> Iterator[Document]:
+    """
+    Split timed transcript snippets into chunks without joining them first.
+
+    Consumes snippets lazily and keeps only the current chunk in memory.
+    Chunks are identical to split_text() of the whitespace-normalized
+    transcript, " ".join(all words): the same pieces are merged with
+    RecursiveCharacterTextSplitter's rule, and a piece of at least
+    chunk_size is split into characters, as the splitter does. Snippets
+    with newlines or repeated spaces are split as if normalized.
+    "start_index" is the chunk's actual offset; split_text() finds it with
+    str.find(), which can land on an earlier copy of a chunk whose text
+    repeats within its search range.
+
+    Args:
+        snippets: Iterable of objects with .text, .start and .duration.
+        chunk_size: Max chunk length (default: CHUNK_SIZE characters, or
+            CHUNK_TOKENS word-pieces in token mode).
+        chunk_overlap: Length carried over between consecutive chunks
+            (default: CHUNK_OVERLAP, or CHUNK_TOKEN_OVERLAP in token mode).
+        metadata: Extra metadata copied into every chunk (e.g. video_id).
+        mode: "chars" or "tokens" (lengths measured with the embedding
+            model's tokenizer).
+
+    Yields:
+        Document chunks with "start"/"end" (seconds) and "start_index"
+        (character offset in the normalized transcript) metadata.
+    """
+    if mode == "tokens":
+        chunk_size = chunk_size or CHUNK_TOKENS
+        chunk_overlap = CHUNK_TOKEN_OVERLAP if chunk_overlap is None else chunk_overlap
+        # BERT-style tokenizers ignore the leading space.
+        length = _token_length()
+        measure = lambda piece: length(piece.strip())  # noqa: E731
+    else:
+        chunk_size = chunk_size or CHUNK_SIZE
+        chunk_overlap = CHUNK_OVERLAP if chunk_overlap is None else chunk_overlap
+        measure = len
+
+    window = _Window(chunk_size, chunk_overlap, measure, metadata)
+    offset = 0
+    for piece, start, end in _iter_pieces(snippets):
+        size = measure(piece)
+        if size < chunk_size:
+            chunk = window.add(piece, start, end, offset, size)
+            if chunk is not None:
+                yield chunk
+        else:
+            # Too long on its own: the splitter closes the current chunk and
+            # splits the piece by characters, with no overlap across it.
+            chunk = window.flush()
+            if chunk is not None:
+                yield chunk
+            characters = _Window(chunk_size, chunk_overlap, measure, metadata)
+            for i, character in enumerate(piece):
+                chunk = characters.add(character, start, end, offset + i, measure(character))
+                if chunk is not None:
+                    yield chunk
+            chunk = characters.flush()
+            if chunk is not None:
+                yield chunk
+        offset += len(piece)
+
+    chunk = window.flush()
+    if chunk is not None:
+        yield chunk
+
+
+def count_truncated(documents: list[Document], max_length: int = EMBEDDING_MAX_LENGTH) -> int:
+    """
+    Count chunks the embedding model would truncate.
+
+    Args:
+        documents: Chunks from either splitter mode.
+        max_length: The model's max sequence length, special tokens included.
+
+    Returns:
+        Number of chunks longer than max_length tokens.
+    """
+    if not documents:
+        return 0
+    encoded = _tokenizer()([doc.page_content for doc in documents], add_special_tokens=True)
+    return sum(len(ids) > max_length for ids in encoded["input_ids"])
@@ -1,38 +1,293 @@
+import json
+import mmap
+from collections.abc import Mapping
+from pathlib import Path
+
+import faiss
+import numpy as np
 from langchain_core.documents import Document
+from langchain_community.docstore.base import Docstore
 from langchain_community.vectorstores import FAISS
 from langchain_core.vectorstores import VectorStoreRetriever
 
-from config import RETRIEVER_SEARCH_TYPE, RETRIEVER_K
+from components.embedding_cache import EmbeddingCache, get_embedding_cache
+from components.metrics import COUNT_BUCKETS, observe, timed_stage
+from components.shared_index import SharedVideoIndex
+from config import (
+    RETRIEVER_SEARCH_TYPE,
+    RETRIEVER_K,
+    VECTOR_STORE_COMPRESSION,
+    VECTOR_STORE_PQ_M,
+    VECTOR_STORE_PQ_NBITS,
+)
 
 # ──────────────────────────────────────────────
 # Stage 1d — Vector Store & Retriever
 # ──────────────────────────────────────────────
 
-def build_vector_store(documents: list[Document], embeddings) -> FAISS:
+_DOCS_FILE = "docs.bin"
+_OFFSETS_FILE = "docs.offsets.npy"
+
+# faiss' own rule of thumb for k-means: at least 39 training points per centroid.
+_MIN_POINTS_PER_CENTROID = 39
+
+
+class PackedDocstore(Docstore):
+    """
+    Read-only docstore keeping all chunks in one byte buffer.
+
+    Each chunk is a JSON record [page_content, metadata]; `offsets[i]` and
+    `offsets[i + 1]` delimit record i. Documents are decoded on lookup, so
+    no Python Document objects stay resident. Loaded from disk, the buffer
+    and offsets are memory-mapped and shared by every process reading them.
+
+    Args:
+        data: Concatenated records (bytes or a read-only mmap).
+        offsets: int64 array of len(records) + 1 record boundaries.
+    """
+
+    def __init__(self, data, offsets: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_documents(cls, documents: list[Document]) -> "PackedDocstore":
+        records = [
+            json.dumps([doc.page_content, doc.metadata], ensure_ascii=False).encode("utf-8")
+            for doc in documents
+        ]
+        offsets = np.zeros(len(records) + 1, dtype=np.int64)
+        np.cumsum([len(record) for record in records], out=offsets[1:])
+        return cls(b"".join(records), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def search(self, search: str) -> Document | str:
+        """Return the Document with the given ID ("0", "1", …)."""
+        i = int(search)
+        if not 0 <= i < len(self):
+            return f"ID {search} not found."
+        text, metadata = json.loads(bytes(self.data[self.offsets[i]:self.offsets[i + 1]]))
+        return Document(page_content=text, metadata=metadata)
+
+    def save(self, folder: Path) -> None:
+        (folder / _DOCS_FILE).write_bytes(bytes(self.data))
+        np.save(folder / _OFFSETS_FILE, self.offsets)
+
+    @classmethod
+    def load(cls, folder: Path) -> "PackedDocstore":
+        offsets = np.load(folder / _OFFSETS_FILE, mmap_mode="r")
+        data = b""
+        if offsets[-1] > 0:
+            with open(folder / _DOCS_FILE, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(data, offsets)
+
+
+class _PositionalIds(Mapping):
+    """FAISS row → docstore ID mapping ("0" … "n-1") without a Python dict."""
+
+    def __init__(self, size: int):
+        self.size = size
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < self.size:
+            raise KeyError(i)
+        return str(i)
+
+    def __iter__(self):
+        return iter(range(self.size))
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class CompactFAISS(FAISS):
+    """
+    Read-only FAISS store with quantized vectors and a packed docstore.
+
+    Built by build_vector_store_from_vectors() when VECTOR_STORE_COMPRESSION
+    is set. Searching, retrievers and get_documents() work as with FAISS;
+    adding or deleting documents is not supported.
+    """
+
+    def save_local(self, folder_path: str, index_name: str = "index") -> None:
+        """Write the index and docstore as plain files that load_local() can mmap."""
+        folder = Path(folder_path)
+        folder.mkdir(parents=True, exist_ok=True)
+        faiss.write_index(self.index, str(folder / f"{index_name}.faiss"))
+        self.docstore.save(folder)
+
+    @classmethod
+    def load_local(cls, folder_path: str, embeddings, index_name: str = "index", **kwargs) -> "CompactFAISS":
+        """
+        Memory-map a store written by save_local().
+
+        Vector codes are mapped with faiss' IO_FLAG_MMAP_IFC where the
+        installed faiss supports it (1.8+); older versions read them into
+        memory. Extra keyword arguments are accepted for FAISS.load_local()
+        compatibility and ignored.
+        """
+        folder = Path(folder_path)
+        flags = faiss.IO_FLAG_READ_ONLY | getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+        index = faiss.read_index(str(folder / f"{index_name}.faiss"), flags)
+        docstore = PackedDocstore.load(folder)
+        return cls(embeddings, index, docstore, _PositionalIds(len(docstore)))
+
+
+def _compressed_index(vectors: np.ndarray, compression: str) -> faiss.Index:
+    """
+    Build a quantized L2 index over `vectors`.
+
+    "pq" needs 39 × 2**VECTOR_STORE_PQ_NBITS vectors to train its codebooks;
+    smaller sets (most single videos) fall back to "int8".
+    """
+    dim = vectors.shape[1]
+    if compression == "pq" and len(vectors) >= _MIN_POINTS_PER_CENTROID * 2 ** VECTOR_STORE_PQ_NBITS:
+        index = faiss.IndexPQ(dim, VECTOR_STORE_PQ_M, VECTOR_STORE_PQ_NBITS, faiss.METRIC_L2)
+    elif compression in ("pq", "int8"):
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_L2)
+    elif compression == "fp16":
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_L2)
+    else:
+        raise RuntimeError(f"Unknown VECTOR_STORE_COMPRESSION: {compression!r}")
+    if len(vectors):
+        index.train(vectors)
+        index.add(vectors)
+    return index
+
+
+@timed_stage("build_vector_store")
+def build_vector_store(documents: list[Document], embeddings, cache: EmbeddingCache | None = None) -> FAISS:
     """
     Build a FAISS vector store from document chunks and embeddings.
 
+    Chunks already seen by the embedding cache are not re-embedded;
+    only cache misses are sent to the model, in batches.
+
     Args:
         documents: List of chunked Document objects.
         embeddings: The embedding model instance.
+        cache: Embedding cache to use (default: the process-wide one).
 
     Returns:
         FAISS vector store with indexed documents.
     """
-    return FAISS.from_documents(documents, embeddings)
+    observe("rag_chunks_per_video", len(documents), buckets=COUNT_BUCKETS, description="Chunks indexed per video")
+    cache = cache or get_embedding_cache()
+    vectors = cache.embed_documents([doc.page_content for doc in documents], embeddings)
+    return build_vector_store_from_vectors(documents, vectors, embeddings)
 
 
-def get_retriever(vector_store: FAISS) -> VectorStoreRetriever:
+def build_vector_store_from_vectors(
+    documents: list[Document],
+    vectors,
+    embeddings,
+    compression: str | None = VECTOR_STORE_COMPRESSION,
+) -> FAISS:
+    """
+    Build a FAISS vector store from document chunks and precomputed vectors.
+
+    Args:
+        documents: List of chunked Document objects.
+        vectors: Array-like of shape (len(documents), dim), in document order.
+        embeddings: The embedding model used to embed future queries.
+        compression: None for a float32 flat index with an in-memory
+            docstore, or "fp16" / "int8" / "pq" for a CompactFAISS store.
+
+    Returns:
+        FAISS vector store with indexed documents.
+    """
+    if compression:
+        matrix = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(documents), -1)
+        return CompactFAISS(
+            embeddings,
+            _compressed_index(matrix, compression),
+            PackedDocstore.from_documents(documents),
+            _PositionalIds(len(documents)),
+        )
+    return FAISS.from_embeddings(
+        [(doc.page_content, list(vector)) for doc, vector in zip(documents, vectors)],
+        embeddings,
+        metadatas=[doc.metadata for doc in documents],
+    )
+
+
+def get_documents(vector_store: FAISS | SharedVideoIndex, video_id: str | None = None) -> list[Document]:
+    """
+    Return every indexed chunk of a video in transcript order.
+
+    Args:
+        vector_store: A per-video FAISS store or the shared multi-video index.
+        video_id: Video to return (required for the shared index, as its video_key()).
+
+    Returns:
+        List of Document chunks, sorted by their position in the transcript.
+    """
+    if isinstance(vector_store, SharedVideoIndex):
+        docs = [vector_store.docstore[i] for i in vector_store.videos.get(video_id, [])]
+    else:
+        docs = [
+            vector_store.docstore.search(doc_id)
+            for _, doc_id in sorted(vector_store.index_to_docstore_id.items())
+        ]
+        if video_id is not None:
+            docs = [doc for doc in docs if doc.metadata.get("video_id", video_id) == video_id]
+    return sorted(docs, key=lambda doc: doc.metadata.get("start_index", 0))
+
+
+def search_many(
+    vector_store: FAISS | SharedVideoIndex,
+    query_vectors,
+    k: int = RETRIEVER_K,
+    video_ids: list[str] | None = None,
+) -> list[list[Document]]:
+    """
+    Return the top-k chunks for many embedded queries.
+
+    A per-video store answers all queries with one FAISS search call; the
+    shared index searches query by query because each search applies the
+    video filter.
+
+    Args:
+        vector_store: A per-video FAISS store or the shared multi-video index.
+        query_vectors: Array-like of shape (n_queries, dim).
+        k: Chunks per query.
+        video_ids: Restrict results to these video_key()s (shared index only).
+
+    Returns:
+        One list of Documents per query, nearest first, in query order.
+    """
+    matrix = np.ascontiguousarray(query_vectors, dtype=np.float32)
+    if isinstance(vector_store, SharedVideoIndex):
+        return [[doc for doc, _ in vector_store.search(vector, k, video_ids)] for vector in matrix]
+    _, rows = vector_store.index.search(matrix, k)
+    return [
+        [vector_store.docstore.search(vector_store.index_to_docstore_id[i]) for i in row.tolist() if i != -1]
+        for row in rows
+    ]
+
+
+def get_retriever(vector_store: FAISS | SharedVideoIndex, video_ids: list[str] | None = None) -> VectorStoreRetriever:
     """
     Convert a FAISS vector store into a LangChain retriever.
 
     Args:
-        vector_store: The FAISS vector store.
+        vector_store: A per-video FAISS store or the shared multi-video index.
+        video_ids: Restrict results to these videos (None = all indexed chunks);
+            video_key()s for the shared index.
 
     Returns:
-        VectorStoreRetriever configured for similarity search.
+        Retriever configured for similarity search.
     """
+    if isinstance(vector_store, SharedVideoIndex):
+        return vector_store.as_retriever(video_ids=video_ids, k=RETRIEVER_K)
+
+    search_kwargs = {"k": RETRIEVER_K}
+    if video_ids is not None:
+        search_kwargs["filter"] = {"video_id": list(video_ids)}
     return vector_store.as_retriever(
         search_type=RETRIEVER_SEARCH_TYPE,
-        search_kwargs={"k": RETRIEVER_K},
+        search_kwargs=search_kwargs,
     )
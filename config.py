@@ -2,17 +2,107 @@
 # Centralized Configuration & Constants
 # ──────────────────────────────────────────────
 
-# Text Splitter (Stage 1b)
+# Transcript Languages (Stage 1a) — display label → language codes, in preference order
+SUPPORTED_LANGUAGES = {
+    "English (Auto-generated)": ["en", "hi"],
+    "Hindi (Auto-generated)": ["hi", "en"],
+}
+
+# Text Splitter (Stage 1b) — "chars" counts characters; "tokens" counts the embedding
+# model's word-pieces, so no chunk is truncated at EMBEDDING_MAX_LENGTH
+CHUNK_MODE = "chars"
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
+CHUNK_TOKENS = 250  # "tokens" mode: word-pieces per chunk, under EMBEDDING_MAX_LENGTH minus [CLS]/[SEP]
+CHUNK_TOKEN_OVERLAP = 50
 
 # Embedding Model (Stage 1c) — runs locally via sentence-transformers
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+EMBEDDING_BACKEND = "torch"  # "onnx_int8" = exported + int8-quantized ONNX Runtime (needs optimum[onnxruntime])
+EMBEDDING_ONNX_DIR = ".cache/onnx"
+EMBEDDING_ONNX_THREADS = 4  # ONNX Runtime intra-op threads
+EMBEDDING_MAX_LENGTH = 256  # tokens; all-MiniLM-L6-v2's max_seq_length
+
+# Embedding Cache (Stage 1c) — chunk vectors keyed by hash(model, normalized text)
+EMBEDDING_CACHE_DIR = ".cache/embeddings"
+EMBEDDING_CACHE_DTYPE = "float32"  # "float16" halves disk use
+EMBEDDING_BATCH_SIZE = 64
 
 # LLM (Stage 4) — Groq
 LLM_MODEL = "llama-3.3-70b-versatile"
 LLM_TEMPERATURE = 0.2
 
+# LLM Scheduler (Stage 4) — every call queued by priority (interactive Q&A before
+# background summaries) and paced to the provider's limits; identical in-flight
+# prompts share one call; 429s / 5xx / connection errors retried with jittered exponential backoff
+LLM_SCHEDULER_ENABLED = True
+LLM_REQUESTS_PER_MINUTE = 30  # Groq free tier; None = unlimited
+LLM_TOKENS_PER_MINUTE = 12000  # prompt + completion; None = unlimited
+LLM_COMPLETION_TOKENS = 400  # completion tokens budgeted per request
+LLM_MAX_RETRIES = 4
+LLM_RETRY_BASE_SECONDS = 1.0  # backoff ceiling doubles per retry, up to LLM_RETRY_MAX_SECONDS
+LLM_RETRY_MAX_SECONDS = 30.0
+
+# Model Registry — build embeddings + LLM client in a background thread at app start
+WARMUP_ON_START = True
+
 # Retriever (Stage 2)
 RETRIEVER_SEARCH_TYPE = "similarity"
 RETRIEVER_K = 4
+
+# Context Assembly (Stage 3) — overlapping chunks merged, then packed into a token budget
+CONTEXT_MAX_TOKENS = 1200
+
+# Vector Store (Stage 1d) — None = float32 flat index + in-memory docstore;
+# "fp16" / "int8" / "pq" = quantized vectors + packed docstore, memory-mapped on load
+VECTOR_STORE_COMPRESSION = None
+VECTOR_STORE_PQ_M = 48  # PQ sub-quantizers (384 dims → 8 dims each, 48 bytes/vector)
+VECTOR_STORE_PQ_NBITS = 8  # bits per sub-quantizer code; PQ falls back to int8 below 39 × 2**NBITS chunks
+
+# Index Manager — per-video indexes shared by all sessions; least recently used
+# ones are unloaded over the ceiling and reloaded from the disk cache on demand
+INDEX_MANAGER_MAX_BYTES = 1024 ** 3  # 1 GB
+
+# Background Indexing (app.py) — chunks embedded + added to the index per step;
+# Q&A opens on the partial index after the first step
+INDEX_JOB_BATCH_SIZE = 128
+
+# Shared Index (Stage 1d) — one FAISS index across all videos, filtered by video_id
+USE_SHARED_INDEX = False
+SHARED_INDEX_DIR = ".cache/shared_index"
+SHARED_INDEX_NLIST = 256  # IVF lists, trained once the corpus has ~39 × NLIST chunks
+SHARED_INDEX_NPROBE = 16
+
+# Summarization — map-reduce over the whole transcript ("rag" = top-k chunks only)
+SUMMARY_MODE = "map_reduce"
+SUMMARY_WINDOW_TOKENS = 6000  # transcript tokens per map call
+SUMMARY_MAX_CONCURRENCY = 4  # map calls in flight
+SUMMARY_CACHE_DIR = ".cache/summaries"
+SUMMARY_MEMORY_CACHE_ENTRIES = 256  # summaries also kept in memory (LRU)
+
+# Batch Q&A — many questions per video: one search call, concurrent LLM calls in the background
+BATCH_MAX_CONCURRENCY = 8  # LLM calls in flight
+BATCH_REQUESTS_PER_SECOND = 0.5  # LLM calls started per second (Groq free tier: 30 requests/min); not applied with LLM_SCHEDULER_ENABLED, whose limits cover batch calls too
+
+# Answer Cache — exact + semantic reuse of final answers, per video/prompt/model
+ANSWER_CACHE_ENABLED = True
+ANSWER_CACHE_SIMILARITY = 0.92  # cosine threshold for semantic hits
+ANSWER_CACHE_MAX_ENTRIES = 1000
+ANSWER_CACHE_MAX_BYTES = 50 * 1024 ** 2
+ANSWER_CACHE_TTL_SECONDS = 24 * 3600
+
+# Persistent Cache — transcripts + FAISS indexes, keyed by video & config
+CACHE_DIR = ".cache/rag"
+CACHE_MAX_BYTES = 2 * 1024 ** 3  # 2 GB, least-recently-used entries evicted first
+
+# Bulk Ingestion CLI (ingest.py)
+INGEST_WORKERS = 8  # concurrent transcript fetches
+INGEST_EMBED_BATCH_SIZE = 512  # chunks embedded per batch, across videos
+
+# Metrics — per-stage latency histograms, token counts, cache hit rates
+METRICS_JSON_LOGS = True  # one JSON log line per stage on the "rag.metrics" logger
+METRICS_FILE = None  # e.g. "/var/lib/node_exporter/rag.prom"; None disables the file export
+METRICS_DEBUG_PANEL = False  # show the metrics panel under the status badges
+
+# HTTP Service (server.py)
+SERVER_CPU_WORKERS = 4  # threads for embedding + FAISS search
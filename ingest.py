@@ -0,0 +1,221 @@
+"""
+Headless bulk ingestion: fetch, split, embed and index many videos.
+
+Usage:
+    python ingest.py video_ids.txt
+    cat video_ids.txt | python ingest.py -
+    python ingest.py video_ids.txt --fixtures fixtures/   # offline
+
+Indexes are written to the on-disk cache (CACHE_DIR) that app.py reads,
+so re-running after a crash skips every video that is already indexed.
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+from components import (
+    SUPPORTED_LANGUAGES,
+    TranscriptSnippet,
+    build_vector_store_from_vectors,
+    cache_key,
+    get_embedding_cache,
+    get_embeddings,
+    get_shared_index,
+    has_cached_vector_store,
+    load_transcript_snippets,
+    save_cached_snippets,
+    save_cached_vector_store,
+    stream_split_snippets,
+    video_key,
+)
+from config import INGEST_EMBED_BATCH_SIZE, INGEST_WORKERS
+
+Fetcher = Callable[[str, str], Iterable | None]
+
+
+@dataclass
+class IngestReport:
+    """Outcome of a bulk ingestion run."""
+    indexed: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    unavailable: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    chunks: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        minutes = self.seconds / 60 or float("inf")
+        return (
+            f"indexed={len(self.indexed)} skipped={len(self.skipped)} "
+            f"unavailable={len(self.unavailable)} failed={len(self.failed)} "
+            f"chunks={self.chunks} in {self.seconds:.1f}s — "
+            f"{len(self.indexed) / minutes:.1f} videos/min, "
+            f"{self.chunks / (self.seconds or float('inf')):.1f} chunks/sec"
+        )
+
+
+def fixture_fetcher(directory: str) -> Fetcher:
+    """
+    Build a fetcher that reads transcripts from <directory>/<video_id>.json.
+
+    Each file holds a list of {"text", "start", "duration"} objects. A missing
+    file behaves like a video with transcripts disabled (returns None).
+    """
+    root = Path(directory)
+
+    def fetch(video_id: str, language: str) -> list[TranscriptSnippet] | None:
+        path = root / f"{video_id}.json"
+        if not path.is_file():
+            return None
+        return [
+            TranscriptSnippet(item["text"], item["start"], item["duration"])
+            for item in json.loads(path.read_text(encoding="utf-8"))
+        ]
+
+    return fetch
+
+
+def _log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+def ingest(
+    video_ids: list[str],
+    language: str,
+    fetcher: Fetcher = load_transcript_snippets,
+    workers: int = INGEST_WORKERS,
+    batch_size: int = INGEST_EMBED_BATCH_SIZE,
+    progress: Callable[[str], None] = _log,
+    shared: bool = False,
+) -> IngestReport:
+    """
+    Index many videos into the on-disk cache.
+
+    Transcripts are fetched concurrently; chunks from several videos are
+    pooled and embedded together in large batches. A video that fails to
+    fetch or split is recorded and does not stop the run.
+
+    Args:
+        video_ids: YouTube video IDs (duplicates are ignored).
+        language: Display label from SUPPORTED_LANGUAGES.
+        fetcher: Callable (video_id, language) → snippets or None.
+        workers: Max concurrent transcript fetches.
+        batch_size: Chunks embedded per batch.
+        progress: Callback receiving one line per finished video.
+        shared: Also add every video to the shared multi-video index.
+
+    Returns:
+        IngestReport with per-video outcomes and throughput.
+    """
+    report = IngestReport()
+    started = time.perf_counter()
+    lang_codes = SUPPORTED_LANGUAGES.get(language, ["en"])
+    embeddings = get_embeddings()
+    cache = get_embedding_cache()
+    shared_index = get_shared_index(embeddings) if shared else None
+
+    todo = []
+    for video_id in dict.fromkeys(video_ids):
+        indexed = has_cached_vector_store(cache_key(video_id, lang_codes))
+        if shared_index is not None:
+            indexed = indexed and video_key(video_id, lang_codes[0]) in shared_index
+        if indexed:
+            report.skipped.append(video_id)
+        else:
+            todo.append(video_id)
+    total = len(todo)
+    if report.skipped:
+        progress(f"resuming: {len(report.skipped)} already indexed, {total} to go")
+
+    pending: list[tuple[str, list]] = []
+    finished = 0
+
+    def step(video_id: str, message: str) -> None:
+        nonlocal finished
+        finished += 1
+        progress(f"[{finished}/{total}] {video_id}: {message}")
+
+    def flush() -> None:
+        if not pending:
+            return
+        texts = [doc.page_content for _, docs in pending for doc in docs]
+        try:
+            vectors = cache.embed_documents(texts, embeddings, batch_size=batch_size)
+        except Exception as e:
+            for video_id, _ in pending:
+                report.failed[video_id] = str(e)
+                step(video_id, f"embedding failed: {e}")
+            pending.clear()
+            return
+        offset = 0
+        for video_id, docs in pending:
+            try:
+                video_vectors = vectors[offset:offset + len(docs)]
+                vector_store = build_vector_store_from_vectors(docs, video_vectors, embeddings)
+                save_cached_vector_store(cache_key(video_id, lang_codes), vector_store)
+                if shared_index is not None:
+                    shared_index.add_video(video_id, docs, video_vectors, language=lang_codes[0])
+                report.indexed.append(video_id)
+                report.chunks += len(docs)
+                step(video_id, f"{len(docs)} chunks")
+            except Exception as e:
+                report.failed[video_id] = str(e)
+                step(video_id, f"index failed: {e}")
+            offset += len(docs)
+        pending.clear()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetcher, video_id, language): video_id for video_id in todo}
+        for future in as_completed(futures):
+            video_id = futures[future]
+            try:
+                snippets = future.result()
+                if not snippets:
+                    report.unavailable.append(video_id)
+                    step(video_id, "no transcript available")
+                    continue
+                snippets = list(snippets)
+                save_cached_snippets(cache_key(video_id, lang_codes), snippets)
+                metadata = {"video_id": video_id, "language": lang_codes[0]}
+                docs = list(stream_split_snippets(snippets, metadata=metadata))
+            except Exception as e:
+                report.failed[video_id] = str(e)
+                step(video_id, f"failed: {e}")
+                continue
+
+            pending.append((video_id, docs))
+            if sum(len(d) for _, d in pending) >= batch_size:
+                flush()
+        flush()
+
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("ids", nargs="?", default="-", help="File with one video ID per line, or '-' for stdin")
+    parser.add_argument("--language", default=next(iter(SUPPORTED_LANGUAGES)), choices=list(SUPPORTED_LANGUAGES))
+    parser.add_argument("--workers", type=int, default=INGEST_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=INGEST_EMBED_BATCH_SIZE)
+    parser.add_argument("--shared", action="store_true", help="Also add videos to the shared multi-video index")
+    parser.add_argument("--fixtures", help="Read transcripts from <dir>/<video_id>.json instead of YouTube")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.ids == "-" else open(args.ids, encoding="utf-8")
+    with source:
+        video_ids = [line.strip() for line in source if line.strip() and not line.startswith("#")]
+
+    fetcher = fixture_fetcher(args.fixtures) if args.fixtures else load_transcript_snippets
+    report = ingest(video_ids, args.language, fetcher, args.workers, args.batch_size, shared=args.shared)
+    _log(report.summary())
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
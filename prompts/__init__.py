@@ -1,3 +1,3 @@
-from prompts.templates import RAG_PROMPT, SUMMARY_PROMPT
+from prompts.templates import RAG_PROMPT, SUMMARY_PROMPT, MAP_SUMMARY_PROMPT, REDUCE_SUMMARY_PROMPT, PROMPT_VERSION
 
-__all__ = ["RAG_PROMPT", "SUMMARY_PROMPT"]
+__all__ = ["RAG_PROMPT", "SUMMARY_PROMPT", "MAP_SUMMARY_PROMPT", "REDUCE_SUMMARY_PROMPT", "PROMPT_VERSION"]
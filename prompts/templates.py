@@ -1,3 +1,5 @@
+import hashlib
+
 from langchain_core.prompts import PromptTemplate
 
 # ──────────────────────────────────────────────
@@ -18,3 +20,41 @@ SUMMARY_PROMPT = (
     "Provide a detailed summary of this video. "
     "Cover all the main topics, key points, and important takeaways discussed."
 )
+
+MAP_SUMMARY_PROMPT = PromptTemplate(
+    template="""You are summarizing one part of a long video transcript.
+Write a concise summary of this part: its main topics, key points and any
+conclusions. Use only the transcript below.
+
+Transcript part:
+{text}""",
+    input_variables=["text"],
+)
+
+REDUCE_SUMMARY_PROMPT = PromptTemplate(
+    template="""Below are summaries of consecutive parts of one video, in order.
+""" + SUMMARY_PROMPT + """
+Use only these summaries.
+
+{text}""",
+    input_variables=["text"],
+)
+
+# Single pass, for a transcript that fits one window.
+VIDEO_SUMMARY_PROMPT = PromptTemplate(
+    template=SUMMARY_PROMPT + """
+Use only the transcript below.
+
+Transcript:
+{text}""",
+    input_variables=["text"],
+)
+
+# Changes whenever a prompt is edited, so cached answers from an older
+# prompt are never served (see chains/answer_cache.py).
+PROMPT_VERSION = hashlib.sha256(
+    (
+        RAG_PROMPT.template + SUMMARY_PROMPT + MAP_SUMMARY_PROMPT.template
+        + REDUCE_SUMMARY_PROMPT.template + VIDEO_SUMMARY_PROMPT.template
+    ).encode("utf-8")
+).hexdigest()[:12]
@@ -0,0 +1,215 @@
+"""
+Async HTTP service exposing ingest, ask and summarize.
+
+Usage:
+    uvicorn server:app --workers 2
+    python server.py --fake-llm          # local stub instead of Groq
+    python server.py --fake-llm --fake-rate-limit 30 [--schedule]
+                                         # stub answering 429 above 30 requests/min
+
+Endpoints:
+    POST /videos                         {"video_id", "language"?}
+    POST /videos/{video_id}/ask          {"question", "language"?, "stream"?}
+    POST /videos/{video_id}/summary      {"language"?, "stream"?}
+    GET  /health
+    GET  /metrics                        Prometheus text format
+"""
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, Iterable
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from chains import build_rag_chain, get_answer_cache, stream_video_summary, with_answer_cache
+from components import (
+    SUPPORTED_LANGUAGES,
+    IndexHandle,
+    cache_key,
+    configure_metrics_logging,
+    get_documents,
+    get_embeddings,
+    get_index_manager,
+    get_llm,
+    get_retriever,
+    load_transcript_snippets,
+    load_video_index,
+    registry_stats,
+    render_prometheus,
+    schedule,
+    ScheduledChatModel,
+    video_key,
+)
+from config import ANSWER_CACHE_ENABLED, SERVER_CPU_WORKERS
+
+DEFAULT_LANGUAGE = next(iter(SUPPORTED_LANGUAGES))
+
+
+class IngestRequest(BaseModel):
+    video_id: str
+    language: str = DEFAULT_LANGUAGE
+
+
+class AskRequest(BaseModel):
+    question: str
+    language: str = DEFAULT_LANGUAGE
+    stream: bool = False
+
+
+class SummaryRequest(BaseModel):
+    language: str = DEFAULT_LANGUAGE
+    stream: bool = False
+
+
+def create_app(
+    llm=None,
+    fetcher: Callable[[str, str], Iterable | None] = load_transcript_snippets,
+    cpu_workers: int = SERVER_CPU_WORKERS,
+) -> FastAPI:
+    """
+    Build the ASGI app.
+
+    Args:
+        llm: Chat model to use (default: the shared Groq client from get_llm()).
+            Pass a fake model to run without Groq, wrapped with schedule()
+            to put it behind the LLM scheduler.
+        fetcher: Transcript fetcher (video_id, language) → snippets or None.
+        cpu_workers: Threads for CPU-bound work (embedding, FAISS search).
+
+    Returns:
+        FastAPI application.
+    """
+    cpu_pool = ThreadPoolExecutor(max_workers=cpu_workers, thread_name_prefix="cpu")
+    index_manager = get_index_manager()
+    # One build per cache key at a time; concurrent requests await the same future.
+    building: dict[str, asyncio.Future] = {}
+
+    def resolve_llm(priority: str = "interactive"):
+        if llm is None:
+            return get_llm(priority)
+        return llm.with_priority(priority) if isinstance(llm, ScheduledChatModel) else llm
+
+    async def on_cpu(fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(cpu_pool, fn, *args)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Load the shared embedding model before the first request arrives.
+        await on_cpu(lambda: get_embeddings().embed_query("warm-up"))
+        yield
+        cpu_pool.shutdown(wait=False)
+
+    app = FastAPI(title="YouTube ChatBot", lifespan=lifespan)
+
+    def build_chain(index_handle: IndexHandle, key: str):
+        retriever = index_handle.as_retriever()
+
+        async def aretrieve(question: str):
+            # Keep embedding + FAISS search on the bounded CPU pool.
+            return await on_cpu(retriever.invoke, question)
+
+        bounded_retriever = RunnableLambda(retriever.invoke, afunc=aretrieve)
+        rag_chain = build_rag_chain(bounded_retriever, resolve_llm())
+        if ANSWER_CACHE_ENABLED:
+            rag_chain = with_answer_cache(rag_chain, key, get_answer_cache(get_embeddings()), executor=cpu_pool)
+        return rag_chain
+
+    async def build(video_id: str, language: str):
+        try:
+            vector_store = await on_cpu(load_video_index, video_id, language, get_embeddings(), fetcher)
+        except RuntimeError as e:
+            raise HTTPException(status_code=502, detail=str(e)) from e
+        if vector_store is None:
+            raise HTTPException(status_code=404, detail="No transcript available for this video")
+        return vector_store
+
+    async def load(video_id: str, language: str) -> IndexHandle:
+        """
+        Return a handle to the video's index, shared through the IndexManager.
+
+        The handle is held for one request only. Loaded indexes stay under
+        INDEX_MANAGER_MAX_BYTES; an evicted index is reloaded from the disk
+        cache on its next use.
+        """
+        key = cache_key(video_id, SUPPORTED_LANGUAGES.get(language, ["en"]))
+        index_handle = await on_cpu(index_manager.acquire, key, get_embeddings())
+        if index_handle is not None:
+            return index_handle
+        future = building.get(key)
+        if future is None:
+            future = building[key] = asyncio.ensure_future(build(video_id, language))
+            future.add_done_callback(lambda _: building.pop(key, None))
+        # Shielded: a disconnecting client must not cancel the build for the others.
+        vector_store = await asyncio.shield(future)
+        return index_manager.put(key, vector_store, get_embeddings())
+
+    @app.get("/health")
+    async def health() -> dict:
+        return {"status": "ok", "indexes": index_manager.stats(), "registry": registry_stats()}
+
+    @app.get("/metrics")
+    async def metrics() -> PlainTextResponse:
+        return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+    @app.post("/videos")
+    async def ingest(request: IngestRequest) -> dict:
+        index_handle = await load(request.video_id, request.language)
+        chunks = await on_cpu(lambda: len(index_handle.vector_store.index_to_docstore_id))
+        return {"video_id": request.video_id, "chunks": chunks}
+
+    @app.post("/videos/{video_id}/ask")
+    async def ask(video_id: str, request: AskRequest):
+        index_handle = await load(video_id, request.language)
+        language = SUPPORTED_LANGUAGES.get(request.language, ["en"])[0]
+        rag_chain = build_chain(index_handle, video_key(video_id, language))
+        if request.stream:
+            return StreamingResponse(rag_chain.astream(request.question), media_type="text/plain")
+        return PlainTextResponse(await rag_chain.ainvoke(request.question))
+
+    @app.post("/videos/{video_id}/summary")
+    async def summary(video_id: str, request: SummaryRequest):
+        index_handle = await load(video_id, request.language)
+        docs = await on_cpu(lambda: get_documents(index_handle.vector_store, video_id))
+        language = SUPPORTED_LANGUAGES.get(request.language, ["en"])[0]
+        tokens = stream_video_summary(docs, resolve_llm("background"), video_key(video_id, language))
+        if request.stream:
+            return StreamingResponse(iterate_in_threadpool(tokens), media_type="text/plain")
+        return PlainTextResponse(await run_in_threadpool(lambda: "".join(tokens)))
+
+    return app
+
+
+load_dotenv()
+configure_metrics_logging()
+app = create_app()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--fake-llm", action="store_true", help="Use the local fake LLM instead of Groq")
+    parser.add_argument("--fake-rate-limit", type=int, default=0, metavar="RPM", help="Make the fake LLM answer 429 above RPM requests/minute")
+    parser.add_argument("--schedule", action="store_true", help="Route the fake LLM through the LLM scheduler")
+    parser.add_argument("--fixtures", help="Read transcripts from <dir>/<video_id>.json instead of YouTube")
+    args = parser.parse_args()
+
+    llm = None
+    if args.fake_llm:
+        from benchmarks.fakes import FakeStreamingChatModel
+        llm = FakeStreamingChatModel(rate_limit_rpm=args.fake_rate_limit)
+        if args.schedule:
+            llm = schedule(llm)
+    fetcher = load_transcript_snippets
+    if args.fixtures:
+        from ingest import fixture_fetcher
+        fetcher = fixture_fetcher(args.fixtures)
+    uvicorn.run(create_app(llm=llm, fetcher=fetcher), host=args.host, port=args.port)
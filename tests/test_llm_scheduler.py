@@ -0,0 +1,176 @@
+"""LLMScheduler behind a fake provider limit: coalescing, retries and priorities."""
+import threading
+import time
+
+import pytest
+
+from benchmarks.fakes import FakeRateLimitError, FakeStreamingChatModel
+from components.llm_scheduler import LLMScheduler, schedule
+
+
+def _fake(**kwargs) -> FakeStreamingChatModel:
+    return FakeStreamingChatModel(response_tokens=5, first_token_delay=0.0, token_delay=0.0, **kwargs)
+
+
+def _run_all(calls: list) -> list:
+    """Run callables in threads started together; results in call order."""
+    results = [None] * len(calls)
+    barrier = threading.Barrier(len(calls))
+
+    def run(i):
+        barrier.wait()
+        results[i] = calls[i]()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(calls))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_prompts_share_one_upstream_call():
+    upstream = FakeStreamingChatModel(response_tokens=5, first_token_delay=0.3, token_delay=0.0, rate_limit_rpm=1)
+    scheduler = LLMScheduler(requests_per_minute=None, tokens_per_minute=None)
+    llm = schedule(upstream, scheduler=scheduler)
+
+    messages = _run_all([lambda: llm.invoke("What is this video about?")] * 4)
+
+    assert upstream.calls == 1 and upstream.rejected == 0
+    assert scheduler.stats()["coalesced"] == 3
+    assert len({message.content for message in messages}) == 1
+    # Every caller gets its own message object and run id.
+    assert len({id(message) for message in messages}) == 4
+    assert len({message.id for message in messages}) == 4
+
+
+def test_streaming_followers_replay_the_leaders_chunks():
+    upstream = FakeStreamingChatModel(response_tokens=5, first_token_delay=0.3, token_delay=0.01, rate_limit_rpm=1)
+    scheduler = LLMScheduler(requests_per_minute=None, tokens_per_minute=None)
+    llm = schedule(upstream, scheduler=scheduler)
+
+    streams = _run_all([lambda: [chunk.content for chunk in llm.stream("Summarize the video.")]] * 3)
+
+    assert upstream.calls == 1 and upstream.rejected == 0
+    assert streams[0] == streams[1] == streams[2]
+    assert len([token for token in streams[0] if token]) == 5
+
+
+def test_rate_limited_call_is_retried_after_retry_after():
+    upstream = _fake(rate_limit_rpm=1, rate_limit_window=0.3)
+    scheduler = LLMScheduler(requests_per_minute=None, tokens_per_minute=None, max_retries=3, retry_base_seconds=0.01)
+    llm = schedule(upstream, scheduler=scheduler)
+
+    llm.invoke("first question")
+    started = time.monotonic()
+    message = llm.invoke("second question")
+
+    assert message.content
+    assert upstream.rejected == 1 and upstream.calls == 2
+    assert scheduler.stats()["rate_limited"] == 1
+    # The retry waited for the provider's Retry-After, not just the short backoff.
+    assert time.monotonic() - started >= 0.2
+
+
+def test_rate_limited_call_fails_without_the_scheduler():
+    upstream = _fake(rate_limit_rpm=1, rate_limit_window=60)
+
+    upstream.invoke("first question")
+    with pytest.raises(FakeRateLimitError):
+        upstream.invoke("second question")
+
+
+class _FlakyChatModel(FakeStreamingChatModel):
+    """Fails its first `failures` calls with a connection error."""
+
+    failures: int = 1
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("connection reset")
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+
+def test_connection_errors_are_retried():
+    upstream = _FlakyChatModel(response_tokens=5, first_token_delay=0.0, token_delay=0.0, failures=2)
+    scheduler = LLMScheduler(requests_per_minute=None, tokens_per_minute=None, max_retries=3, retry_base_seconds=0.01)
+
+    message = schedule(upstream, scheduler=scheduler).invoke("What is this video about?")
+
+    assert message.content
+    assert scheduler.stats()["retries"] == 2 and scheduler.stats()["rate_limited"] == 0
+
+
+def test_interactive_requests_are_admitted_before_background_ones():
+    # One request per 0.2 s, matching the provider's limit: nothing is rejected.
+    upstream = _fake(rate_limit_rpm=1, rate_limit_window=0.15)
+    scheduler = LLMScheduler(requests_per_minute=300, tokens_per_minute=None, burst_seconds=0.2)
+    llm = schedule(upstream, scheduler=scheduler)
+    llm.invoke("drain the bucket")
+
+    order, lock = [], threading.Lock()
+
+    def ask(priority: str, i: int):
+        llm.with_priority(priority).invoke(f"{priority} question {i}")
+        with lock:
+            order.append(priority)
+
+    threads = []
+    for priority in ("background", "interactive"):
+        for i in range(3):
+            thread = threading.Thread(target=ask, args=(priority, i))
+            thread.start()
+            threads.append(thread)
+        # Wait until this group is queued, so background requests arrive first.
+        while scheduler.stats()["queued"] < len(threads):
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join()
+
+    assert order == ["interactive"] * 3 + ["background"] * 3
+    assert upstream.rejected == 0
+
+
+def test_stream_callbacks_fire_once_per_token():
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class Tokens(BaseCallbackHandler):
+        def __init__(self):
+            self.tokens = []
+
+        def on_llm_new_token(self, token, **kwargs):
+            self.tokens.append(token)
+
+    handler = Tokens()
+    llm = schedule(_fake(), scheduler=LLMScheduler(requests_per_minute=None, tokens_per_minute=None))
+
+    chunks = [chunk.content for chunk in llm.stream("Summarize the video.", config={"callbacks": [handler]})]
+
+    assert handler.tokens == chunks
+
+
+def test_retried_request_keeps_its_place_in_the_queue():
+    # One request per 0.1 s; a fresh bucket admits the first one at once.
+    scheduler = LLMScheduler(requests_per_minute=600, tokens_per_minute=None, burst_seconds=0.1)
+    ticket = scheduler.acquire(1)
+
+    order, lock = [], threading.Lock()
+
+    def newcomer():
+        scheduler.acquire(1)
+        with lock:
+            order.append("newcomer")
+
+    thread = threading.Thread(target=newcomer)
+    thread.start()
+    while scheduler.stats()["queued"] < 1:
+        time.sleep(0.001)
+    # The first request failed and is retried with its original ticket.
+    scheduler.acquire(1, ticket=ticket)
+    with lock:
+        order.append("retry")
+    thread.join()
+
+    assert order == ["retry", "newcomer"]
+    assert scheduler.stats()["queued"] == 0
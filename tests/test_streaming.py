@@ -0,0 +1,69 @@
+"""Streaming answers: incremental tokens, TTFT logging, and where the final text ends up."""
+import logging
+import time
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.fakes import FakeStreamingChatModel, fake_retriever
+from chains import AnswerCache, build_rag_chain, stream_answer, with_answer_cache
+
+
+def _chain(**llm_kwargs):
+    llm = FakeStreamingChatModel(response_tokens=8, first_token_delay=0.0, token_delay=0.02, **llm_kwargs)
+    return build_rag_chain(fake_retriever(chunks=2, chunk_chars=200), llm)
+
+
+def test_tokens_arrive_incrementally():
+    started = time.perf_counter()
+    arrivals, tokens = [], []
+    for token in stream_answer(_chain(), "What is this video about?"):
+        if token:
+            arrivals.append(time.perf_counter() - started)
+            tokens.append(token)
+
+    assert len(tokens) == 8
+    # The first token is out long before the last one is generated.
+    assert arrivals[-1] - arrivals[0] >= 0.1
+    assert arrivals == sorted(arrivals)
+
+
+def test_ttft_is_logged(caplog):
+    with caplog.at_level(logging.INFO, logger="chains.rag_chain"):
+        list(stream_answer(_chain(), "What is this video about?"))
+
+    messages = [record.getMessage() for record in caplog.records if record.name == "chains.rag_chain"]
+    assert len(messages) == 1
+    assert messages[0].startswith("rag stream: ttft=")
+
+
+def test_streamed_answer_is_cached():
+    cache = AnswerCache(DeterministicFakeEmbedding(size=16))
+    chain = with_answer_cache(_chain(), "video", cache)
+
+    text = "".join(stream_answer(chain, "What is this video about?"))
+    cached, _ = cache.get("video", "What is this video about?")
+
+    assert text
+    assert cached == text
+
+
+def _summary_app():
+    import streamlit as st
+
+    from benchmarks.fakes import FakeStreamingChatModel, fake_retriever
+    from chains import build_rag_chain, stream_summary
+    from ui import render_streaming_box
+
+    llm = FakeStreamingChatModel(response_tokens=8, first_token_delay=0.0, token_delay=0.0)
+    rag_chain = build_rag_chain(fake_retriever(chunks=2, chunk_chars=200), llm)
+    st.session_state.summary = render_streaming_box(stream_summary(rag_chain), css_class="summary-box")
+
+
+def test_streamed_summary_is_kept_in_session_state():
+    app = AppTest.from_function(_summary_app).run()
+
+    assert not app.exception
+    summary = app.session_state["summary"]
+    assert len(summary.split()) == 8
+    assert summary in app.markdown[-1].value
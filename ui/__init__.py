@@ -1,3 +1,23 @@
-from ui.components import inject_custom_css, render_header, render_status_badges
+from ui.components import (
+    inject_custom_css,
+    render_header,
+    render_status_badges,
+    render_streaming_box,
+    render_metrics_panel,
+    render_index_progress,
+    render_partial_coverage_notice,
+    render_batch_results,
+    render_batch_progress,
+)
 
-__all__ = ["inject_custom_css", "render_header", "render_status_badges"]
+__all__ = [
+    "inject_custom_css",
+    "render_header",
+    "render_status_badges",
+    "render_streaming_box",
+    "render_metrics_panel",
+    "render_index_progress",
+    "render_partial_coverage_notice",
+    "render_batch_results",
+    "render_batch_progress",
+]
@@ -174,10 +174,101 @@ def render_header():
     """, unsafe_allow_html=True)
 
 
-def render_status_badges():
-    """Render success status badges after index is built."""
-    st.markdown("""
+def render_status_badges(indexing: bool = False):
+    """Render status badges after the index is built (or while it builds in the background)."""
+    store_badge = "⏳ Indexing in background" if indexing else "✓ Vector store built"
+    st.markdown(f"""
     <span class="status-badge badge-green">✓ Transcript loaded</span>
-    <span class="status-badge badge-blue">✓ Vector store built</span>
+    <span class="status-badge badge-blue">{store_badge}</span>
     <span class="status-badge badge-yellow">✓ RAG chain ready</span>
     """, unsafe_allow_html=True)
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+def render_index_progress(indexed: int, total: int, covered_seconds: float, total_seconds: float):
+    """Render a progress bar for a background index job."""
+    st.progress(
+        indexed / total if total else 0.0,
+        text=(
+            f"⚙️ Indexing transcript — {indexed}/{total} chunks. "
+            f"Questions can already use the first {_format_duration(covered_seconds)} "
+            f"of {_format_duration(total_seconds)}."
+        ),
+    )
+
+
+def render_batch_progress(answered: int, total: int):
+    """Render a progress bar for a background batch of questions."""
+    st.progress(answered / total if total else 0.0, text=f"🤖 Answering questions — {answered}/{total} done.")
+
+
+def render_partial_coverage_notice(covered_seconds: float, total_seconds: float):
+    """Flag an answer that was generated before the whole transcript was indexed."""
+    share = covered_seconds / total_seconds if total_seconds else 0.0
+    st.markdown(
+        f'<span class="status-badge badge-yellow">⏳ Partial coverage: answer uses the first '
+        f'{_format_duration(covered_seconds)} of {_format_duration(total_seconds)} ({share:.0%})</span>',
+        unsafe_allow_html=True,
+    )
+
+
+def render_streaming_box(tokens, css_class: str = "answer-box") -> str:
+    """
+    Render streamed text into a styled box, updating it as tokens arrive.
+
+    Args:
+        tokens: Iterable of text fragments (e.g. from stream_answer()).
+        css_class: "answer-box" or "summary-box".
+
+    Returns:
+        The full text once the stream is exhausted.
+    """
+    placeholder = st.empty()
+    text = ""
+    for token in tokens:
+        text += token
+        placeholder.markdown(f'<div class="{css_class}">{text}▌</div>', unsafe_allow_html=True)
+    placeholder.markdown(f'<div class="{css_class}">{text}</div>', unsafe_allow_html=True)
+    return text
+
+
+def render_metrics_panel(metrics: dict):
+    """
+    Render a collapsible debug panel with per-stage latency and cache stats.
+
+    Args:
+        metrics: Output of components.metrics_snapshot().
+    """
+    with st.expander("📊 Pipeline metrics"):
+        if metrics["stages"]:
+            st.table({
+                "series": list(metrics["stages"]),
+                "count": [m["count"] for m in metrics["stages"].values()],
+                "p50": [f'{m["p50"]:.3f}' for m in metrics["stages"].values()],
+                "p95": [f'{m["p95"]:.3f}' for m in metrics["stages"].values()],
+            })
+        for name, value in {**metrics["counters"], **metrics["gauges"]}.items():
+            st.markdown(f"`{name}` {value:g}")
+
+
+def render_batch_results(results):
+    """
+    Render batch answers as a table, in question order.
+
+    Args:
+        results: BatchAnswer objects from chains.answer_batch().
+    """
+    st.dataframe(
+        {
+            "question": [r.question for r in results],
+            "answer": [f"⚠️ {r.error}" if r.error else r.answer for r in results],
+            "sources": [", ".join(f"{_format_duration(start)}–{_format_duration(end)}" for start, end in r.sources) for r in results],
+        },
+        use_container_width=True,
+        hide_index=True,
+    )